@@ -0,0 +1,264 @@
+"""Benchmark for every collector and the full sampling cycle.
+
+Builds a synthetic host (a /proc tree with N processes, M network
+interfaces and K block devices, plus the sysfs files the collectors
+read) and times each collector's collect() and complete
+SystemStatsHandler sampling cycles against it. For each it reports
+per-call latency, and from tracemalloc the peak memory of one call and
+the blocks and bytes it left allocated; results are written as JSON so
+runs can be compared between versions.
+
+The overview collector still runs `hostname -I` on the live system, and
+the Docker and Tailscale collectors are pointed at absent sockets, so
+their figures are the cost of an unavailable daemon.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_collectors.py --processes 3000 \\
+        --interfaces 200 --disks 24 --output results.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from bench_procscan import build_tree
+
+from monitor.collectors import (
+    CPUCollector,
+    DiskCollector,
+    DockerCollector,
+    LoadCollector,
+    MemoryCollector,
+    NetworkCollector,
+    OverviewCollector,
+    ProcessCollector,
+    SensorsCollector,
+    TailscaleCollector,
+)
+from monitor.collectors.diskio import DiskIO
+from monitor.collectors.mounts import DiskUsage, MountTable
+from monitor.collectors.procscan import ProcessScanner
+from monitor.config import CacheConfig, Config, SamplerConfig, SpeedtestConfig
+from monitor.handlers.system import SystemStatsHandler
+
+CPUS = 4
+
+
+def build_host(root: Path, processes: int, interfaces: int, disks: int) -> None:
+    """Write a synthetic host under root/proc and root/sys."""
+    proc = root / "proc"
+    sys = root / "sys"
+    proc.mkdir(parents=True)
+    build_tree(proc, processes)
+
+    cpu_line = "100000 500 30000 900000 2000 0 700 0 0 0"
+    (proc / "stat").write_text(
+        f"cpu  {cpu_line}\n"
+        + "".join(f"cpu{i} {cpu_line}\n" for i in range(CPUS))
+        + "intr 123456789 "
+        + " ".join(["0"] * 200)
+        + "\n"
+        + "ctxt 987654321\nbtime 1700000000\nprocesses 654321\n"
+        + "procs_running 2\nprocs_blocked 0\n"
+    )
+    (proc / "uptime").write_text("123456.78 400000.00\n")
+    (proc / "loadavg").write_text("0.52 0.58 0.59 2/312 12345\n")
+    (proc / "meminfo").write_text(
+        "MemTotal:        8000000 kB\nMemFree:         2000000 kB\n"
+        "MemAvailable:    5000000 kB\nBuffers:          100000 kB\n"
+        "Cached:          2500000 kB\nSwapTotal:       1000000 kB\n"
+        "SwapFree:         900000 kB\n"
+    )
+
+    names = ["eth0", "wlan0", "docker0"] + [f"veth{i:05x}" for i in range(interfaces - 3)]
+    net = proc / "net"
+    net.mkdir()
+    lines = [
+        "Inter-|   Receive                            |  Transmit",
+        " face |bytes    packets errs drop fifo frame compressed multicast|bytes ...",
+    ]
+    for i, name in enumerate(names):
+        counters = [str(1_000_000 * (i + 1)), "5000", "0", "0", "0", "0", "0", "0"] * 2
+        lines.append(f"{name:>6}: " + " ".join(counters))
+        link = sys / "class" / "net" / name
+        link.mkdir(parents=True)
+        (link / "operstate").write_text("up\n")
+        (link / "speed").write_text("1000\n" if name == "eth0" else "10000\n")
+        if name != "eth0" and name != "wlan0":
+            (sys / "devices" / "virtual" / "net" / name).mkdir(parents=True)
+    (net / "dev").write_text("\n".join(lines) + "\n")
+
+    stats = []
+    for i in range(disks):
+        name = f"sd{chr(ord('a') + i % 26)}{'' if i < 26 else i // 26}"
+        block = sys / "block" / name
+        (block / "device").mkdir(parents=True)
+        for part in ("", "1", "2"):
+            stats.append(f"   8 {i * 16} {name}{part} " + " ".join(["1000"] * 17))
+    (proc / "diskstats").write_text("\n".join(stats) + "\n")
+
+    mounts = root / "mnt"
+    lines = []
+    for i in range(8):
+        (mounts / f"data{i}").mkdir(parents=True)
+        lines.append(
+            f"{30 + i} 1 8:{i * 16 + 1} / {mounts}/data{i} rw,relatime - ext4 /dev/sd{i}1 rw"
+        )
+    (proc / "self").mkdir(exist_ok=True)
+    (proc / "self" / "mountinfo").write_text("\n".join(lines) + "\n")
+
+    for i, zone_type in enumerate(("cpu-thermal", "gpu-thermal")):
+        zone = sys / "class" / "thermal" / f"thermal_zone{i}"
+        zone.mkdir(parents=True)
+        (zone / "type").write_text(zone_type + "\n")
+        (zone / "temp").write_text(f"{45000 + i * 1000}\n")
+    freq = sys / "devices" / "system" / "cpu" / "cpu0" / "cpufreq"
+    freq.mkdir(parents=True)
+    (freq / "scaling_cur_freq").write_text("1800000\n")
+
+
+def make_collectors(root: Path) -> dict[str, Any]:
+    """Collectors reading the synthetic host, by snapshot section."""
+    proc = root / "proc"
+    sys = root / "sys"
+    return {
+        "cpu": CPUCollector(
+            proc_stat=str(proc / "stat"),
+            cpufreq=str(sys / "devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"),
+        ),
+        "memory": MemoryCollector(meminfo=str(proc / "meminfo")),
+        "disk": DiskCollector(
+            usage=DiskUsage(MountTable(str(proc / "self" / "mountinfo"))),
+            io=DiskIO(diskstats=str(proc / "diskstats"), sys_block=str(sys / "block")),
+        ),
+        "network": NetworkCollector(
+            exclude=("lo",),
+            net_dev=str(proc / "net" / "dev"),
+            sys_class_net=str(sys / "class" / "net"),
+            sys_virtual_net=str(sys / "devices" / "virtual" / "net"),
+        ),
+        "sensors": SensorsCollector(
+            thermal_root=str(sys / "class" / "thermal"),
+            hwmon_root=str(sys / "class" / "hwmon"),
+            throttled_globs=(),
+            vcgencmd=str(root / "none"),
+        ),
+        "overview": OverviewCollector(),
+        "load": LoadCollector(uptime=str(proc / "uptime"), loadavg=str(proc / "loadavg")),
+        "processes": ProcessCollector(
+            scanner=ProcessScanner(str(proc), cpu_count=CPUS, clock_ticks=100, page_size=4096)
+        ),
+        "docker": DockerCollector(socket_path=str(root / "docker.sock"), proc_root=str(proc)),
+        "tailscale": TailscaleCollector(
+            cache_ttl=0.0, socket_path=str(root / "tailscaled.sock"), cli=str(root / "none")
+        ),
+    }
+
+
+def measure(fn: Callable[[], Any], calls: int) -> dict[str, Any]:
+    """Latency over `calls` calls, then tracemalloc figures for one more."""
+    fn()  # First call opens files and fills caches
+    times = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e6)
+    times.sort()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    retained = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+
+    return {
+        "calls": calls,
+        "mean_us": round(statistics.fmean(times), 1),
+        "p50_us": round(times[len(times) // 2], 1),
+        "p95_us": round(times[int(len(times) * 0.95)], 1),
+        "max_us": round(times[-1], 1),
+        "peak_kb": round((peak - base) / 1024, 1),
+        "retained_blocks": sum(s.count_diff for s in retained),
+        "retained_kb": round(sum(s.size_diff for s in retained) / 1024, 1),
+    }
+
+
+def bench_config() -> Config:
+    """Every section due on every cycle, with no deadline cutting a run short."""
+    sections = ("overview", "load", "cpu", "memory", "disk", "network", "sensors", "docker")
+    return Config(
+        cache=CacheConfig(process_list_ttl=0.0, tailscale_cache_ttl=0.0),
+        sampler=SamplerConfig(
+            enabled=False,
+            collector_deadline_sec=60.0,
+            collector_intervals=dict.fromkeys(sections, 0.0),
+        ),
+        speedtest=SpeedtestConfig(enabled=False),
+    )
+
+
+def run(root: Path, calls: int, cycles: int) -> dict[str, Any]:
+    """Time each collector, then full sampling cycles, over the host at root."""
+    results: dict[str, Any] = {"collectors": {}}
+    collectors = make_collectors(root)
+    for name, collector in collectors.items():
+        results["collectors"][name] = measure(collector.collect, calls)
+
+    # Fresh collectors so the cycle starts from cold caches like a new process
+    handler = SystemStatsHandler(bench_config(), collectors=make_collectors(root))
+    try:
+        results["cycle"] = measure(handler._collect_all_stats, cycles)
+    finally:
+        handler.stop()
+    for collector in collectors.values():
+        close = getattr(collector, "close", None)
+        if close is not None:
+            close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=3000)
+    parser.add_argument("--interfaces", type=int, default=200)
+    parser.add_argument("--disks", type=int, default=24)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench-host-"))
+    try:
+        build_host(root, args.processes, args.interfaces, args.disks)
+        result = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processes": args.processes,
+            "interfaces": args.interfaces,
+            "disks": args.disks,
+            **run(root, args.calls, args.cycles),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    # ru_maxrss is in KB on Linux
+    result["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
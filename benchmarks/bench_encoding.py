@@ -0,0 +1,72 @@
+"""Micro-benchmark for /api/system-stats response encoding.
+
+Compares the per-request cost of the original path (json.dumps with
+indent=2 on every request) with the pre-serialized response cache, for
+a number of requests served from one snapshot.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_encoding.py --requests 20
+"""
+
+import argparse
+import json
+import time
+
+from monitor.config import Config
+from monitor.handlers.system import SystemStatsHandler
+from monitor.response_cache import ResponseCache
+
+
+def _per_request(fn, requests: int, rounds: int) -> tuple[float, bytes]:
+    """Return (CPU microseconds per request, last body)."""
+    body = b""
+    start = time.process_time()
+    for _ in range(rounds):
+        for _ in range(requests):
+            body = fn()
+    elapsed = time.process_time() - start
+    return elapsed / (rounds * requests) * 1e6, body
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20, help="requests per snapshot")
+    parser.add_argument("--rounds", type=int, default=200, help="snapshots to simulate")
+    args = parser.parse_args()
+
+    handler = SystemStatsHandler(Config())
+    snapshot = handler.sampler.sample_now()
+
+    def baseline() -> bytes:
+        return json.dumps(handler.get_payload(snapshot), ensure_ascii=False, indent=2).encode()
+
+    results = {}
+    for name, gzip_ok in (("cached_identity", False), ("cached_gzip", True)):
+        cache = ResponseCache()
+        round_counter = [0]
+
+        def cached(
+            cache: ResponseCache = cache,
+            round_counter: list = round_counter,
+            gzip_ok: bool = gzip_ok,
+        ) -> bytes:
+            round_counter[0] += 1
+            if round_counter[0] % args.requests == 1:
+                cache.invalidate()  # New snapshot published
+            body, _ = cache.get(
+                f"{snapshot.seq}", lambda: handler.get_payload(snapshot), gzip_ok=gzip_ok
+            )
+            return body
+
+        us, body = _per_request(cached, args.requests, args.rounds)
+        results[name] = {"cpu_us_per_request": round(us, 1), "bytes": len(body)}
+
+    us, body = _per_request(baseline, args.requests, args.rounds)
+    results["baseline_indent2"] = {"cpu_us_per_request": round(us, 1), "bytes": len(body)}
+
+    print(json.dumps({"requests_per_snapshot": args.requests, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Benchmark for kept-open procfs/sysfs reads.
+
+Times one sampling pass over the files the per-sample collectors read
+(/proc/stat, meminfo, net/dev, diskstats, cpufreq and thermal zones) on
+the live system, reading each file either with open()/read()/close() or
+through a kept-open ProcFile, and reports the peak memory traced by
+tracemalloc during a pass.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_procfs.py --passes 2000
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+from monitor.collectors.procfs import ProcFile
+
+FILES = [
+    "/proc/stat",
+    "/proc/meminfo",
+    "/proc/net/dev",
+    "/proc/diskstats",
+    "/proc/uptime",
+    "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq",
+]
+
+
+def sample_files() -> list[str]:
+    """The readable files of one sampling pass on this machine."""
+    paths = FILES + sorted(glob.glob("/sys/class/thermal/thermal_zone*/temp"))
+    return [p for p in paths if os.access(p, os.R_OK)]
+
+
+def read_with_open(paths: list[str]) -> int:
+    total = 0
+    for path in paths:
+        with open(path) as f:
+            total += len(f.read())
+    return total
+
+
+def read_kept_open(files: list[ProcFile]) -> int:
+    total = 0
+    for f in files:
+        total += len(f.read_text())
+    return total
+
+
+def _time(fn, arg, passes: int) -> dict:
+    fn(arg)  # Warm up (opens the kept-open descriptors)
+    t0 = time.perf_counter()
+    for _ in range(passes):
+        fn(arg)
+    per_pass_us = (time.perf_counter() - t0) * 1e6 / passes
+
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"per_pass_us": round(per_pass_us, 1), "peak_bytes": peak}
+
+
+def run(passes: int) -> dict:
+    paths = sample_files()
+    files = [ProcFile(p) for p in paths]
+    try:
+        return {
+            "files": len(paths),
+            "passes": passes,
+            "open_read_close": _time(read_with_open, paths, passes),
+            "procfile": _time(read_kept_open, files, passes),
+        }
+    finally:
+        for f in files:
+            f.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passes", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.passes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
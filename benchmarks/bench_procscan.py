@@ -0,0 +1,108 @@
+"""Benchmark for the /proc process scanner.
+
+Builds a synthetic /proc tree with N processes and times repeated scans
+(the first scan reads every command line; later ones hit the identity
+cache), then compares top-N selection against a full sort. With
+--compare-ps it also times `ps aux --sort=-%cpu` on the live system for
+reference.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_procscan.py --processes 2000 --scans 20
+"""
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from monitor.collectors.procscan import ProcessScanner
+
+
+def build_tree(root: Path, processes: int, seed: int = 0) -> None:
+    """Write a /proc-like tree with the given number of processes."""
+    rng = random.Random(seed)
+    (root / "meminfo").write_text("MemTotal:        8000000 kB\n")
+    for pid in range(1, processes + 1):
+        d = root / str(pid)
+        d.mkdir()
+        _write_stat(d, pid, rng.randrange(10_000), rng.randrange(1_000_000))
+        (d / "cmdline").write_bytes(f"/usr/bin/worker-{pid}\0--flag\0value\0".encode())
+    # Non-pid entries are skipped by the scanner
+    (root / "self").mkdir()
+    (root / "sys").mkdir()
+
+
+def _write_stat(d: Path, pid: int, ticks: int, starttime: int) -> None:
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194560", "0", "0", "0", "0"]
+    fields += [str(ticks), "0", "0", "0", "20", "0", "1", "0", str(starttime)]
+    fields += ["1000000", str(pid % 5000), "18446744073709551615"]
+    (d / "stat").write_text(f"{pid} (worker-{pid}) {' '.join(fields)}\n")
+
+
+def run(root: Path, scans: int, limit: int) -> dict:
+    """Time scans and top-N selection over the tree at root."""
+    scanner = ProcessScanner(str(root), cpu_count=4, clock_ticks=100, page_size=4096)
+
+    t0 = time.perf_counter()
+    table = scanner.scan()
+    cold_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    for _ in range(scans):
+        table = scanner.scan()
+    warm_ms = (time.perf_counter() - t0) * 1000 / scans
+
+    rounds = 200
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        scanner.top(limit, key=lambda p: (p.cpu, p.rss))
+    top_us = (time.perf_counter() - t0) * 1e6 / rounds
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        sorted(table, key=lambda p: (p.cpu, p.rss), reverse=True)[:limit]
+    sort_us = (time.perf_counter() - t0) * 1e6 / rounds
+
+    return {
+        "processes": len(table),
+        "cold_scan_ms": round(cold_ms, 2),
+        "warm_scan_ms": round(warm_ms, 2),
+        "top_n_us": round(top_us, 1),
+        "full_sort_us": round(sort_us, 1),
+        "limit": limit,
+    }
+
+
+def time_ps(rounds: int = 5) -> float:
+    """Mean wall time in ms of `ps aux --sort=-%cpu` on this machine."""
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        subprocess.run(["ps", "aux", "--sort=-%cpu"], capture_output=True, check=False)
+    return round((time.perf_counter() - t0) * 1000 / rounds, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=2000)
+    parser.add_argument("--scans", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--compare-ps", action="store_true")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench-proc-"))
+    try:
+        build_tree(root, args.processes)
+        result = run(root, args.scans, args.limit)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    if args.compare_ps:
+        result["ps_live_ms"] = time_ps()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Load comparison of the threaded and asyncio server engines.
+
+Starts the monitor once per engine as a subprocess and drives it with
+concurrent pollers hitting /api/system-stats as fast as they can. Each
+poller keeps its connection open when the server allows it (the asyncio
+engine) and reconnects per request otherwise (the threaded engine speaks
+HTTP/1.0). Reports requests per second plus the server's CPU time per
+request, peak RSS and thread count sampled from /proc.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_server.py --clients 50 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _proc_status(pid: int) -> dict[str, int]:
+    """Return RSS (KiB), thread count and CPU ticks for a process."""
+    fields = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "Threads"):
+                fields[key] = int(value.split()[0])
+    with open(f"/proc/{pid}/stat") as f:
+        stat = f.read().rsplit(")", 1)[1].split()
+    fields["ticks"] = int(stat[11]) + int(stat[12])
+    return fields
+
+
+async def _poller(port: int, deadline: float, counts: list[int]) -> None:
+    """Request /api/system-stats until the deadline, reusing the connection if allowed."""
+    reader = writer = None
+    request = b"GET /api/system-stats HTTP/1.1\r\nHost: bench\r\nAccept-Encoding: gzip\r\n\r\n"
+    while time.monotonic() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        keep_alive = head.startswith(b"HTTP/1.1")
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection" and value.strip().lower() == b"close":
+                keep_alive = False
+        await reader.readexactly(length)
+        counts[0] += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _wait_ready(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def _bench_engine(engine: str, clients: int, duration: float) -> dict[str, float]:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(ROOT / "src"),
+        MONITOR_PORT=str(port),
+        MONITOR_SERVER_ENGINE=engine,
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "monitor"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_ready(port)
+        await asyncio.sleep(1.0)  # Let the first snapshot land
+        before = _proc_status(proc.pid)
+        peak_rss = peak_threads = 0
+        counts = [0]
+        deadline = time.monotonic() + duration
+        tasks = [asyncio.create_task(_poller(port, deadline, counts)) for _ in range(clients)]
+        start = time.monotonic()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+            status = _proc_status(proc.pid)
+            peak_rss = max(peak_rss, status["VmRSS"])
+            peak_threads = max(peak_threads, status["Threads"])
+        await asyncio.gather(*tasks, return_exceptions=True)
+        elapsed = time.monotonic() - start
+        after = _proc_status(proc.pid)
+        cpu_sec = (after["ticks"] - before["ticks"]) / os.sysconf("SC_CLK_TCK")
+        return {
+            "requests": counts[0],
+            "req_per_sec": round(counts[0] / elapsed, 1),
+            "server_cpu_ms_per_request": round(cpu_sec * 1000 / max(counts[0], 1), 3),
+            "peak_rss_mib": round(peak_rss / 1024, 1),
+            "peak_threads": peak_threads,
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50, help="concurrent pollers")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per engine")
+    args = parser.parse_args()
+
+    results = {}
+    for engine in ("threaded", "asyncio"):
+        results[engine] = asyncio.run(_bench_engine(engine, args.clients, args.duration))
+    print(json.dumps({"clients": args.clients, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""Benchmark for the persistent metric store.
+
+Simulates N days of sampling through MetricStore and reports write
+amplification (bytes written per sample) and startup reload time.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_storage.py --days 30 --dir /var/tmp/bench
+"""
+
+import argparse
+import json
+import math
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from monitor.history import HISTORY_METRICS, MetricHistory
+from monitor.storage import MetricStore
+
+
+def _proc_write_bytes() -> Optional[int]:
+    """Bytes this process caused to be sent to the block layer."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run(directory: Path, days: float, interval: float, flush_sec: float) -> dict:
+    """Run the write and reload benchmark in directory."""
+    metrics = HISTORY_METRICS
+    store = MetricStore(
+        directory,
+        metrics,
+        interval_sec=interval,
+        flush_interval_sec=flush_sec,
+        retention_sec=days * 86400 + 86400,
+    )
+    samples = int(days * 86400 / interval)
+    start_ts = 1_700_000_000.0
+    values = [float(i) for i in range(len(metrics))]
+
+    io_before = _proc_write_bytes()
+    t0 = time.perf_counter()
+    for i in range(samples):
+        values[0] = 50 + 40 * math.sin(i / 500)
+        store.append(start_ts + i * interval, values)
+    store.close()
+    write_sec = time.perf_counter() - t0
+    io_after = _proc_write_bytes()
+
+    end_ts = start_ts + (samples - 1) * interval
+
+    # Startup path: reload the in-memory window (1 hour)
+    history = MetricHistory.for_window(3600, interval, metrics)
+    t0 = time.perf_counter()
+    reopened = MetricStore(directory, metrics, interval_sec=interval)
+    for record in reopened.read(start=end_ts - 3600):
+        history.append(record[0], record[1:])
+    reload_window_sec = time.perf_counter() - t0
+
+    # Full scan of everything on disk
+    t0 = time.perf_counter()
+    count = sum(1 for _ in reopened.read())
+    full_scan_sec = time.perf_counter() - t0
+    reopened.close()
+
+    disk_bytes = sum(p.stat().st_blocks * 512 for p in directory.glob("*.seg"))
+    result = {
+        "days": days,
+        "interval_sec": interval,
+        "flush_interval_sec": flush_sec,
+        "samples": samples,
+        "record_size": store.record_size,
+        "msync_bytes": store.bytes_written,
+        "msync_bytes_per_sample": round(store.bytes_written / samples, 2),
+        "write_amplification": round(store.bytes_written / (samples * store.record_size), 3),
+        "write_sec": round(write_sec, 3),
+        "reload_window_sec": round(reload_window_sec, 4),
+        "reload_window_samples": len(history),
+        "full_scan_sec": round(full_scan_sec, 3),
+        "full_scan_samples": count,
+        "disk_bytes": disk_bytes,
+    }
+    if io_before is not None and io_after is not None:
+        block_bytes = io_after - io_before
+        result["block_write_bytes"] = block_bytes
+        result["block_write_bytes_per_sample"] = round(block_bytes / samples, 2)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--flush", type=float, default=300.0, help="flush interval seconds")
+    parser.add_argument("--dir", type=Path, help="directory on the target filesystem")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="bench-storage-", dir=args.dir))
+    try:
+        print(json.dumps(run(directory, args.days, args.interval, args.flush), indent=2))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
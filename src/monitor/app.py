@@ -0,0 +1,353 @@
+"""Transport-independent request routing.
+
+MonitorApp owns the sampler, handlers and caches, and turns a parsed
+Request into a Response. The threaded and asyncio server engines only
+deal with sockets and HTTP framing.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Optional, Union
+from urllib.parse import parse_qs
+
+from monitor.config import Config, get_config
+from monitor.handlers import (
+    HealthHandler,
+    HistoryHandler,
+    ProcessesHandler,
+    SystemStatsHandler,
+    TailscaleHandler,
+)
+from monitor.history import MetricHistory
+from monitor.response_cache import ResponseCache, accepts_gzip
+from monitor.rollup import RollupEngine, TierSpec
+from monitor.speedtest import SpeedtestManager
+from monitor.static_assets import StaticAsset, StaticAssets
+from monitor.storage import MetricStore
+from monitor.stream import SnapshotBroadcaster
+
+logger = logging.getLogger(__name__)
+
+_NO_STORE_HEADERS = [
+    ("Cache-Control", "no-store, no-cache, must-revalidate"),
+    ("Pragma", "no-cache"),
+    ("Expires", "0"),
+]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _normalize_path(path: str) -> str:
+    """Strip /monitor prefix for Tailscale Funnel compatibility."""
+    if path.startswith("/monitor/"):
+        return path[8:] or "/"
+    if path == "/monitor":
+        return "/"
+    return path
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request.
+
+    Header names are matched case-insensitively.
+    """
+
+    target: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.headers = {k.lower(): v for k, v in self.headers.items()}
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a request header value."""
+        return self.headers.get(name.lower(), default)
+
+
+@dataclass
+class Response:
+    """A complete HTTP response; body is empty for 304."""
+
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes = b""
+
+
+@dataclass
+class StreamResponse:
+    """An SSE response; the engine writes `preamble` and then frames.
+
+    The engine must call `broadcaster.release()` when the client leaves.
+    """
+
+    broadcaster: SnapshotBroadcaster
+    last_seq: int
+    preamble: bytes
+    heartbeat: float
+    headers: list[tuple[str, str]] = field(
+        default_factory=lambda: [
+            ("Content-Type", "text/event-stream"),
+            ("Cache-Control", "no-cache"),
+            ("X-Accel-Buffering", "no"),
+        ]
+    )
+    status: int = 200
+
+
+class MonitorApp:
+    """Routes monitor requests and owns the metric pipeline."""
+
+    def __init__(self, config: Optional[Config] = None):
+        config = config or get_config()
+        self._config = config
+
+        # Initialize handlers
+        self.speedtest = SpeedtestManager(config.speedtest)
+        self.system_handler = SystemStatsHandler(config, speedtest=self.speedtest)
+        # Shares the sampler's collector so both read one cached status
+        self.tailscale_handler = TailscaleHandler(self.system_handler.tailscale_collector)
+        sampler = self.system_handler.sampler
+
+        # Encoded stats bodies live until the next snapshot is published
+        self.response_cache = ResponseCache()
+        sampler.subscribe(self.response_cache.invalidate)
+
+        # Server-side history fed by the sampler
+        history = MetricHistory.for_window(config.history.window_sec, config.sampler.interval_sec)
+        rollups = RollupEngine(
+            history,
+            config.sampler.interval_sec,
+            tiers=(
+                TierSpec("1m", 60.0, config.history.minute_window_sec),
+                TierSpec("1h", 3600.0, config.history.hour_window_sec),
+            ),
+        )
+        sampler.subscribe(history.record)
+        sampler.subscribe(rollups.record)
+        self.history_handler = HistoryHandler(history, rollups)
+
+        # Process table from the sampler's latest scan, paged on request
+        self.processes_handler = ProcessesHandler(self.system_handler.process_scanner)
+
+        # Live push to /api/stream clients
+        self.broadcaster = SnapshotBroadcaster(
+            max_clients=config.server.max_stream_clients,
+            generation=self.system_handler.generation,
+        )
+        sampler.subscribe(self.broadcaster.publish)
+
+        # Optional persistence; reload recent history before sampling starts
+        self.metric_store: Optional[MetricStore] = None
+        if config.storage.directory is not None:
+            store = MetricStore(
+                config.storage.directory,
+                history.metrics,
+                interval_sec=config.sampler.interval_sec,
+                flush_interval_sec=config.storage.flush_interval_sec,
+                segment_sec=config.storage.segment_sec,
+                retention_sec=config.storage.retention_days * 86400,
+            )
+            now = time.time()
+            for record in store.read(start=now - config.history.window_sec):
+                history.append(record[0], record[1:])
+            rollups.start_backfill(
+                store.read(
+                    start=now
+                    - max(config.history.minute_window_sec, config.history.hour_window_sec)
+                )
+            )
+            sampler.subscribe(store.record)
+            self.metric_store = store
+
+        self.static_assets = StaticAssets(config.static_dir, dev=config.server.dev_mode)
+        self.static_assets.preload()
+
+    def start(self) -> None:
+        """Start background sampling."""
+        self.system_handler.start()
+
+    def stop(self) -> None:
+        """End streams, stop sampling and flush persisted metrics."""
+        self.broadcaster.close()
+        self.system_handler.stop()
+        if self.metric_store is not None:
+            self.metric_store.close()
+
+    def handle(self, request: Request) -> Union[Response, StreamResponse]:
+        """Route a GET request."""
+        raw_path, _, query = request.target.partition("?")
+        path = _normalize_path(raw_path)
+
+        if path == "/" or path == "":
+            return self._serve_static(request, "index.html")
+        if path.startswith("/static/"):
+            return self._serve_static(request, path[len("/static/") :])
+        if path == "/api/system-stats":
+            return self._serve_system_stats(request, parse_qs(query))
+        if path == "/api/stream":
+            return self._serve_stream(request)
+        if path == "/api/history":
+            return self._serve_history(parse_qs(query))
+        if path == "/api/processes":
+            return self._serve_processes(self.processes_handler.get_processes, parse_qs(query))
+        if path == "/api/processes/groups":
+            return self._serve_processes(self.processes_handler.get_groups, parse_qs(query))
+        if path == "/api/tailscale-ip":
+            return self.json_response(200, self.tailscale_handler.get_info())
+        if path == "/api/health":
+            return self.json_response(200, HealthHandler.check())
+        return self.json_response(404, {"error": "Not found"})
+
+    def json_response(self, code: int, obj: Any, etag: Optional[str] = None) -> Response:
+        """Build a JSON response.
+
+        Responses with an ETag may be stored but must be revalidated;
+        all others are marked uncacheable.
+        """
+        body = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return self._body_response(code, body, "application/json", etag=etag)
+
+    def _body_response(
+        self,
+        code: int,
+        body: bytes,
+        content_type: str,
+        etag: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> Response:
+        """Build a response around an already encoded body."""
+        headers = [("Content-Type", content_type)]
+        if etag:
+            headers += [
+                ("ETag", etag),
+                ("Cache-Control", "no-cache"),
+                ("Vary", "Accept-Encoding"),
+            ]
+        else:
+            headers += _NO_STORE_HEADERS
+        if content_encoding:
+            headers.append(("Content-Encoding", content_encoding))
+        headers.append(("Content-Length", str(len(body))))
+        return Response(code, headers, body)
+
+    def _serve_static(self, request: Request, name: str) -> Response:
+        """Serve a file from the static directory out of memory."""
+        asset = self.static_assets.get(name)
+        if asset is None:
+            return self.json_response(404, {"error": f"{name} not found"})
+
+        if _etag_matches(request.header("If-None-Match"), asset.etag) or (
+            request.header("If-None-Match") is None
+            and request.header("If-Modified-Since") == asset.last_modified
+        ):
+            return Response(304, self._static_headers(asset))
+
+        body, encoding = asset.body, None
+        if asset.gzip_body is not None and accepts_gzip(request.header("Accept-Encoding")):
+            body, encoding = asset.gzip_body, "gzip"
+        headers = self._static_headers(asset) + [("Content-Type", asset.content_type)]
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+        headers.append(("Content-Length", str(len(body))))
+        return Response(200, headers, body)
+
+    def _static_headers(self, asset: StaticAsset) -> list[tuple[str, str]]:
+        """Validator and caching headers for a static asset."""
+        if self._config.server.dev_mode:
+            cache_control = "no-cache"
+        elif asset.content_type.startswith("text/html"):
+            # The page URL is not versioned, so it must be revalidated
+            cache_control = "no-cache"
+        else:
+            cache_control = f"public, max-age={self._config.server.static_max_age}"
+        return [
+            ("ETag", asset.etag),
+            ("Last-Modified", asset.last_modified),
+            ("Cache-Control", cache_control),
+            ("Vary", "Accept-Encoding"),
+        ]
+
+    def _serve_system_stats(self, request: Request, params: dict[str, list[str]]) -> Response:
+        """Serve system statistics, or only changes with ?since=<seq>&generation=<gen>."""
+        since_values = params.get("since")
+        since: Optional[int] = None
+        if since_values:
+            if not since_values[0].isdigit():
+                return self.json_response(400, {"error": f"Invalid since: {since_values[0]!r}"})
+            since = int(since_values[0])
+        generation_values = params.get("generation")
+        generation = generation_values[0] if generation_values else None
+
+        # Revalidation is decided before any encoding work
+        snapshot = self.system_handler.get_snapshot()
+        etag = self.system_handler.etag(snapshot, since, generation)
+        if _etag_matches(request.header("If-None-Match"), etag):
+            return Response(304, [("ETag", etag), ("Cache-Control", "no-cache")])
+
+        build: Callable[[], dict[str, Any]]
+        if since is not None:
+            build = partial(self.system_handler.get_delta, since, snapshot, generation)
+        else:
+            build = partial(self.system_handler.get_payload, snapshot)
+
+        body, encoding = self.response_cache.get(
+            etag, build, gzip_ok=accepts_gzip(request.header("Accept-Encoding"))
+        )
+        return self._body_response(
+            200, body, "application/json", etag=etag, content_encoding=encoding
+        )
+
+    def _serve_stream(self, request: Request) -> Union[Response, StreamResponse]:
+        """Open a Server-Sent Events stream of snapshots."""
+        if not self.broadcaster.acquire():
+            return self.json_response(503, {"error": "Too many stream clients"})
+
+        # Ids are "<generation>-<seq>"; one from before a restart (whose
+        # sequence numbers started over) resumes from scratch
+        generation, _, last_id = (request.header("Last-Event-ID", "") or "").rpartition("-")
+        last_seq = 0
+        if generation == self.system_handler.generation and last_id.isdigit():
+            last_seq = int(last_id)
+        preamble = b"retry: 5000\n\n"
+        seq, frame = self.broadcaster.latest()
+        if frame is not None and seq > last_seq:
+            preamble += frame
+            last_seq = seq
+        return StreamResponse(
+            broadcaster=self.broadcaster,
+            last_seq=last_seq,
+            preamble=preamble,
+            heartbeat=self._config.server.stream_heartbeat_sec,
+        )
+
+    def _serve_history(self, params: dict[str, list[str]]) -> Response:
+        """Serve recorded metric history."""
+        try:
+            return self.json_response(200, self.history_handler.get_history(params))
+        except ValueError as e:
+            return self.json_response(400, {"error": str(e)})
+
+    def _serve_processes(
+        self, query: Callable[[dict[str, list[str]]], dict[str, Any]], params: dict[str, list[str]]
+    ) -> Response:
+        """Serve a process table page or group totals."""
+        try:
+            return self.json_response(200, query(params))
+        except ValueError as e:
+            return self.json_response(400, {"error": str(e)})
@@ -0,0 +1,327 @@
+"""asyncio HTTP engine for Raspberry Monitor.
+
+Serves the same routes as the threaded server from a single event loop
+using asyncio streams. Connections are kept alive between requests
+(HTTP/1.1 default, HTTP/1.0 on request), so dashboards polling every
+couple of seconds reuse one socket instead of paying for a new
+connection and thread each time. Request handling runs in a small thread
+pool so a slow collector never stalls the loop; /api/stream clients wait
+on the loop itself and cost no thread at all.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Optional
+
+from monitor import __version__
+from monitor.app import MonitorApp, Request, Response, StreamResponse
+from monitor.config import Config, get_config
+from monitor.stream import HEARTBEAT_FRAME
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the request line plus headers
+MAX_HEADER_BYTES = 16 * 1024
+
+_SERVER_HEADER = f"RaspberryMonitor/{__version__}"
+
+
+def _status_line(version: str, status: int) -> bytes:
+    try:
+        phrase = HTTPStatus(status).phrase
+    except ValueError:
+        phrase = ""
+    return f"{version} {status} {phrase}\r\n".encode("latin-1")
+
+
+class _HttpError(Exception):
+    """A malformed request that ends the connection."""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+def _parse_head(head: bytes) -> tuple[str, str, str, dict[str, str]]:
+    """Parse a request line and headers.
+
+    Returns:
+        (method, target, version, headers)
+
+    Raises:
+        _HttpError: If the request is malformed
+    """
+    try:
+        text = head.decode("latin-1")
+    except UnicodeDecodeError:
+        raise _HttpError(400) from None
+    lines = text.split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise _HttpError(400)
+    method, target, version = parts
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise _HttpError(505)
+
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep or not name or name != name.strip():
+            raise _HttpError(400)
+        name = name.lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return method, target, version, headers
+
+
+def _wants_keep_alive(version: str, headers: dict[str, str]) -> bool:
+    """Apply the HTTP/1.0 and HTTP/1.1 persistent connection defaults."""
+    tokens = {t.strip().lower() for t in headers.get("connection", "").split(",")}
+    if version == "HTTP/1.1":
+        return "close" not in tokens
+    return "keep-alive" in tokens
+
+
+class AsyncMonitorServer:
+    """Event-loop HTTP server in front of a MonitorApp."""
+
+    def __init__(
+        self,
+        app: MonitorApp,
+        host: str = "0.0.0.0",
+        port: int = 10000,
+        keepalive_timeout: float = 15.0,
+        max_workers: int = 4,
+    ):
+        self._app = app
+        self._host = host
+        self._port = port
+        self._keepalive_timeout = keepalive_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self._server: Optional[asyncio.Server] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._frame_event: Optional[asyncio.Event] = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._closing = False
+        self._date = ""
+        self._date_second = -1
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started on port 0)."""
+        if self._server is not None and self._server.sockets:
+            return int(self._server.sockets[0].getsockname()[1])
+        return self._port
+
+    async def start(self) -> None:
+        """Bind the listening socket."""
+        self._loop = asyncio.get_running_loop()
+        self._frame_event = asyncio.Event()
+        self._app.broadcaster.add_listener(self._on_frame)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self._host, self._port, limit=MAX_HEADER_BYTES
+        )
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and end open streams."""
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        self._wake_streams()
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def _on_frame(self, seq: int, frame: bytes) -> None:
+        """Broadcaster listener; called from the sampler thread."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake_streams)
+            except RuntimeError:
+                pass  # Loop shut down between the check and the call
+
+    def _wake_streams(self) -> None:
+        """Wake every stream waiting for the next frame."""
+        event = self._frame_event
+        if event is not None:
+            self._frame_event = asyncio.Event()
+            event.set()
+
+    def _http_date(self) -> str:
+        now = int(time.time())
+        if now != self._date_second:
+            self._date_second = now
+            self._date = formatdate(now, usegmt=True)
+        return self._date
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests on one connection until it closes or idles out."""
+        self._connections.add(writer)
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass  # Client went away or idled out
+        except Exception:
+            logger.exception("Error handling connection")
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Serve one request.
+
+        Returns:
+            True if the connection should stay open for another request
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self._keepalive_timeout)
+        except asyncio.LimitOverrunError:
+            await self._send_error(writer, "HTTP/1.1", 431)
+            return False
+
+        try:
+            method, target, version, headers = _parse_head(head[:-4])
+        except _HttpError as e:
+            await self._send_error(writer, "HTTP/1.1", e.status)
+            return False
+
+        if method not in ("GET", "HEAD"):
+            await self._send_error(writer, version, 405, [("Allow", "GET, HEAD")])
+            return False
+        if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+            # Request bodies are never expected; don't try to skip them
+            await self._send_error(writer, version, 400)
+            return False
+
+        keep_alive = _wants_keep_alive(version, headers)
+        response = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._app.handle, Request(target, headers)
+        )
+        if isinstance(response, StreamResponse):
+            await self._send_stream(writer, version, response, head_only=method == "HEAD")
+            return False
+
+        await self._send(writer, version, response, keep_alive, head_only=method == "HEAD")
+        return keep_alive
+
+    def _head_bytes(
+        self, version: str, status: int, headers: list[tuple[str, str]], keep_alive: bool
+    ) -> bytearray:
+        out = bytearray(_status_line(version, status))
+        out += f"Server: {_SERVER_HEADER}\r\nDate: {self._http_date()}\r\n".encode("latin-1")
+        for name, value in headers:
+            out += f"{name}: {value}\r\n".encode("latin-1")
+        if keep_alive:
+            if version == "HTTP/1.0":
+                out += b"Connection: keep-alive\r\n"
+            out += f"Keep-Alive: timeout={int(self._keepalive_timeout)}\r\n".encode("latin-1")
+        else:
+            out += b"Connection: close\r\n"
+        out += b"\r\n"
+        return out
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        version: str,
+        response: Response,
+        keep_alive: bool,
+        head_only: bool = False,
+    ) -> None:
+        out = self._head_bytes(version, response.status, response.headers, keep_alive)
+        if not head_only:
+            out += response.body
+        writer.write(out)
+        await writer.drain()
+
+    async def _send_error(
+        self,
+        writer: asyncio.StreamWriter,
+        version: str,
+        status: int,
+        headers: Optional[list[tuple[str, str]]] = None,
+    ) -> None:
+        headers = list(headers or []) + [("Content-Length", "0")]
+        await self._send(writer, version, Response(status, headers), keep_alive=False)
+
+    async def _send_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        version: str,
+        response: StreamResponse,
+        head_only: bool = False,
+    ) -> None:
+        """Push each new snapshot to the client as Server-Sent Events."""
+        broadcaster = response.broadcaster
+        try:
+            writer.write(
+                self._head_bytes(version, response.status, response.headers, keep_alive=False)
+            )
+            if head_only:
+                await writer.drain()
+                return
+            writer.write(response.preamble)
+            await writer.drain()
+
+            last_seq = response.last_seq
+            while not (broadcaster.closed or self._closing):
+                event = self._frame_event
+                assert event is not None  # Created in start()
+                seq, frame = broadcaster.latest()
+                if frame is None or seq <= last_seq:
+                    try:
+                        await asyncio.wait_for(event.wait(), response.heartbeat)
+                    except asyncio.TimeoutError:
+                        writer.write(HEARTBEAT_FRAME)
+                        await writer.drain()
+                    continue
+                writer.write(frame)
+                last_seq = seq
+                await writer.drain()
+        finally:
+            broadcaster.release()
+
+
+def run(app: MonitorApp, config: Optional[Config] = None) -> None:
+    """Serve until interrupted."""
+    config = config or get_config()
+    server = AsyncMonitorServer(
+        app,
+        host=config.server.host,
+        port=config.server.port,
+        keepalive_timeout=config.server.keepalive_timeout_sec,
+    )
+
+    async def _main() -> None:
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    asyncio.run(_main())
@@ -0,0 +1,97 @@
+"""Concurrent collector execution with per-collector deadlines.
+
+Collectors run side by side on a small bounded thread pool, so one
+snapshot costs about as long as its slowest collector instead of the sum
+of all of them. A collector that misses its deadline keeps running in
+the background; the snapshot uses its last good value and lists it as
+stale, and it is not started again until the overdue run finishes.
+"""
+
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CollectorPool:
+    """Runs named collect functions concurrently with deadlines."""
+
+    def __init__(self, max_workers: int = 4, deadline: float = 1.5):
+        self._deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector")
+        self._in_flight: dict[str, Future] = {}
+        self._last: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def deadline(self) -> float:
+        """Default per-collector deadline in seconds."""
+        return self._deadline
+
+    def run(
+        self,
+        tasks: dict[str, Callable[[], Any]],
+        deadlines: Optional[dict[str, float]] = None,
+        defaults: Optional[dict[str, Any]] = None,
+    ) -> tuple[dict[str, Any], list[str]]:
+        """Run each task and gather what finishes in time.
+
+        Args:
+            tasks: Collect functions by name
+            deadlines: Per-name deadlines overriding the default
+            defaults: Per-name value for a stale collector that has never
+                succeeded (an empty dict otherwise)
+
+        Returns:
+            (results, stale): a value for every task name, and the names
+            whose value is not from this run (timed out, failed, or still
+            busy with an earlier run)
+        """
+        deadlines = deadlines or {}
+        defaults = defaults or {}
+        started = time.monotonic()
+        futures: dict[str, Future] = {}
+        submitted: list[str] = []
+        with self._lock:
+            for name, fn in tasks.items():
+                pending = self._in_flight.get(name)
+                if pending is None or pending.done():
+                    pending = self._executor.submit(fn)
+                    self._in_flight[name] = pending
+                    submitted.append(name)
+                futures[name] = pending
+        # Outside the lock: the callback runs inline if already finished
+        for name in submitted:
+            futures[name].add_done_callback(functools.partial(self._finished, name))
+
+        results: dict[str, Any] = {}
+        stale: list[str] = []
+        for name, future in futures.items():
+            remaining = started + deadlines.get(name, self._deadline) - time.monotonic()
+            try:
+                results[name] = future.result(timeout=max(0.0, remaining))
+                continue
+            except FutureTimeout:
+                logger.warning("Collector %s missed its deadline", name)
+            except Exception:
+                logger.exception("Collector %s failed", name)
+            stale.append(name)
+            with self._lock:
+                results[name] = self._last.get(name, defaults.get(name, {}))
+        return results, stale
+
+    def _finished(self, name: str, future: Future) -> None:
+        """Remember the value of a successful run, even a late one."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self._last[name] = future.result()
+
+    def close(self) -> None:
+        """Stop accepting work; overdue collectors finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -3,9 +3,11 @@
 from monitor.collectors.base import BaseCollector
 from monitor.collectors.cpu import CPUCollector
 from monitor.collectors.disk import DiskCollector
+from monitor.collectors.docker import DockerCollector
+from monitor.collectors.host import HostSource
 from monitor.collectors.memory import MemoryCollector
 from monitor.collectors.network import NetworkCollector
-from monitor.collectors.overview import OverviewCollector
+from monitor.collectors.overview import LoadCollector, OverviewCollector
 from monitor.collectors.process import ProcessCollector
 from monitor.collectors.sensors import SensorsCollector
 from monitor.collectors.tailscale import TailscaleCollector
@@ -15,6 +17,9 @@ __all__ = [
     "CPUCollector",
     "MemoryCollector",
     "DiskCollector",
+    "DockerCollector",
+    "HostSource",
+    "LoadCollector",
     "NetworkCollector",
     "ProcessCollector",
     "SensorsCollector",
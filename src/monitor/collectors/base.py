@@ -8,8 +8,17 @@ class BaseCollector(ABC):
     """Abstract base class for metric collectors.
 
     All collectors must implement the collect() method and provide a name.
+
+    Subclasses declare how often they need refreshing and how expensive a
+    refresh is; the collector scheduler uses both (config may override
+    the interval).
     """
 
+    # Seconds between refreshes; 0 refreshes on every sampler tick
+    interval: float = 0.0
+    # "light" reads procfs/sysfs; "heavy" forks processes or waits on I/O
+    cost: str = "light"
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -26,5 +35,9 @@ class BaseCollector(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """Release kept-open files and connections; nothing by default."""
+        return None
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
@@ -1,60 +1,152 @@
 """CPU metrics collector."""
 
-from typing import Any
+import time
+from typing import Any, Callable, Optional
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.procfs import ProcFile
+
+# Leading /proc/stat cpu columns; guest and guest_nice are already
+# included in user and nice, so they are not part of the total
+CPU_FIELDS = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
+
+# Counters since boot reported as per-second rates
+_RATE_COUNTERS = {"ctxt": "ctxt_s", "intr": "intr_s", "processes": "forks_s"}
+
+# Instantaneous values reported as-is
+_GAUGES = ("procs_running", "procs_blocked")
+
+
+def parse_proc_stat(text: str) -> tuple[dict[str, tuple[int, ...]], dict[str, int]]:
+    """Split /proc/stat into cpu time rows and scalar counters.
+
+    Returns:
+        ({"cpu": (user, ..., steal), "cpu0": (...), ...},
+         {"ctxt": int, "intr": int, "processes": int,
+          "procs_running": int, "procs_blocked": int})
+    """
+    cpus: dict[str, tuple[int, ...]] = {}
+    counters: dict[str, int] = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(" ")
+        try:
+            if key.startswith("cpu"):
+                values = rest.split()
+                cpus[key] = tuple(int(v) for v in values[: len(CPU_FIELDS)])
+            elif key in _RATE_COUNTERS or key in _GAUGES:
+                # "intr" is followed by per-IRQ counts; the first is the total
+                counters[key] = int(rest.split(None, 1)[0])
+        except (ValueError, IndexError):
+            continue
+    return cpus, counters
+
+
+def busy_percent(prev: tuple[int, ...], curr: tuple[int, ...]) -> float:
+    """CPU usage between two readings of one cpu row (idle and iowait count as idle)."""
+    deltas = [max(0, c - p) for c, p in zip(curr, prev)]
+    total = sum(deltas)
+    if total <= 0:
+        return 0.0
+    return round(100.0 * (1.0 - (deltas[3] + deltas[4]) / total), 1)
+
+
+def time_breakdown(prev: tuple[int, ...], curr: tuple[int, ...]) -> dict[str, float]:
+    """Share of elapsed CPU time spent in each state, in percent."""
+    deltas = [max(0, c - p) for c, p in zip(curr, prev)]
+    total = sum(deltas)
+    return {
+        name: round(100.0 * d / total, 1) if total > 0 else 0.0
+        for name, d in zip(CPU_FIELDS, deltas)
+        if name != "idle"
+    }
 
 
 class CPUCollector(BaseCollector):
     """Collects CPU usage and frequency metrics."""
 
-    def __init__(self):
-        self._last_idle = 0
-        self._last_total = 0
+    def __init__(
+        self,
+        proc_stat: str = "/proc/stat",
+        cpufreq: str = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._proc_stat = ProcFile(proc_stat)
+        self._cpufreq = ProcFile(cpufreq)
+        self._clock = clock
+        self._last_cpus: dict[str, tuple[int, ...]] = {}
+        self._last_counters: dict[str, int] = {}
+        self._last_time: Optional[float] = None
 
     @property
     def name(self) -> str:
         return "cpu"
 
     def collect(self) -> dict[str, Any]:
-        """Collect CPU metrics from /proc/stat and /sys/.../cpufreq.
+        """Collect CPU metrics from one /proc/stat read and cpufreq.
 
         Returns:
             {
-                "percent": float,  # CPU usage percentage (0-100)
-                "freq": int,       # Current frequency in MHz
+                "percent": float,     # CPU usage percentage (0-100)
+                "freq": int,          # Current frequency in MHz
+                "cores": [float],     # Usage per core, in cpu number order
+                "breakdown": {        # Share of time per state, in percent
+                    "user": float, "nice": float, "system": float,
+                    "iowait": float, "irq": float, "softirq": float,
+                    "steal": float,
+                },
+                "ctxt_s": float,        # Context switches per second
+                "intr_s": float,        # Interrupts per second
+                "forks_s": float,       # Processes created per second
+                "procs_running": int,   # Runnable tasks right now
+                "procs_blocked": int,   # Tasks blocked on I/O right now
             }
+            Usage figures and rates are zero on the first call.
         """
-        result = {"percent": 0.0, "freq": 0}
+        result: dict[str, Any] = {
+            "percent": 0.0,
+            "freq": 0,
+            "cores": [],
+            "breakdown": {name: 0.0 for name in CPU_FIELDS if name != "idle"},
+            "ctxt_s": 0.0,
+            "intr_s": 0.0,
+            "forks_s": 0.0,
+            "procs_running": 0,
+            "procs_blocked": 0,
+        }
 
-        # 1. Calculate CPU % using /proc/stat
+        # 1. Usage, per-core usage and kernel counters from /proc/stat
         try:
-            with open("/proc/stat") as f:
-                line = f.readline()
-                if line.startswith("cpu"):
-                    # cpu  user nice system idle iowait irq softirq steal guest guest_nice
-                    parts = [int(x) for x in line.split()[1:]]
-                    idle = parts[3] + parts[4]  # idle + iowait
-                    total = sum(parts)
-
-                    diff_idle = idle - self._last_idle
-                    diff_total = total - self._last_total
-
-                    cpu_percent = 0.0
-                    if diff_total > 0:
-                        cpu_percent = 100.0 * (1.0 - diff_idle / diff_total)
-
-                    self._last_idle = idle
-                    self._last_total = total
-                    result["percent"] = round(cpu_percent, 1)
+            now = self._clock()
+            cpus, counters = parse_proc_stat(self._proc_stat.read_text())
+
+            prev_total = self._last_cpus.get("cpu")
+            if prev_total is not None and "cpu" in cpus:
+                result["percent"] = busy_percent(prev_total, cpus["cpu"])
+                result["breakdown"] = time_breakdown(prev_total, cpus["cpu"])
+
+            cores = sorted((int(k[3:]), k) for k in cpus if k != "cpu")
+            result["cores"] = [
+                busy_percent(self._last_cpus[k], cpus[k]) if k in self._last_cpus else 0.0
+                for _, k in cores
+            ]
+
+            elapsed = now - self._last_time if self._last_time is not None else 0.0
+            for key, out in _RATE_COUNTERS.items():
+                if elapsed > 0 and key in counters and key in self._last_counters:
+                    delta = max(0, counters[key] - self._last_counters[key])
+                    result[out] = round(delta / elapsed, 1)
+            for key in _GAUGES:
+                result[key] = counters.get(key, 0)
+
+            self._last_cpus = cpus
+            self._last_counters = counters
+            self._last_time = now
         except Exception:
             pass
 
         # 2. Get CPU Frequency
-        try:
-            with open("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq") as f:
-                result["freq"] = int(f.read().strip()) // 1000
-        except Exception:
-            pass
+        freq = self._cpufreq.read_int()
+        if freq is not None:
+            result["freq"] = freq // 1000
 
         return result
@@ -1,33 +1,35 @@
 """Disk metrics collector."""
 
-import subprocess
-from typing import Any
+from typing import Any, Optional
 
-from monitor.cache import RateCalculator
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.diskio import DiskIO
+from monitor.collectors.mounts import DiskUsage
 
 
 class DiskCollector(BaseCollector):
     """Collects disk usage and I/O metrics."""
 
-    def __init__(self):
-        self._read_calculator = RateCalculator()
-        self._write_calculator = RateCalculator()
+    def __init__(self, usage: Optional[DiskUsage] = None, io: Optional[DiskIO] = None):
+        self._usage = usage or DiskUsage()
+        self._io = io or DiskIO()
 
     @property
     def name(self) -> str:
         return "disk"
 
     def collect(self) -> dict[str, Any]:
-        """Collect disk metrics from df and /proc/diskstats.
+        """Collect disk metrics from statvfs and /proc/diskstats.
 
         Returns:
             {
-                "percent": float,    # Disk usage percentage
-                "used_gb": float,    # Used space in GB
-                "total_gb": float,   # Total space in GB
-                "read_mb_s": float,  # Read rate in MB/s
-                "write_mb_s": float, # Write rate in MB/s
+                "percent": float,    # Root filesystem usage percentage
+                "used_gb": float,    # Root used space in GB
+                "total_gb": float,   # Root total space in GB
+                "read_mb_s": float,  # Read rate in MB/s, all physical disks
+                "write_mb_s": float, # Write rate in MB/s, all physical disks
+                "mounts": list,      # Usage per mounted filesystem
+                "devices": dict,     # IOPS, MB/s, await and %util per disk
             }
         """
         result = {
@@ -36,44 +38,28 @@ class DiskCollector(BaseCollector):
             "total_gb": 100.0,
             "read_mb_s": 0.0,
             "write_mb_s": 0.0,
+            "mounts": [],
+            "devices": {},
         }
 
-        # 1. Storage Usage from df
+        # 1. Storage usage of every mount; top-level figures are the root's
         try:
-            df_result = subprocess.run(
-                ["df", "/"], capture_output=True, text=True, timeout=2
-            )
-            if df_result.returncode == 0:
-                lines = df_result.stdout.strip().split("\n")
-                if len(lines) >= 2:
-                    parts = lines[1].split()
-                    total = int(parts[1])
-                    used = int(parts[2])
-                    percent = float(parts[4].replace("%", ""))
-                    result["percent"] = round(percent, 1)
-                    result["total_gb"] = round(total / 1024 / 1024, 2)
-                    result["used_gb"] = round(used / 1024 / 1024, 2)
+            mounts = self._usage.collect()
+            result["mounts"] = mounts
+            root = next((m for m in mounts if "total_gb" in m), None)
+            if root is not None:
+                result["percent"] = root["percent"]
+                result["used_gb"] = root["used_gb"]
+                result["total_gb"] = root["total_gb"]
         except Exception:
             pass
 
-        # 2. Disk I/O Rate from /proc/diskstats
+        # 2. Per-device I/O rates from /proc/diskstats
         try:
-            curr_read = 0
-            curr_write = 0
-            with open("/proc/diskstats") as f:
-                for line in f:
-                    parts = line.split()
-                    # Looking for mmcblk0 (SD card), sda (SSD), or vda (virtio)
-                    if parts[2] in ["mmcblk0", "sda", "vda"]:
-                        # Field 5: sectors read, Field 9: sectors written (512 bytes each)
-                        curr_read += int(parts[5]) * 512
-                        curr_write += int(parts[9]) * 512
-
-            read_rate = self._read_calculator.calculate_rate(curr_read)
-            write_rate = self._write_calculator.calculate_rate(curr_write)
-
-            result["read_mb_s"] = round(read_rate / 1024 / 1024, 2)
-            result["write_mb_s"] = round(write_rate / 1024 / 1024, 2)
+            io = self._io.collect()
+            result["devices"] = io["devices"]
+            result["read_mb_s"] = io["read_mb_s"]
+            result["write_mb_s"] = io["write_mb_s"]
         except Exception:
             pass
 
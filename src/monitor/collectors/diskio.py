@@ -0,0 +1,155 @@
+"""Per-device block I/O statistics.
+
+Block devices are discovered from /sys/block (which lists whole devices
+only, never partitions), skipping loop and RAM-backed devices. Rates are
+computed from consecutive /proc/diskstats readings over a monotonic
+clock.
+"""
+
+import os
+import time
+from typing import Any, Callable, Optional
+
+from monitor.collectors.procfs import ProcFile
+
+# Memory-backed or file-backed devices that say nothing about storage
+SKIPPED_PREFIXES = ("loop", "ram", "zram")
+
+SECTOR_BYTES = 512  # diskstats always counts 512-byte sectors
+
+# Seconds between /sys/block rescans, to pick up hot-plugged disks
+DISCOVERY_INTERVAL = 60.0
+
+
+def discover_devices(sys_block: str = "/sys/block") -> dict[str, bool]:
+    """List block devices worth reporting.
+
+    Returns:
+        {name: physical}, where physical is False for stacked devices
+        (device-mapper, md RAID) whose I/O is also counted on the disks
+        beneath them
+    """
+    devices: dict[str, bool] = {}
+    try:
+        names = os.listdir(sys_block)
+    except OSError:
+        return devices
+    for name in names:
+        if name.startswith(SKIPPED_PREFIXES):
+            continue
+        devices[name] = os.path.exists(os.path.join(sys_block, name, "device"))
+    return devices
+
+
+def parse_diskstats(text: str, names: Optional[set[str]] = None) -> dict[str, tuple[int, ...]]:
+    """Parse /proc/diskstats into per-device counters.
+
+    Returns:
+        {name: (reads, sectors_read, ms_reading, writes, sectors_written,
+                ms_writing, io_ticks_ms)}
+    """
+    stats: dict[str, tuple[int, ...]] = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        name = fields[2]
+        if names is not None and name not in names:
+            continue
+        try:
+            stats[name] = (
+                int(fields[3]),
+                int(fields[5]),
+                int(fields[6]),
+                int(fields[7]),
+                int(fields[9]),
+                int(fields[10]),
+                int(fields[12]),
+            )
+        except ValueError:
+            continue
+    return stats
+
+
+def device_rates(prev: tuple[int, ...], curr: tuple[int, ...], elapsed: float) -> dict[str, float]:
+    """Rates for one device between two diskstats readings.
+
+    Returns:
+        {
+            "read_iops": float, "write_iops": float,
+            "read_mb_s": float, "write_mb_s": float,
+            "await_ms": float,         # Mean time per completed request
+            "util_percent": float,     # Share of time with I/O in flight
+        }
+    """
+    reads, sectors_read, ms_reading, writes, sectors_written, ms_writing, io_ticks = (
+        max(0, c - p)
+        for c, p in zip(curr, prev)  # Counters reset on 32-bit wrap
+    )
+    ios = reads + writes
+    return {
+        "read_iops": round(reads / elapsed, 1),
+        "write_iops": round(writes / elapsed, 1),
+        "read_mb_s": round(sectors_read * SECTOR_BYTES / elapsed / 1024 / 1024, 2),
+        "write_mb_s": round(sectors_written * SECTOR_BYTES / elapsed / 1024 / 1024, 2),
+        "await_ms": round((ms_reading + ms_writing) / ios, 2) if ios else 0.0,
+        "util_percent": round(min(100.0, io_ticks / (elapsed * 1000) * 100), 1),
+    }
+
+
+class DiskIO:
+    """Tracks diskstats counters between calls."""
+
+    def __init__(
+        self,
+        diskstats: str = "/proc/diskstats",
+        sys_block: str = "/sys/block",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._diskstats = ProcFile(diskstats)
+        self._sys_block = sys_block
+        self._clock = clock
+        self._devices: dict[str, bool] = {}
+        self._discovered_at: Optional[float] = None
+        self._prev: dict[str, tuple[int, ...]] = {}
+        self._prev_time: Optional[float] = None
+
+    def collect(self) -> dict[str, Any]:
+        """Read diskstats and return rates since the previous call.
+
+        Returns:
+            {
+                "devices": {name: device_rates(...)},
+                "read_mb_s": float,   # Sum over physical devices
+                "write_mb_s": float,
+            }
+            Devices have no rates until the second call.
+        """
+        now = self._clock()
+        if self._discovered_at is None or now - self._discovered_at >= DISCOVERY_INTERVAL:
+            self._devices = discover_devices(self._sys_block)
+            self._discovered_at = now
+
+        curr = parse_diskstats(self._diskstats.read_text(), set(self._devices))
+
+        devices: dict[str, dict[str, float]] = {}
+        read_mb_s = write_mb_s = 0.0
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        if elapsed > 0:
+            for name, counters in curr.items():
+                prev = self._prev.get(name)
+                if prev is None:
+                    continue
+                rates = device_rates(prev, counters, elapsed)
+                devices[name] = rates
+                if self._devices.get(name):
+                    read_mb_s += rates["read_mb_s"]
+                    write_mb_s += rates["write_mb_s"]
+
+        self._prev = curr
+        self._prev_time = now
+        return {
+            "devices": devices,
+            "read_mb_s": round(read_mb_s, 2),
+            "write_mb_s": round(write_mb_s, 2),
+        }
@@ -0,0 +1,337 @@
+"""Docker container collector.
+
+Talks to the Docker Engine API over its unix socket. The container list
+is cached and only re-read when the /events stream reports a container
+changing state (polled instead while the stream is down). Per-container
+CPU and memory come from each container's cgroup files, which is far
+cheaper than the stats endpoint (that one samples for a second per
+container).
+"""
+
+import http.client
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from urllib.parse import quote
+
+from monitor.collectors.base import BaseCollector
+from monitor.collectors.procfs import ProcFile
+from monitor.collectors.procscan import parse_cgroup
+from monitor.collectors.unixhttp import UnixHTTPClient
+
+logger = logging.getLogger(__name__)
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+
+EVENTS_PATH = "/events?filters=" + quote(json.dumps({"type": ["container"]}))
+
+# Container events that change the list or a container's state
+STATE_ACTIONS = frozenset(
+    {"create", "start", "restart", "die", "pause", "unpause", "destroy", "rename"}
+)
+
+# Seconds between list refreshes while the events stream is not connected
+POLL_INTERVAL = 30.0
+
+# Seconds before reconnecting a dropped events stream (or retrying a missing daemon)
+RECONNECT_DELAY = 5.0
+
+# Seconds before retrying a running container whose cgroup was not found
+CGROUP_RETRY_DELAY = 10.0
+
+
+@dataclass
+class CgroupFiles:
+    """Kept-open accounting files of one container's cgroup."""
+
+    cpu: ProcFile  # Cumulative CPU time
+    cpu_ns: int  # Nanoseconds per unit of the CPU counter
+    memory: ProcFile  # Current usage in bytes
+    memory_stat: ProcFile
+    inactive_key: str  # memory.stat page cache entry left out of usage, like `docker stats`
+
+    def close(self) -> None:
+        for attr in (self.cpu, self.memory, self.memory_stat):
+            attr.close()
+
+
+def container_cgroup(cgroup_text: str, cgroup_root: str) -> Optional[CgroupFiles]:
+    """Locate the accounting files for the cgroup in a /proc/[pid]/cgroup.
+
+    Handles the unified (v2) hierarchy and the cpuacct/memory
+    controllers of a v1 host.
+    """
+    if os.path.exists(os.path.join(cgroup_root, "cgroup.controllers")):
+        path = parse_cgroup(cgroup_text)
+        if path == "/":
+            return None
+        base = cgroup_root + path
+        return CgroupFiles(
+            cpu=ProcFile(os.path.join(base, "cpu.stat")),
+            cpu_ns=1000,  # usage_usec
+            memory=ProcFile(os.path.join(base, "memory.current")),
+            memory_stat=ProcFile(os.path.join(base, "memory.stat")),
+            inactive_key="inactive_file",
+        )
+
+    controllers = {}
+    for line in cgroup_text.splitlines():
+        parts = line.split(":", 2)
+        if len(parts) == 3:
+            for name in parts[1].split(","):
+                controllers[name] = parts[2]
+    if "cpuacct" not in controllers or "memory" not in controllers:
+        return None
+    cpu_dir = os.path.join(cgroup_root, "cpuacct") + controllers["cpuacct"]
+    mem_dir = os.path.join(cgroup_root, "memory") + controllers["memory"]
+    return CgroupFiles(
+        cpu=ProcFile(os.path.join(cpu_dir, "cpuacct.usage")),
+        cpu_ns=1,
+        memory=ProcFile(os.path.join(mem_dir, "memory.usage_in_bytes")),
+        memory_stat=ProcFile(os.path.join(mem_dir, "memory.stat")),
+        inactive_key="total_inactive_file",
+    )
+
+
+def _read_cpu_ns(files: CgroupFiles) -> Optional[int]:
+    text = files.cpu.read()
+    if not text:
+        return None
+    # cpu.stat starts with "usage_usec N"; cpuacct.usage is a bare number
+    try:
+        return int(text.split()[1] if text.startswith("usage_usec") else text) * files.cpu_ns
+    except (IndexError, ValueError):
+        return None
+
+
+def _read_memory(files: CgroupFiles) -> Optional[int]:
+    usage = files.memory.read_int()
+    if usage is None:
+        return None
+    stat = files.memory_stat.read() or ""
+    for line in stat.splitlines():
+        key, _, value = line.partition(" ")
+        if key == files.inactive_key:
+            try:
+                return max(0, usage - int(value))
+            except ValueError:
+                break
+    return usage
+
+
+class DockerCollector(BaseCollector):
+    """Collects container counts and per-container CPU and memory."""
+
+    # API calls only happen on container events; each refresh reads cgroup files
+    interval = 5.0
+
+    def __init__(
+        self,
+        socket_path: str = DOCKER_SOCKET,
+        proc_root: str = "/proc",
+        cgroup_root: str = "/sys/fs/cgroup",
+        cpu_count: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._api = UnixHTTPClient(socket_path, host="docker")
+        self._proc_root = proc_root
+        self._cgroup_root = cgroup_root
+        self._cpu_count = cpu_count or os.cpu_count() or 1
+        self._clock = clock
+        self._containers: list[dict[str, Any]] = []
+        self._listed_at: Optional[float] = None
+        self._unavailable_at: Optional[float] = None
+        self._cgroups: dict[str, CgroupFiles] = {}
+        # Containers whose cgroup could not be found yet, by time of the attempt
+        self._cgroup_failed: dict[str, float] = {}
+        self._cpu_prev: dict[str, tuple[float, int]] = {}
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._watching = False
+        self._watcher: Optional[threading.Thread] = None
+        self._events_conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return "docker"
+
+    def collect(self) -> dict[str, Any]:
+        """Collect container status.
+
+        Returns:
+            {
+                "available": bool,    # Whether the Docker daemon answered
+                "running": int,
+                "stopped": int,       # Every container not running
+                "containers": [
+                    {
+                        "id": str, "name": str, "image": str,
+                        "state": str,          # running, exited, paused, ...
+                        "status": str,         # e.g. "Up 2 hours"
+                        "cpu": float or None,  # Percent of all cores
+                        "mem_mb": float or None,
+                    },
+                    ...
+                ],
+            }
+        """
+        with self._lock:
+            now = self._clock()
+            if not self._refresh_list(now):
+                return {"available": False, "running": 0, "stopped": 0, "containers": []}
+            self._ensure_watcher()
+
+            containers = []
+            running = 0
+            for c in self._containers:
+                entry = dict(c)
+                entry["cpu"] = entry["mem_mb"] = None
+                if c["state"] == "running":
+                    running += 1
+                    self._add_usage(entry, now)
+                containers.append(entry)
+            return {
+                "available": True,
+                "running": running,
+                "stopped": len(containers) - running,
+                "containers": containers,
+            }
+
+    def close(self) -> None:
+        """Stop the events watcher and close every connection and file."""
+        self._stop.set()
+        conn = self._events_conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)  # Unblocks the watcher's read
+            except OSError:
+                pass
+        if self._watcher is not None:
+            self._watcher.join(timeout=2.0)
+        self._api.close()
+        with self._lock:
+            for files in self._cgroups.values():
+                files.close()
+            self._cgroups = {}
+            self._cgroup_failed = {}
+
+    def _refresh_list(self, now: float) -> bool:
+        """Re-read the container list if an event or the poll interval calls for it."""
+        if self._unavailable_at is not None and now - self._unavailable_at < RECONNECT_DELAY:
+            return False
+        stale = (
+            self._listed_at is None
+            or self._dirty.is_set()
+            or (not self._watching and now - self._listed_at >= POLL_INTERVAL)
+        )
+        if not stale:
+            return True
+        self._dirty.clear()
+        try:
+            listing = self._api.get_json("/containers/json?all=1")
+        except (OSError, ValueError) as e:
+            logger.debug("Docker API unavailable: %s", e)
+            self._unavailable_at = now
+            self._listed_at = None
+            return False
+        self._unavailable_at = None
+        self._listed_at = now
+        self._containers = [
+            {
+                "id": c.get("Id", "")[:12],
+                "name": (c.get("Names") or ["/?"])[0].lstrip("/"),
+                "image": c.get("Image", ""),
+                "state": c.get("State", ""),
+                "status": c.get("Status", ""),
+            }
+            for c in listing or []
+        ]
+        # Forget cgroups of containers that are gone or no longer running
+        running = {c["id"] for c in self._containers if c["state"] == "running"}
+        for cid in [cid for cid in self._cgroups if cid not in running]:
+            self._cgroups.pop(cid).close()
+            self._cpu_prev.pop(cid, None)
+        for cid in [cid for cid in self._cgroup_failed if cid not in running]:
+            del self._cgroup_failed[cid]
+        return True
+
+    def _add_usage(self, entry: dict[str, Any], now: float) -> None:
+        cid = entry["id"]
+        files = self._cgroups.get(cid)
+        if files is None:
+            failed_at = self._cgroup_failed.get(cid)
+            if failed_at is not None and now - failed_at < CGROUP_RETRY_DELAY:
+                return
+            files = self._resolve_cgroup(cid)
+            if files is None:
+                # Often not readable yet right after the container starts
+                self._cgroup_failed[cid] = now
+                return
+            self._cgroup_failed.pop(cid, None)
+            self._cgroups[cid] = files
+        memory = _read_memory(files)
+        if memory is not None:
+            entry["mem_mb"] = round(memory / 1024 / 1024, 1)
+        cpu_ns = _read_cpu_ns(files)
+        if cpu_ns is None:
+            return
+        prev = self._cpu_prev.get(cid)
+        self._cpu_prev[cid] = (now, cpu_ns)
+        if prev is not None and now > prev[0]:
+            capacity = (now - prev[0]) * 1e9 * self._cpu_count
+            entry["cpu"] = round(min(100.0, 100.0 * max(0, cpu_ns - prev[1]) / capacity), 1)
+        else:
+            entry["cpu"] = 0.0
+
+    def _resolve_cgroup(self, cid: str) -> Optional[CgroupFiles]:
+        """Find a running container's cgroup through its main process."""
+        try:
+            info = self._api.get_json(f"/containers/{cid}/json")
+            pid = int(info["State"]["Pid"])
+            with open(os.path.join(self._proc_root, str(pid), "cgroup")) as f:
+                return container_cgroup(f.read(), self._cgroup_root)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("No cgroup for container %s: %s", cid, e)
+            return None
+
+    def _ensure_watcher(self) -> None:
+        if self._watcher is None and not self._stop.is_set():
+            self._watcher = threading.Thread(
+                target=self._watch_events, name="docker-events", daemon=True
+            )
+            self._watcher.start()
+
+    def _watch_events(self) -> None:
+        """Mark the list stale whenever a container changes state."""
+        while not self._stop.is_set():
+            conn = self._api.connection(timeout=None)
+            self._events_conn = conn
+            try:
+                conn.request("GET", EVENTS_PATH)
+                response = conn.getresponse()
+                if response.status != 200:
+                    raise OSError(f"events: HTTP {response.status}")
+                # Events may have been missed while disconnected
+                self._dirty.set()
+                self._watching = True
+                while not self._stop.is_set():
+                    line = response.readline()
+                    if not line:
+                        break
+                    line = line.strip()
+                    if line and json.loads(line).get("Action") in STATE_ACTIONS:
+                        self._dirty.set()
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                if not self._stop.is_set():
+                    logger.debug("Docker events stream ended: %s", e)
+            finally:
+                self._watching = False
+                self._events_conn = None
+                conn.close()
+            self._stop.wait(RECONNECT_DELAY)
@@ -0,0 +1,352 @@
+"""Where collectors read host state from.
+
+A HostSource maps the absolute paths collectors read (/proc/stat,
+/sys/class/net, ...) under a root directory, runs the external commands
+they need, and supplies the clock and machine constants used to turn
+counters into rates. The default is the live system; a root such as
+/host reads a host's /proc and /sys bind-mounted into a container.
+
+RecordingHost and ReplayHost capture a timed sequence of those inputs to
+an archive and play it back: the archive is gzipped JSON lines, a header
+with the machine constants followed by one frame per sample holding only
+the files that changed since the previous frame, plus the command
+outputs, statvfs results and process owners the collectors asked for
+during that sample.
+A replay writes each frame's files into a working directory used as the
+root and advances a clock to the frame's time, so collectors see exactly
+the recorded inputs. Unix-socket APIs (Docker, tailscaled) are not
+recorded.
+"""
+
+import errno
+import glob
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Generator
+from typing import Any, Callable, Optional
+
+ARCHIVE_VERSION = 2
+
+# Files the collectors read, relative to the root
+RECORDED_FILES = (
+    "proc/stat",
+    "proc/meminfo",
+    "proc/loadavg",
+    "proc/uptime",
+    "proc/net/dev",
+    "proc/diskstats",
+    "proc/self/mountinfo",
+    "proc/[0-9]*/stat",
+    "proc/[0-9]*/io",
+    "proc/[0-9]*/cmdline",
+    "proc/[0-9]*/cgroup",
+    "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq",
+    "sys/class/net/*/operstate",
+    "sys/class/net/*/speed",
+    "sys/class/thermal/thermal_zone*/type",
+    "sys/class/thermal/thermal_zone*/temp",
+    "sys/class/hwmon/hwmon*/name",
+    "sys/class/hwmon/hwmon*/temp*_input",
+    "sys/class/hwmon/hwmon*/temp*_label",
+    "sys/class/hwmon/hwmon*/in0_lcrit_alarm",
+    "sys/devices/platform/soc/soc:firmware/get_throttled",
+    "sys/devices/platform/*/*:firmware/get_throttled",
+)
+
+# Directories whose existence the collectors check, relative to the root
+RECORDED_DIRS = (
+    "sys/block/*",
+    "sys/block/*/device",
+    "sys/devices/virtual/net/*",
+)
+
+
+class HostSource:
+    """The live system, optionally read from an alternate root.
+
+    Commands always run on the local system; statvfs is applied to mount
+    points under the root.
+    """
+
+    def __init__(
+        self,
+        root: str = "/",
+        clock: Callable[[], float] = time.monotonic,
+        cpu_count: Optional[int] = None,
+        clock_ticks: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        self.root = root
+        self.clock = clock
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.clock_ticks = clock_ticks or os.sysconf("SC_CLK_TCK")
+        self.page_size = page_size or os.sysconf("SC_PAGE_SIZE")
+
+    def path(self, path: str) -> str:
+        """The location of an absolute host path under the root."""
+        if self.root == "/":
+            return path
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def run(self, args: list[str], timeout: float) -> "subprocess.CompletedProcess[str]":
+        """Run a command and capture its output as text.
+
+        Raises:
+            OSError: If the command cannot be started
+            subprocess.SubprocessError: If it times out
+        """
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+
+    def executable(self, path: str) -> bool:
+        """Whether a command is available to run()."""
+        return os.access(path, os.X_OK)
+
+    def statvfs(self, mount_point: str) -> os.statvfs_result:
+        """Filesystem usage of a host mount point.
+
+        Raises:
+            OSError: If the mount point cannot be queried
+        """
+        return os.statvfs(self.path(mount_point))
+
+    def owner(self, path: str) -> int:
+        """The uid owning a path under the root, such as a /proc/[pid] directory.
+
+        Raises:
+            OSError: If the path no longer exists
+        """
+        return os.stat(path).st_uid
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.root!r})"
+
+
+def capture(root: str) -> tuple[dict[str, str], set[str]]:
+    """Read every recorded file and directory under root.
+
+    Returns:
+        ({relative path: contents}, {relative directory path}); contents
+        are decoded as latin-1 so any bytes round-trip through JSON
+    """
+    files = {}
+    for pattern in RECORDED_FILES:
+        for path in glob.glob(os.path.join(root, pattern)):
+            try:
+                with open(path, "rb") as f:
+                    files[os.path.relpath(path, root)] = f.read().decode("latin-1")
+            except OSError:
+                continue  # Exited process, or a counter only root may read
+    dirs = set()
+    for pattern in RECORDED_DIRS:
+        for path in glob.glob(os.path.join(root, pattern)):
+            if os.path.isdir(path):
+                dirs.add(os.path.relpath(path, root))
+    return files, dirs
+
+
+class ArchiveWriter:
+    """Writes a header and delta-encoded frames to a recording archive."""
+
+    def __init__(self, path: str, header: dict[str, Any]):
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._files: dict[str, str] = {}
+        self._dirs: set[str] = set()
+        self._write({"version": ARCHIVE_VERSION, **header})
+
+    def write_frame(
+        self,
+        t: float,
+        files: dict[str, str],
+        dirs: set[str],
+        calls: dict[str, dict[str, Any]],
+    ) -> None:
+        """Append one sample: seconds since the first, inputs, and recorded calls."""
+        frame: dict[str, Any] = {"t": round(t, 6)}
+        changed = {k: v for k, v in files.items() if self._files.get(k) != v}
+        removed = sorted(k for k in self._files if k not in files)
+        if changed:
+            frame["files"] = changed
+        if removed:
+            frame["removed"] = removed
+        if dirs != self._dirs:
+            frame["dirs"] = sorted(dirs - self._dirs)
+            frame["rmdirs"] = sorted(self._dirs - dirs)
+        frame.update({k: v for k, v in calls.items() if v})
+        self._files = files
+        self._dirs = dirs
+        self._write(frame)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _write(self, obj: dict[str, Any]) -> None:
+        self._file.write(json.dumps(obj, separators=(",", ":")) + "\n")
+
+
+def read_archive(
+    path: str,
+) -> tuple[dict[str, Any], Generator[dict[str, Any], None, None]]:
+    """Open a recording archive.
+
+    Returns:
+        (header, iterator over frames)
+
+    Raises:
+        ValueError: If the file is not a recording archive of this version
+    """
+    f = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(f.readline() or "null")
+    if not isinstance(header, dict) or header.get("version") != ARCHIVE_VERSION:
+        f.close()
+        raise ValueError(f"Not a version {ARCHIVE_VERSION} recording: {path}")
+
+    def frames() -> Generator[dict[str, Any], None, None]:
+        with f:
+            for line in f:
+                yield json.loads(line)
+
+    return header, frames()
+
+
+def _command_key(args: list[str]) -> str:
+    return "\0".join(args)
+
+
+class RecordingHost(HostSource):
+    """The live system, noting each command output and statvfs result."""
+
+    def __init__(self, root: str = "/"):
+        super().__init__(root)
+        self.executables: dict[str, bool] = {}
+        self._calls = self._no_calls()
+        self._lock = threading.Lock()
+
+    def header(self) -> dict[str, Any]:
+        """Machine constants a replay needs."""
+        return {
+            "cpu_count": self.cpu_count,
+            "clock_ticks": self.clock_ticks,
+            "page_size": self.page_size,
+            "executables": self.executables,
+        }
+
+    def take_calls(self) -> dict[str, dict[str, Any]]:
+        """Calls recorded since the previous take."""
+        with self._lock:
+            calls = self._calls
+            self._calls = self._no_calls()
+        return calls
+
+    def _no_calls(self) -> dict[str, dict[str, Any]]:
+        return {"commands": {}, "statvfs": {}, "owners": {}}
+
+    def run(self, args: list[str], timeout: float) -> "subprocess.CompletedProcess[str]":
+        result = super().run(args, timeout)
+        with self._lock:
+            self._calls["commands"][_command_key(args)] = [result.returncode, result.stdout]
+        return result
+
+    def executable(self, path: str) -> bool:
+        available = super().executable(path)
+        self.executables[path] = available
+        return available
+
+    def statvfs(self, mount_point: str) -> os.statvfs_result:
+        result = super().statvfs(mount_point)
+        with self._lock:
+            self._calls["statvfs"][mount_point] = list(result)
+        return result
+
+    def owner(self, path: str) -> int:
+        uid = super().owner(path)
+        with self._lock:
+            self._calls["owners"][os.path.relpath(path, self.root)] = uid
+        return uid
+
+
+class ReplayHost(HostSource):
+    """Recorded inputs, played back one frame at a time into a working directory.
+
+    Args:
+        path: Recording archive
+        workdir: Empty directory to use as the root; removed on close()
+    """
+
+    def __init__(self, path: str, workdir: str):
+        header, self._frames = read_archive(path)
+        self._now = 0.0
+        super().__init__(
+            workdir,
+            clock=lambda: self._now,
+            cpu_count=header["cpu_count"],
+            clock_ticks=header["clock_ticks"],
+            page_size=header["page_size"],
+        )
+        self.header = header
+        self._commands: dict[str, list[Any]] = {}
+        self._statvfs: dict[str, list[int]] = {}
+        self._owners: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def advance(self) -> bool:
+        """Apply the next frame; False once the recording is exhausted."""
+        frame = next(self._frames, None)
+        if frame is None:
+            return False
+        for rel in frame.get("rmdirs", ()):
+            shutil.rmtree(os.path.join(self.root, rel), ignore_errors=True)
+        for rel in frame.get("removed", ()):
+            path = os.path.join(self.root, rel)
+            try:
+                os.unlink(path)
+                os.rmdir(os.path.dirname(path))  # Exited process directories
+            except OSError:
+                pass
+        for rel in frame.get("dirs", ()):
+            os.makedirs(os.path.join(self.root, rel), exist_ok=True)
+        for rel, text in frame.get("files", {}).items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Rewritten in place so files collectors keep open see the update
+            with open(path, "wb") as f:
+                f.write(text.encode("latin-1"))
+        with self._lock:
+            self._commands.update(frame.get("commands", {}))
+            self._statvfs.update(frame.get("statvfs", {}))
+            self._owners.update(frame.get("owners", {}))
+        self._now = frame["t"]
+        return True
+
+    def run(self, args: list[str], timeout: float) -> "subprocess.CompletedProcess[str]":
+        with self._lock:
+            recorded = self._commands.get(_command_key(args))
+        if recorded is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in the recording", args[0])
+        return subprocess.CompletedProcess(args, recorded[0], recorded[1], "")
+
+    def executable(self, path: str) -> bool:
+        return bool(self.header.get("executables", {}).get(path))
+
+    def statvfs(self, mount_point: str) -> os.statvfs_result:
+        with self._lock:
+            recorded = self._statvfs.get(mount_point)
+        if recorded is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in the recording", mount_point)
+        return os.statvfs_result(recorded)
+
+    def owner(self, path: str) -> int:
+        with self._lock:
+            uid = self._owners.get(os.path.relpath(path, self.root))
+        if uid is None:
+            raise FileNotFoundError(errno.ENOENT, "Not in the recording", path)
+        return uid
+
+    def close(self) -> None:
+        """Close the archive and remove the working directory."""
+        self._frames.close()
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -3,11 +3,27 @@
 from typing import Any
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.procfs import ProcFile
+
+
+def parse_meminfo(text: str) -> dict[str, int]:
+    """Parse /proc/meminfo into values in kB (page counts for the HugePages_ rows)."""
+    meminfo = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        try:
+            meminfo[key] = int(rest.split(None, 1)[0])
+        except (ValueError, IndexError):
+            continue
+    return meminfo
 
 
 class MemoryCollector(BaseCollector):
     """Collects memory (RAM and Swap) usage metrics."""
 
+    def __init__(self, meminfo: str = "/proc/meminfo"):
+        self._meminfo = ProcFile(meminfo)
+
     @property
     def name(self) -> str:
         return "memory"
@@ -28,13 +44,7 @@ class MemoryCollector(BaseCollector):
         result = {"percent": 0.0, "used_gb": 0.0, "total_gb": 1.0, "swap_percent": 0.0}
 
         try:
-            meminfo = {}
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    parts = line.split(":")
-                    key = parts[0].strip()
-                    value = int(parts[1].strip().split()[0])
-                    meminfo[key] = value
+            meminfo = parse_meminfo(self._meminfo.read_text())
 
             total_kb = meminfo.get("MemTotal", 0)
             available_kb = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
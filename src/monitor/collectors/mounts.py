@@ -0,0 +1,300 @@
+"""Mounted filesystem discovery and usage.
+
+The mount table is parsed from /proc/self/mountinfo and re-parsed only
+when the kernel reports a change (POLLPRI on the open file). Usage comes
+from os.statvfs, which for network filesystems runs on a separate thread
+with a timeout so a hung server cannot stall the sampler.
+"""
+
+import logging
+import os
+import re
+import select
+import threading
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Kernel and virtual filesystems that never hold user data
+PSEUDO_FSTYPES = frozenset(
+    {
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "devtmpfs",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "ramfs",
+        "rpc_pipefs",
+        "securityfs",
+        "squashfs",
+        "sysfs",
+        "tmpfs",
+        "tracefs",
+    }
+)
+
+NETWORK_FSTYPES = frozenset(
+    {"9p", "afs", "ceph", "cifs", "glusterfs", "nfs", "nfs4", "smb3", "smbfs", "fuse.sshfs"}
+)
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(field: str) -> str:
+    """Decode the octal escapes mountinfo uses for spaces and the like."""
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+@dataclass(frozen=True)
+class Mount:
+    """One entry of the mount table."""
+
+    device_id: str  # major:minor
+    mount_point: str
+    fstype: str
+    source: str
+    root: str = "/"  # Directory of the filesystem mounted here (bind mounts)
+
+    @property
+    def network(self) -> bool:
+        """Whether statvfs may block on a remote server."""
+        return self.fstype in NETWORK_FSTYPES
+
+
+def parse_mountinfo(text: str) -> list[Mount]:
+    """Parse /proc/<pid>/mountinfo.
+
+    Lines look like:
+        36 35 98:0 /mnt1 /mnt/parent rw,noatime master:1 - ext3 /dev/root rw
+    with a variable number of optional fields before the "-" separator.
+    """
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            sep = fields.index("-", 6)
+            mounts.append(
+                Mount(
+                    device_id=fields[2],
+                    mount_point=_unescape(fields[4]),
+                    fstype=fields[sep + 1],
+                    source=_unescape(fields[sep + 2]),
+                    root=_unescape(fields[3]),
+                )
+            )
+        except (ValueError, IndexError):
+            continue
+    return mounts
+
+
+def select_real_mounts(mounts: list[Mount]) -> list[Mount]:
+    """Keep mounts that hold real data, one per device.
+
+    Pseudo filesystems are dropped, overlay mounts are kept only for the
+    root (container layers would otherwise flood the list), and each
+    device is listed once, preferring the mount of its top directory over
+    bind mounts of subdirectories.
+    """
+    selected: dict[str, Mount] = {}
+    for mount in mounts:
+        if mount.fstype in PSEUDO_FSTYPES:
+            continue
+        if mount.fstype == "overlay" and mount.mount_point != "/":
+            continue
+        key = mount.source if mount.network else mount.device_id
+        current = selected.get(key)
+        if current is None or (mount.root == "/" and current.root != "/"):
+            selected[key] = mount
+    return sorted(selected.values(), key=lambda m: m.mount_point)
+
+
+def usage_from_statvfs(st: os.statvfs_result) -> dict[str, Any]:
+    """Convert statvfs results into the usage figures df reports."""
+    gib = 1024**3
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    avail = st.f_bavail * st.f_frsize
+    # Like df: reserved blocks count as neither used nor available
+    usable = used + avail
+    inodes_used = st.f_files - st.f_ffree
+    return {
+        "total_gb": round(total / gib, 2),
+        "used_gb": round(used / gib, 2),
+        "free_gb": round(avail / gib, 2),
+        "percent": round(used / usable * 100, 1) if usable else 0.0,
+        "inodes_total": st.f_files,
+        "inodes_used": inodes_used,
+        "inodes_percent": round(inodes_used / st.f_files * 100, 1) if st.f_files else 0.0,
+    }
+
+
+class MountTable:
+    """Mount list kept current by watching mountinfo for changes."""
+
+    def __init__(self, path: str = "/proc/self/mountinfo"):
+        self._path = path
+        self._file: Optional[BinaryIO] = None
+        self._poll: Optional[select.poll] = None
+        self._mounts: list[Mount] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def mounts(self) -> list[Mount]:
+        """Real mounts, re-parsed only after the table changed."""
+        with self._lock:
+            if not self._loaded or self._changed():
+                self._reload()
+            return self._mounts
+
+    def _changed(self) -> bool:
+        if self._poll is None:
+            return True  # No change notification; re-read every time
+        try:
+            return bool(self._poll.poll(0))
+        except OSError:
+            return True
+
+    def _reload(self) -> None:
+        try:
+            f = self._file
+            if f is None:
+                f = self._file = open(self._path, "rb")
+                if hasattr(select, "poll"):
+                    self._poll = select.poll()
+                    self._poll.register(f, select.POLLPRI | select.POLLERR)
+            f.seek(0)
+            text = f.read().decode("utf-8", "replace")
+        except OSError as e:
+            logger.warning("Cannot read %s: %s", self._path, e)
+            self.close()
+            return
+        self._mounts = select_real_mounts(parse_mountinfo(text))
+        self._loaded = True
+
+    def close(self) -> None:
+        """Close the watched file."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._poll = None
+
+
+class _StatvfsCall:
+    """One statvfs call running on its own daemon thread."""
+
+    def __init__(self, path: str, statvfs: Callable[[str], os.statvfs_result]):
+        self.done = threading.Event()
+        self.result: Optional[os.statvfs_result] = None
+        thread = threading.Thread(
+            target=self._run, args=(path, statvfs), name="statvfs", daemon=True
+        )
+        thread.start()
+
+    def _run(self, path: str, statvfs: Callable[[str], os.statvfs_result]) -> None:
+        try:
+            self.result = statvfs(path)
+        except OSError:
+            pass
+        finally:
+            self.done.set()
+
+
+class StatvfsProbe:
+    """statvfs with a timeout for filesystems that may hang.
+
+    Calls run on daemon threads, so a mount stuck in the kernel cannot
+    hold up shutdown either. At most one call per mount point is
+    outstanding; while it is stuck, the mount is reported as unresponsive
+    at once, without starting more or waiting on it again.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 0.5,
+        statvfs: Optional[Callable[[str], os.statvfs_result]] = None,
+    ):
+        self._timeout = timeout
+        self._statvfs = statvfs or os.statvfs
+        self._pending: dict[str, _StatvfsCall] = {}
+        self._lock = threading.Lock()
+
+    def statvfs(self, path: str) -> Optional[os.statvfs_result]:
+        """Return statvfs for path, or None if it failed or timed out."""
+        with self._lock:
+            call = self._pending.get(path)
+            if call is not None and not call.done.is_set():
+                # Still stuck from an earlier sample; don't wait on it again
+                return None
+            call = _StatvfsCall(path, self._statvfs)
+            self._pending[path] = call
+        if not call.done.wait(self._timeout):
+            logger.warning("statvfs(%s) timed out", path)
+            return None
+        return call.result
+
+
+class DiskUsage:
+    """Usage of every real mounted filesystem."""
+
+    def __init__(
+        self,
+        table: Optional[MountTable] = None,
+        probe: Optional[StatvfsProbe] = None,
+        statvfs: Optional[Callable[[str], os.statvfs_result]] = None,
+    ):
+        self._table = table or MountTable()
+        self._statvfs = statvfs or os.statvfs
+        self._probe = probe or StatvfsProbe(statvfs=self._statvfs)
+
+    def collect(self) -> list[dict[str, Any]]:
+        """Return usage per mount, root first when present.
+
+        Returns:
+            [
+                {
+                    "mount": str, "device": str, "fstype": str,
+                    "total_gb": float, "used_gb": float, "free_gb": float,
+                    "percent": float, "inodes_total": int,
+                    "inodes_used": int, "inodes_percent": float,
+                },
+                ...
+            ]
+            Unresponsive network mounts carry only the identifying fields
+            plus "error".
+        """
+        results = []
+        for mount in self._table.mounts():
+            entry: dict[str, Any] = {
+                "mount": mount.mount_point,
+                "device": mount.source,
+                "fstype": mount.fstype,
+            }
+            try:
+                if mount.network:
+                    st = self._probe.statvfs(mount.mount_point)
+                    if st is None:
+                        entry["error"] = "unresponsive"
+                        results.append(entry)
+                        continue
+                else:
+                    st = self._statvfs(mount.mount_point)
+            except OSError:
+                continue
+            if st.f_blocks == 0:
+                continue  # Nothing to report (e.g. an empty autofs trigger)
+            entry.update(usage_from_statvfs(st))
+            results.append(entry)
+        results.sort(key=lambda e: e["mount"] != "/")
+        return results
@@ -1,65 +1,225 @@
 """Network metrics collector."""
 
-from typing import Any
+import os
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Optional
 
-from monitor.cache import RateCalculator
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.procfs import ProcFile
+
+# Seconds between re-reading link speed and operstate from sysfs
+LINK_REFRESH_INTERVAL = 30.0
+
+# /proc/net/dev columns (after "iface:") that are turned into rates
+_RATE_FIELDS = (
+    ("rx_bytes", 0),
+    ("rx_packets", 1),
+    ("rx_errors", 2),
+    ("rx_drops", 3),
+    ("tx_bytes", 8),
+    ("tx_packets", 9),
+    ("tx_errors", 10),
+    ("tx_drops", 11),
+)
+
+
+def parse_net_dev(text: str) -> dict[str, tuple[int, ...]]:
+    """Parse /proc/net/dev into counters per interface.
+
+    Returns:
+        {iface: (rx_bytes, rx_packets, rx_errors, rx_drops,
+                 tx_bytes, tx_packets, tx_errors, tx_drops)}
+    """
+    counters = {}
+    for line in text.splitlines()[2:]:
+        iface, sep, rest = line.partition(":")
+        if not sep:
+            continue
+        fields = rest.split()
+        if len(fields) < 16:
+            continue
+        try:
+            counters[iface.strip()] = tuple(int(fields[i]) for _, i in _RATE_FIELDS)
+        except ValueError:
+            continue
+    return counters
+
+
+def interface_rates(
+    prev: tuple[int, ...], curr: tuple[int, ...], elapsed: float
+) -> dict[str, float]:
+    """Per-second rates for one interface between two readings.
+
+    Returns:
+        {
+            "rx_mb_s": float, "tx_mb_s": float,
+            "rx_pps": float, "tx_pps": float,
+            "rx_errors_s": float, "tx_errors_s": float,
+            "rx_drops_s": float, "tx_drops_s": float,
+        }
+    """
+    rx_b, rx_p, rx_e, rx_d, tx_b, tx_p, tx_e, tx_d = (
+        max(0, c - p) / elapsed
+        for c, p in zip(curr, prev)  # Counters reset on wrap
+    )
+    return {
+        "rx_mb_s": round(rx_b / 1024 / 1024, 3),
+        "tx_mb_s": round(tx_b / 1024 / 1024, 3),
+        "rx_pps": round(rx_p, 1),
+        "tx_pps": round(tx_p, 1),
+        "rx_errors_s": round(rx_e, 2),
+        "tx_errors_s": round(tx_e, 2),
+        "rx_drops_s": round(rx_d, 2),
+        "tx_drops_s": round(tx_d, 2),
+    }
 
 
 class NetworkCollector(BaseCollector):
-    """Collects network usage metrics."""
+    """Collects network usage metrics per interface."""
 
-    def __init__(self):
-        self._rx_calculator = RateCalculator()
-        self._tx_calculator = RateCalculator()
+    def __init__(
+        self,
+        include: tuple[str, ...] = ("*",),
+        exclude: tuple[str, ...] = ("lo", "veth*"),
+        aggregate_virtual: bool = False,
+        net_dev: str = "/proc/net/dev",
+        sys_class_net: str = "/sys/class/net",
+        sys_virtual_net: str = "/sys/devices/virtual/net",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._include = include
+        self._exclude = exclude
+        self._aggregate_virtual = aggregate_virtual
+        self._net_dev = ProcFile(net_dev)
+        self._sys_class_net = sys_class_net
+        self._sys_virtual_net = sys_virtual_net
+        self._clock = clock
+        # Per-interface filter decisions and link info, kept across cycles
+        self._selected: dict[str, bool] = {}
+        self._virtual: dict[str, bool] = {}
+        self._links: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._prev: dict[str, tuple[int, ...]] = {}
+        self._prev_time: Optional[float] = None
 
     @property
     def name(self) -> str:
         return "network"
 
     def collect(self) -> dict[str, Any]:
-        """Collect network metrics from /proc/net/dev.
+        """Collect network metrics from one read of /proc/net/dev.
 
         Returns:
             {
-                "rx_mb_s": float,      # Download rate in MB/s
-                "tx_mb_s": float,      # Upload rate in MB/s
+                "rx_mb_s": float,      # Download rate in MB/s (physical interfaces)
+                "tx_mb_s": float,      # Upload rate in MB/s (physical interfaces)
                 "rx_total_gb": float,  # Total downloaded in GB
                 "tx_total_gb": float,  # Total uploaded in GB
+                "interfaces": {        # Every selected interface
+                    name: {
+                        **interface_rates(...),
+                        "rx_total_gb": float, "tx_total_gb": float,
+                        "virtual": bool,
+                        "operstate": str,          # "up", "down", ...
+                        "speed_mbps": int or None, # Link speed when known
+                    },
+                },
             }
         """
-        result = {
+        result: dict[str, Any] = {
             "rx_mb_s": 0.0,
             "tx_mb_s": 0.0,
             "rx_total_gb": 0.0,
             "tx_total_gb": 0.0,
+            "interfaces": {},
         }
 
         try:
-            rx_bytes = 0
-            tx_bytes = 0
-
-            with open("/proc/net/dev") as f:
-                for line in f:
-                    if ":" in line:
-                        parts = line.split(":")
-                        iface = parts[0].strip()
-                        if iface not in ["lo"]:
-                            stats = parts[1].split()
-                            if len(stats) >= 9:
-                                rx_bytes += int(stats[0])
-                                tx_bytes += int(stats[8])
-
-            rx_rate = self._rx_calculator.calculate_rate(rx_bytes)
-            tx_rate = self._tx_calculator.calculate_rate(tx_bytes)
-
-            result = {
-                "rx_mb_s": round(rx_rate / 1024 / 1024, 3),
-                "tx_mb_s": round(tx_rate / 1024 / 1024, 3),
-                "rx_total_gb": round(rx_bytes / 1024 / 1024 / 1024, 2),
-                "tx_total_gb": round(tx_bytes / 1024 / 1024 / 1024, 2),
-            }
+            now = self._clock()
+            counters = parse_net_dev(self._net_dev.read_text())
         except Exception:
-            pass
+            return result
 
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        gib = 1024**3
+        rx_mb_s = tx_mb_s = 0.0
+        rx_bytes = tx_bytes = 0
+        current: dict[str, tuple[int, ...]] = {}
+        for iface, values in counters.items():
+            if not self._is_selected(iface):
+                continue
+            current[iface] = values
+            virtual = self._is_virtual(iface)
+            entry: dict[str, Any] = {
+                "rx_total_gb": round(values[0] / gib, 2),
+                "tx_total_gb": round(values[4] / gib, 2),
+                "virtual": virtual,
+                **self._link_info(iface, now),
+            }
+            prev = self._prev.get(iface)
+            if prev is not None and elapsed > 0:
+                entry.update(interface_rates(prev, values, elapsed))
+            result["interfaces"][iface] = entry
+
+            if virtual and not self._aggregate_virtual:
+                continue
+            rx_bytes += values[0]
+            tx_bytes += values[4]
+            rx_mb_s += entry.get("rx_mb_s", 0.0)
+            tx_mb_s += entry.get("tx_mb_s", 0.0)
+
+        # Forget interfaces that went away (containers come and go)
+        if len(self._links) > len(current):
+            for cache in (self._virtual, self._links):
+                for iface in [i for i in cache if i not in current]:
+                    del cache[iface]
+
+        self._prev = current
+        self._prev_time = now
+        result["rx_mb_s"] = round(rx_mb_s, 3)
+        result["tx_mb_s"] = round(tx_mb_s, 3)
+        result["rx_total_gb"] = round(rx_bytes / gib, 2)
+        result["tx_total_gb"] = round(tx_bytes / gib, 2)
         return result
+
+    def _is_selected(self, iface: str) -> bool:
+        """Apply include/exclude patterns, once per interface name."""
+        selected = self._selected.get(iface)
+        if selected is None:
+            selected = any(fnmatchcase(iface, p) for p in self._include) and not any(
+                fnmatchcase(iface, p) for p in self._exclude
+            )
+            if len(self._selected) > 4096:
+                self._selected.clear()  # Bound growth from churning veth names
+            self._selected[iface] = selected
+        return selected
+
+    def _is_virtual(self, iface: str) -> bool:
+        """Whether the interface is software-only (bridge, veth, tun, ...)."""
+        virtual = self._virtual.get(iface)
+        if virtual is None:
+            virtual = os.path.exists(os.path.join(self._sys_virtual_net, iface))
+            self._virtual[iface] = virtual
+        return virtual
+
+    def _link_info(self, iface: str, now: float) -> dict[str, Any]:
+        """Operstate and link speed, re-read at most every LINK_REFRESH_INTERVAL."""
+        cached = self._links.get(iface)
+        if cached is not None and now - cached[0] < LINK_REFRESH_INTERVAL:
+            return cached[1]
+        base = os.path.join(self._sys_class_net, iface)
+        info: dict[str, Any] = {"operstate": "unknown", "speed_mbps": None}
+        try:
+            with open(os.path.join(base, "operstate")) as f:
+                info["operstate"] = f.read().strip()
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(base, "speed")) as f:
+                speed = int(f.read().strip())
+            # -1 (or EINVAL on read) means unknown, e.g. wireless or link down
+            info["speed_mbps"] = speed if speed > 0 else None
+        except (OSError, ValueError):
+            pass
+        self._links[iface] = (now, info)
+        return info
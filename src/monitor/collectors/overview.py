@@ -1,14 +1,25 @@
-"""System overview collector."""
+"""System overview collectors."""
 
-import os
-import subprocess
-from typing import Any
+from typing import Any, Optional
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.host import HostSource
+from monitor.collectors.procfs import ProcFile
 
 
 class OverviewCollector(BaseCollector):
-    """Collects system overview information."""
+    """Collects system overview information.
+
+    Uptime and load averages come from LoadCollector, which refreshes on
+    every tick; the handler merges them into this section.
+    """
+
+    # OS and addresses barely change
+    interval = 30.0
+    cost = "heavy"
+
+    def __init__(self, host: Optional[HostSource] = None):
+        self._host = host or HostSource()
 
     @property
     def name(self) -> str:
@@ -20,31 +31,65 @@ class OverviewCollector(BaseCollector):
         Returns:
             {
                 "os": str,           # OS name
+                "ip": str,           # Local IP address
+                "docker": dict or None,  # Docker container status
+            }
+        """
+        return {
+            "os": "Linux",
+            "ip": self._get_local_ip(),
+            "docker": None,
+        }
+
+    def _get_local_ip(self) -> str:
+        """Get local IP address."""
+        try:
+            result = self._host.run(["hostname", "-I"], timeout=2)
+            if result.returncode == 0:
+                ips = result.stdout.strip().split()
+                for ip in ips:
+                    if not ip.startswith("127.") and not ip.startswith("::1"):
+                        return ip
+        except Exception:
+            pass
+        return "-"
+
+
+class LoadCollector(BaseCollector):
+    """Collects uptime and load averages for the overview section."""
+
+    def __init__(self, uptime: str = "/proc/uptime", loadavg: str = "/proc/loadavg"):
+        self._uptime = ProcFile(uptime)
+        self._loadavg = ProcFile(loadavg)
+
+    @property
+    def name(self) -> str:
+        return "load"
+
+    def collect(self) -> dict[str, Any]:
+        """Collect uptime and load averages.
+
+        Returns:
+            {
                 "uptime": str,       # Formatted uptime
                 "load_1": str,       # 1-minute load average
                 "load_5": str,       # 5-minute load average
                 "load_15": str,      # 15-minute load average
-                "ip": str,           # Local IP address
-                "docker": dict or None,  # Docker container status
             }
         """
         result = {
-            "os": "Linux",
             "uptime": self._format_uptime(self._get_uptime()),
             "load_1": "0.00",
             "load_5": "0.00",
             "load_15": "0.00",
-            "ip": self._get_local_ip(),
-            "docker": None,
         }
 
-        # Load averages
+        # Load averages (what os.getloadavg reads, but from the configured root)
         try:
-            if hasattr(os, "getloadavg"):
-                load_avg = os.getloadavg()
-                result["load_1"] = f"{load_avg[0]:.2f}"
-                result["load_5"] = f"{load_avg[1]:.2f}"
-                result["load_15"] = f"{load_avg[2]:.2f}"
+            load_avg = [float(v) for v in self._loadavg.read_text().split()[:3]]
+            result["load_1"] = f"{load_avg[0]:.2f}"
+            result["load_5"] = f"{load_avg[1]:.2f}"
+            result["load_15"] = f"{load_avg[2]:.2f}"
         except Exception:
             pass
 
@@ -53,8 +98,7 @@ class OverviewCollector(BaseCollector):
     def _get_uptime(self) -> float:
         """Get system uptime in seconds."""
         try:
-            with open("/proc/uptime") as f:
-                return float(f.read().split()[0])
+            return float(self._uptime.read_text().split()[0])
         except Exception:
             return 0
 
@@ -64,18 +108,3 @@ class OverviewCollector(BaseCollector):
         hours = int((seconds % 86400) // 3600)
         mins = int((seconds % 3600) // 60)
         return f"{days}d {hours}h {mins}m"
-
-    def _get_local_ip(self) -> str:
-        """Get local IP address."""
-        try:
-            result = subprocess.run(
-                ["hostname", "-I"], capture_output=True, text=True, timeout=2
-            )
-            if result.returncode == 0:
-                ips = result.stdout.strip().split()
-                for ip in ips:
-                    if not ip.startswith("127.") and not ip.startswith("::1"):
-                        return ip
-        except Exception:
-            pass
-        return "-"
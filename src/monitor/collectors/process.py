@@ -1,69 +1,50 @@
 """Process metrics collector."""
 
-import subprocess
-from typing import Any
+from typing import Any, Optional
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.procscan import ProcessScanner
 
 
 class ProcessCollector(BaseCollector):
     """Collects top processes by CPU usage."""
 
-    def __init__(self, limit: int = 10):
+    interval = 8.0
+    cost = "heavy"
+
+    def __init__(self, limit: int = 10, scanner: Optional[ProcessScanner] = None):
         self._limit = limit
+        self._scanner = scanner or ProcessScanner()
 
     @property
     def name(self) -> str:
         return "process"
 
+    @property
+    def scanner(self) -> ProcessScanner:
+        """The scanner holding the latest full process table."""
+        return self._scanner
+
     def collect(self) -> list[dict[str, Any]]:
-        """Collect top processes by CPU usage.
+        """Collect top processes by CPU usage since the previous call.
 
         Returns:
-            List of process info dicts:
+            List of process info dicts, busiest first:
             [
-                {"pid": int, "name": str, "cpu": float, "mem": float},
+                {
+                    "pid": int, "name": str, "comm": str, "user": str,
+                    "state": str, "threads": int,
+                    "cpu": float,     # Percent of all cores (0-100)
+                    "mem": float,     # Percent of physical memory
+                    "rss_mb": float,
+                },
                 ...
             ]
+            CPU figures are zero on the first call.
         """
-        processes = []
-        cores = self._get_cpu_core_count()
-
-        try:
-            result = subprocess.run(
-                ["ps", "aux", "--sort=-%cpu"],
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                for line in lines[:20]:  # Get top 20, will limit later
-                    parts = line.split(None, 10)
-                    if len(parts) >= 11:
-                        try:
-                            # ps %CPU = percentage of one core; normalize so 100% = all cores
-                            raw_cpu = float(parts[2])
-                            cpu_pct = min(100.0, round(raw_cpu / cores, 1))
-                            processes.append(
-                                {
-                                    "pid": int(parts[1]),
-                                    "name": parts[10][:50],
-                                    "cpu": cpu_pct,
-                                    "mem": round(float(parts[3]), 1),
-                                }
-                            )
-                        except (ValueError, IndexError):
-                            continue
-        except Exception:
-            pass
-
-        return processes[: self._limit]
-
-    def _get_cpu_core_count(self) -> int:
-        """Get the number of CPU cores."""
         try:
-            with open("/proc/cpuinfo") as f:
-                return sum(1 for line in f if line.strip().startswith("processor"))
+            self._scanner.scan()
         except Exception:
-            return 1
+            return []
+        top = self._scanner.top(self._limit, key=lambda p: (p.cpu, p.rss))
+        return [p.to_dict() for p in top]
@@ -0,0 +1,111 @@
+"""Kept-open readers for procfs and sysfs files.
+
+Opening a file through open() costs several syscalls (openat, fstat,
+ioctl, lseek, read until EOF, close) plus a buffered reader and text
+decoder per call. ProcFile opens the file once and re-reads it with
+pread from offset 0 into a buffer it keeps between reads; the kernel
+regenerates procfs/sysfs contents on every read from the start. Reads
+continue at the next offset until pread returns 0, since seq_file
+files (/proc/net/dev, /proc/diskstats, ...) return about a page per
+call; the buffer doubles whenever it fills.
+"""
+
+import os
+from typing import Optional
+
+# Initial buffer size; grows to fit the largest file seen
+DEFAULT_BUFFER = 4096
+
+
+class ProcFile:
+    """A procfs/sysfs file kept open and re-read from offset 0."""
+
+    def __init__(self, path: str, size: int = DEFAULT_BUFFER):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+
+    def read_bytes(self) -> bytes:
+        """Current contents.
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            total = 0
+            while True:
+                if total == len(self._buf):
+                    self._grow()
+                n = os.preadv(self._fd, [self._view[total:]], total)
+                if n == 0:
+                    return bytes(self._view[:total])
+                total += n
+        except OSError:
+            # Drivers return EIO/ENODATA while a sensor is unavailable;
+            # reopen on the next read in case the device was replaced
+            self.close()
+            raise
+
+    def read_text(self) -> str:
+        """Current contents as text (procfs and sysfs are ASCII).
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        return self.read_bytes().decode("latin-1")
+
+    def read(self) -> Optional[str]:
+        """Current contents without surrounding whitespace, or None if unreadable."""
+        try:
+            return self.read_bytes().strip().decode("latin-1")
+        except OSError:
+            return None
+
+    def read_int(self) -> Optional[int]:
+        """The file's value as an integer (decimal or 0x hex), or None."""
+        value = self.read()
+        if value is None:
+            return None
+        try:
+            return int(value, 16) if value.startswith("0x") else int(value)
+        except ValueError:
+            return None
+
+    def _grow(self) -> None:
+        buf = bytearray(len(self._buf) * 2)
+        buf[: len(self._buf)] = self._buf
+        self._view.release()
+        self._buf = buf
+        self._view = memoryview(buf)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def __repr__(self) -> str:
+        return f"ProcFile({self.path!r})"
+
+
+def read_once(path: str, size: int = DEFAULT_BUFFER) -> bytes:
+    """Read a small file with bare open/read/close syscalls.
+
+    For files read once per process (/proc/[pid]/*), where keeping a
+    descriptor open per pid would exhaust the descriptor limit. A single
+    read: these files fit in the one page procfs returns per call, and
+    callers pass size to cap longer ones such as cmdline.
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
@@ -0,0 +1,481 @@
+"""Native /proc process scanner.
+
+Reads /proc/[pid]/stat directly instead of forking ps. CPU usage is the
+share of CPU time a process used since the previous scan (not ps's
+lifetime average), normalized so 100% means all cores busy; disk I/O
+comes from /proc/[pid]/io the same way. Data that
+never changes for a process — command line, owner, start time — is read
+once and cached by (pid, starttime), so a recycled pid is never confused
+with its predecessor.
+
+Group totals (by executable, user, cgroup or systemd unit) are summed
+from the same table, once per scan, on first request.
+"""
+
+import heapq
+import logging
+import os
+import pwd
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from monitor.collectors.procfs import read_once
+
+logger = logging.getLogger(__name__)
+
+# Longest command line kept per process
+CMDLINE_MAX = 256
+
+# Orderings accepted by ProcessScanner.query; pid is ascending, the rest
+# largest first
+SORT_KEYS: dict[str, Callable[["ProcessSample"], Any]] = {
+    "cpu": lambda p: (p.cpu, p.rss),
+    "mem": lambda p: p.rss,
+    "rss": lambda p: p.rss,
+    "io": lambda p: (p.io_read + p.io_write, p.cpu),
+    "pid": lambda p: p.pid,
+}
+
+# Ways processes can be grouped by ProcessScanner.groups
+GROUP_KEYS: dict[str, Callable[["ProcessIdentity"], str]] = {
+    "exe": lambda i: i.exe,
+    "user": lambda i: i.user,
+    "cgroup": lambda i: i.cgroup,
+    "unit": lambda i: i.unit,
+}
+
+# Orderings accepted by ProcessScanner.groups, all largest first
+GROUP_SORT_KEYS: dict[str, Callable[["ProcessGroup"], Any]] = {
+    "cpu": lambda g: (g.cpu, g.rss),
+    "mem": lambda g: g.rss,
+    "rss": lambda g: g.rss,
+    "io": lambda g: (g.io_read + g.io_write, g.cpu),
+    "count": lambda g: (g.count, g.cpu),
+}
+
+# systemd unit types that own processes, most specific first
+_UNIT_SUFFIXES = (".service", ".scope")
+
+
+@dataclass(frozen=True)
+class ProcessIdentity:
+    """Per-process data that is fixed for the life of the process."""
+
+    pid: int
+    starttime: int  # Clock ticks after boot
+    comm: str
+    cmdline: str
+    uid: int
+    user: str
+    exe: str = ""  # Executable base name
+    cgroup: str = "/"  # cgroup v2 path (the systemd hierarchy on v1 hosts)
+
+    @property
+    def unit(self) -> str:
+        """The systemd unit owning the process, or its cgroup path outside of one."""
+        return unit_from_cgroup(self.cgroup)
+
+
+@dataclass(frozen=True)
+class ProcessSample:
+    """One process in one scan."""
+
+    identity: ProcessIdentity
+    state: str
+    threads: int
+    cpu: float  # Percent of total CPU capacity since the previous scan
+    rss: int  # Resident set size in bytes
+    mem: float  # Percent of physical memory
+    io_read: float = 0.0  # Bytes per second read from storage since the previous scan
+    io_write: float = 0.0  # Bytes per second written to storage
+
+    @property
+    def pid(self) -> int:
+        return self.identity.pid
+
+    def to_dict(self) -> dict:
+        """Serialize for the API."""
+        ident = self.identity
+        return {
+            "pid": ident.pid,
+            "name": ident.cmdline[:50],
+            "comm": ident.comm,
+            "user": ident.user,
+            "state": self.state,
+            "threads": self.threads,
+            "cpu": self.cpu,
+            "mem": self.mem,
+            "rss_mb": round(self.rss / 1024 / 1024, 1),
+            "read_kb_s": round(self.io_read / 1024, 1),
+            "write_kb_s": round(self.io_write / 1024, 1),
+        }
+
+
+@dataclass
+class ProcessGroup:
+    """Totals for the processes sharing one group key."""
+
+    key: str
+    count: int = 0
+    cpu: float = 0.0
+    rss: int = 0
+    mem: float = 0.0
+    io_read: float = 0.0
+    io_write: float = 0.0
+
+    def add(self, p: ProcessSample) -> None:
+        self.count += 1
+        self.cpu += p.cpu
+        self.rss += p.rss
+        self.mem += p.mem
+        self.io_read += p.io_read
+        self.io_write += p.io_write
+
+    def to_dict(self) -> dict:
+        """Serialize for the API."""
+        return {
+            "key": self.key,
+            "count": self.count,
+            "cpu": round(min(100.0, self.cpu), 1),
+            "mem": round(self.mem, 1),
+            "rss_mb": round(self.rss / 1024 / 1024, 1),
+            "read_kb_s": round(self.io_read / 1024, 1),
+            "write_kb_s": round(self.io_write / 1024, 1),
+        }
+
+
+def parse_cgroup(text: str) -> str:
+    """The process's cgroup path from /proc/[pid]/cgroup.
+
+    Uses the unified (v2) entry, falling back to the named systemd
+    hierarchy on hybrid v1 hosts.
+    """
+    fallback = "/"
+    for line in text.splitlines():
+        hierarchy, _, rest = line.partition(":")
+        controllers, _, path = rest.partition(":")
+        if hierarchy == "0" and controllers == "" and path not in ("", "/"):
+            return path
+        if controllers == "name=systemd" and path:
+            fallback = path
+    return fallback
+
+
+def unit_from_cgroup(path: str) -> str:
+    """The innermost systemd service or scope in a cgroup path.
+
+    "/system.slice/docker-ab12.scope" -> "docker-ab12.scope". Paths
+    without one (the root, or a slice only) are returned unchanged.
+    """
+    for part in reversed(path.split("/")):
+        if part.endswith(_UNIT_SUFFIXES):
+            return part
+    return path
+
+
+def parse_stat(text: str) -> Optional[tuple[str, list[str]]]:
+    """Split /proc/[pid]/stat into (comm, fields after comm).
+
+    comm may contain spaces and parentheses, so it is delimited by the
+    first "(" and the last ")".
+    """
+    start = text.find("(")
+    end = text.rfind(")")
+    if start < 0 or end < start:
+        return None
+    return text[start + 1 : end], text[end + 2 :].split()
+
+
+def _read_io(path: str) -> Optional[tuple[int, int]]:
+    """(read_bytes, write_bytes) from /proc/[pid]/io, None if unreadable."""
+    try:
+        text = read_once(path).decode("latin-1")
+    except OSError:
+        return None
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        values[key] = value
+    try:
+        return int(values["read_bytes"]), int(values["write_bytes"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _read_mem_total(proc_root: str) -> int:
+    """MemTotal in bytes, 0 if unknown."""
+    try:
+        with open(os.path.join(proc_root, "meminfo")) as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _owner_uid(path: str) -> int:
+    return os.stat(path).st_uid
+
+
+class ProcessScanner:
+    """Scans /proc and keeps the latest process table.
+
+    /proc/[pid]/io is only readable for the monitor's own processes unless
+    it runs as root; processes whose counters are denied report zero I/O
+    and are not retried until their pid is reused.
+    """
+
+    def __init__(
+        self,
+        proc_root: str = "/proc",
+        read_io: bool = True,
+        cpu_count: Optional[int] = None,
+        clock_ticks: Optional[int] = None,
+        page_size: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        owner: Optional[Callable[[str], int]] = None,
+    ):
+        self._root = proc_root
+        self._read_io = read_io
+        self._cpu_count = cpu_count or os.cpu_count() or 1
+        self._clock_ticks = clock_ticks or os.sysconf("SC_CLK_TCK")
+        self._page_size = page_size or os.sysconf("SC_PAGE_SIZE")
+        self._clock = clock
+        self._owner = owner or _owner_uid
+        self._mem_total = _read_mem_total(proc_root)
+        self._identities: dict[tuple[int, int], ProcessIdentity] = {}
+        # pid -> (starttime, utime+stime, (read_bytes, write_bytes) or None)
+        self._ticks: dict[int, tuple[int, int, Optional[tuple[int, int]]]] = {}
+        self._users: dict[int, str] = {}
+        self._last_scan: Optional[float] = None
+        self._elapsed = 0.0
+        self._table: list[ProcessSample] = []
+        self._generation = 0
+        # Query results reused until the next scan, keyed by query
+        self._selections: dict[tuple[str, str, int], tuple[int, tuple[int, list]]] = {}
+        self._groups: dict[str, tuple[int, list[ProcessGroup]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> list[ProcessSample]:
+        """Processes from the most recent scan (do not mutate)."""
+        return self._table
+
+    @property
+    def generation(self) -> int:
+        """Incremented on every scan."""
+        return self._generation
+
+    def scan(self) -> list[ProcessSample]:
+        """Read every process and compute CPU usage since the last scan.
+
+        Processes seen for the first time report 0% CPU.
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._last_scan if self._last_scan is not None else 0.0
+            self._elapsed = elapsed
+            # CPU ticks available across all cores in the interval
+            capacity = elapsed * self._clock_ticks * self._cpu_count
+
+            samples: list[ProcessSample] = []
+            ticks: dict[int, tuple[int, int, Optional[tuple[int, int]]]] = {}
+            identities: dict[tuple[int, int], ProcessIdentity] = {}
+            try:
+                entries = os.listdir(self._root)
+            except OSError as e:
+                logger.warning("Cannot list %s: %s", self._root, e)
+                entries = []
+
+            for entry in entries:
+                if not entry.isdigit():
+                    continue
+                pid = int(entry)
+                sample = self._read_process(pid, capacity, ticks, identities)
+                if sample is not None:
+                    samples.append(sample)
+
+            # Exited processes drop out of the caches here
+            self._ticks = ticks
+            self._identities = identities
+            self._last_scan = now
+            self._table = samples
+            self._generation += 1
+            self._selections = {}
+            return samples
+
+    def top(self, n: int, key: Callable[[ProcessSample], Any]) -> list[ProcessSample]:
+        """The n largest processes of the latest scan by key."""
+        return heapq.nlargest(n, self._table, key=key)
+
+    def query(
+        self, sort: str = "cpu", limit: int = 10, offset: int = 0, name_filter: str = ""
+    ) -> tuple[int, list[ProcessSample]]:
+        """One page of the latest table in the given order.
+
+        Only the first offset + limit entries are selected (not a full
+        sort), and the selection is reused by identical queries until the
+        next scan.
+
+        Args:
+            sort: A key of SORT_KEYS
+            limit: Page size
+            offset: Entries to skip
+            name_filter: Case-insensitive substring of the command line
+
+        Returns:
+            (number of matching processes, page)
+
+        Raises:
+            ValueError: On an unknown sort key
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort!r}")
+        needle = name_filter.lower()
+        n = offset + limit
+        cache_key = (sort, needle, n)
+        generation, table = self._generation, self._table
+        cached = self._selections.get(cache_key)
+        if cached is not None and cached[0] == generation:
+            total, selected = cached[1]
+        else:
+            if needle:
+                table = [
+                    p
+                    for p in table
+                    if needle in p.identity.cmdline.lower() or needle in p.identity.comm.lower()
+                ]
+            select = heapq.nsmallest if sort == "pid" else heapq.nlargest
+            selected = select(n, table, key=SORT_KEYS[sort])
+            total = len(table)
+            if len(self._selections) > 64:
+                self._selections = {}
+            self._selections[cache_key] = (generation, (total, selected))
+        return total, selected[offset:n]
+
+    def groups(self, by: str = "exe", sort: str = "cpu", limit: int = 10) -> list[ProcessGroup]:
+        """Totals per group over the latest table, largest first.
+
+        The grouping is computed once per scan and shared by all sort
+        orders and limits.
+
+        Args:
+            by: A key of GROUP_KEYS
+            sort: A key of GROUP_SORT_KEYS
+            limit: Number of groups to return
+
+        Raises:
+            ValueError: On an unknown grouping or sort key
+        """
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Unknown grouping: {by!r}")
+        if sort not in GROUP_SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort!r}")
+        generation, table = self._generation, self._table
+        cached = self._groups.get(by)
+        if cached is not None and cached[0] == generation:
+            totals = cached[1]
+        else:
+            key_of = GROUP_KEYS[by]
+            grouped: dict[str, ProcessGroup] = {}
+            for p in table:
+                key = key_of(p.identity)
+                group = grouped.get(key)
+                if group is None:
+                    group = grouped[key] = ProcessGroup(key)
+                group.add(p)
+            totals = list(grouped.values())
+            self._groups[by] = (generation, totals)
+        return heapq.nlargest(limit, totals, key=GROUP_SORT_KEYS[sort])
+
+    def _read_process(
+        self,
+        pid: int,
+        capacity: float,
+        ticks: dict[int, tuple[int, int, Optional[tuple[int, int]]]],
+        identities: dict[tuple[int, int], ProcessIdentity],
+    ) -> Optional[ProcessSample]:
+        base = os.path.join(self._root, str(pid))
+        try:
+            parsed = parse_stat(read_once(os.path.join(base, "stat")).decode("utf-8", "replace"))
+        except OSError:
+            return None  # Exited between listdir and open
+        if parsed is None:
+            return None
+        comm, fields = parsed
+        try:
+            state = fields[0]
+            cpu_ticks = int(fields[11]) + int(fields[12])
+            threads = int(fields[17])
+            starttime = int(fields[19])
+            rss = int(fields[21]) * self._page_size
+        except (IndexError, ValueError):
+            return None
+
+        key = (pid, starttime)
+        identity = self._identities.get(key)
+        if identity is None:
+            identity = self._read_identity(base, pid, starttime, comm)
+            if identity is None:
+                return None
+        identities[key] = identity
+
+        prev = self._ticks.get(pid)
+        if prev is not None and prev[0] != starttime:
+            prev = None  # Pid reused by a new process
+
+        io = None
+        if self._read_io and (prev is None or prev[2] is not None):
+            io = _read_io(os.path.join(base, "io"))
+        ticks[pid] = (starttime, cpu_ticks, io)
+
+        cpu = io_read = io_write = 0.0
+        if prev is not None and capacity > 0:
+            cpu = min(100.0, round(100.0 * max(0, cpu_ticks - prev[1]) / capacity, 1))
+            if io is not None and prev[2] is not None:
+                io_read = max(0, io[0] - prev[2][0]) / self._elapsed
+                io_write = max(0, io[1] - prev[2][1]) / self._elapsed
+        mem = round(100.0 * rss / self._mem_total, 1) if self._mem_total else 0.0
+        return ProcessSample(identity, state, threads, cpu, rss, mem, io_read, io_write)
+
+    def _read_identity(
+        self, base: str, pid: int, starttime: int, comm: str
+    ) -> Optional[ProcessIdentity]:
+        """Read the data that stays fixed for a process's lifetime."""
+        try:
+            uid = self._owner(base)
+            raw = read_once(os.path.join(base, "cmdline"), CMDLINE_MAX)
+        except OSError:
+            return None
+        try:
+            cgroup = parse_cgroup(read_once(os.path.join(base, "cgroup")).decode("latin-1"))
+        except OSError:
+            cgroup = "/"
+        argv0 = raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+        # Some programs rewrite argv[0] into a status line ("nginx: worker process")
+        exe = os.path.basename(argv0.split(" ", 1)[0].rstrip(":")) if argv0 else ""
+        cmdline = raw.replace(b"\0", b" ").decode("utf-8", "replace").strip()
+        return ProcessIdentity(
+            pid=pid,
+            starttime=starttime,
+            comm=comm,
+            # Kernel threads have no command line
+            cmdline=cmdline or f"[{comm}]",
+            uid=uid,
+            user=self._user_name(uid),
+            exe=exe or comm,
+            cgroup=cgroup,
+        )
+
+    def _user_name(self, uid: int) -> str:
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        return name
@@ -1,87 +1,251 @@
-"""Sensors metrics collector (Raspberry Pi specific)."""
+"""Sensors metrics collector.
 
+Temperatures come from the kernel's thermal zones and hwmon devices, and
+the Raspberry Pi's throttling state from the firmware driver's
+get_throttled attribute and the rpi_volt under-voltage alarm. The sysfs
+files are opened once and re-read with pread. vcgencmd is only run for
+values sysfs does not expose (core voltage, and throttling on kernels
+without the attribute), at a slower cadence: it takes one command per
+invocation, so each missing value costs a fork.
+"""
+
+import glob
+import os
 import subprocess
-from typing import Any
+import time
+from typing import Any, Callable, Optional
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.host import HostSource
+from monitor.collectors.procfs import ProcFile
 
+VCGENCMD = "/usr/bin/vcgencmd"
+
+# Seconds between vcgencmd runs for values sysfs cannot provide
+VCGENCMD_INTERVAL = 60.0
+
+# Seconds between looking for sensors that appeared (e.g. a module loaded late)
+DISCOVERY_INTERVAL = 300.0
+
+# Thermal zone types that describe the CPU, most preferred first
+CPU_ZONE_TYPES = ("cpu-thermal", "cpu_thermal", "x86_pkg_temp", "soc_thermal", "soc-thermal")
+
+# hwmon drivers reporting CPU temperature, used when no thermal zone does
+CPU_HWMON_NAMES = ("cpu_thermal", "coretemp", "k10temp")
+
+# get_throttled locations exposed by the Raspberry Pi firmware driver
+THROTTLED_GLOBS = (
+    "/sys/devices/platform/soc/soc:firmware/get_throttled",
+    "/sys/devices/platform/*/*:firmware/get_throttled",
+)
+
+_THROTTLED_BITS = {
+    "undervolt": 0,
+    "arm_freq_capped": 1,
+    "throttled": 2,
+    "soft_temp": 3,
+}
 
-class SensorsCollector(BaseCollector):
-    """Collects sensor data (temperature, voltage, throttling) from vcgencmd.
 
-    Note: This collector is specific to Raspberry Pi hardware.
+def parse_throttled(raw: int) -> dict[str, Any]:
+    """Decode the firmware throttling bitmask.
+
+    The low bits describe the current state, bits 16+ whether the
+    condition has occurred since boot.
     """
+    result: dict[str, Any] = {"raw": raw}
+    for name, bit in _THROTTLED_BITS.items():
+        result[f"current_{name}"] = bool(raw & (1 << bit))
+        result[f"past_{name}"] = bool(raw & (1 << (bit + 16)))
+    return result
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+class SensorsCollector(BaseCollector):
+    """Collects temperature, voltage and throttling state."""
+
+    # Kept-open sysfs reads; vcgencmd only for the slow fallback values
+    interval = 5.0
+
+    def __init__(
+        self,
+        thermal_root: str = "/sys/class/thermal",
+        hwmon_root: str = "/sys/class/hwmon",
+        throttled_globs: tuple[str, ...] = THROTTLED_GLOBS,
+        vcgencmd: str = VCGENCMD,
+        clock: Callable[[], float] = time.monotonic,
+        host: Optional[HostSource] = None,
+    ):
+        self._host = host or HostSource()
+        self._thermal_root = thermal_root
+        self._hwmon_root = hwmon_root
+        self._throttled_globs = throttled_globs
+        self._vcgencmd = vcgencmd if self._host.executable(vcgencmd) else None
+        self._clock = clock
+        self._temps: dict[str, ProcFile] = {}
+        self._cpu_label: Optional[str] = None
+        self._undervolt: Optional[ProcFile] = None
+        self._throttled: Optional[ProcFile] = None
+        self._discovered_at: Optional[float] = None
+        self._fallback: dict[str, Any] = {}
+        self._fallback_at: Optional[float] = None
 
     @property
     def name(self) -> str:
         return "sensors"
 
     def collect(self) -> dict[str, Any]:
-        """Collect sensor metrics using vcgencmd.
+        """Collect sensor metrics.
 
         Returns:
             {
                 "temp": float or None,       # CPU temperature in Celsius
-                "voltage": float or None,    # Core voltage
-                "throttled": dict or None,   # Throttling status
+                "temps": {name: float},      # Every thermal zone and hwmon sensor
+                "voltage": float or None,    # Core voltage (vcgencmd only)
+                "throttled": dict or None,   # parse_throttled() flags
             }
         """
-        result = {"temp": None, "voltage": None, "throttled": None}
+        now = self._clock()
+        if self._discovered_at is None or now - self._discovered_at >= DISCOVERY_INTERVAL:
+            self._discover()
+            self._discovered_at = now
 
-        # Temperature
-        try:
-            res = subprocess.run(
-                ["/usr/bin/vcgencmd", "measure_temp"],
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            if res.returncode == 0:
-                temp_str = res.stdout.strip().split("=")[1]
-                result["temp"] = float(temp_str.replace("'C", "").replace("C", ""))
-        except Exception:
-            pass
+        temps = {}
+        for label, attr in self._temps.items():
+            millideg = attr.read_int()
+            if millideg is not None:
+                temps[label] = round(millideg / 1000, 1)
+        temp = temps.get(self._cpu_label) if self._cpu_label is not None else None
 
-        # Voltage
-        try:
-            res = subprocess.run(
-                ["/usr/bin/vcgencmd", "measure_volts", "core"],
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            if res.returncode == 0:
-                volt_str = res.stdout.strip().split("=")[1]
-                result["voltage"] = float(volt_str.replace("V", ""))
-        except Exception:
-            pass
+        throttled = None
+        raw = self._throttled.read_int() if self._throttled is not None else None
+        if raw is not None:
+            throttled = parse_throttled(raw)
 
-        # Throttling status
-        try:
-            res = subprocess.run(
-                ["/usr/bin/vcgencmd", "get_throttled"],
-                capture_output=True,
-                text=True,
-                timeout=2,
+        fallback = self._read_fallback(now, need_temp=temp is None, need_throttled=raw is None)
+        if temp is None:
+            temp = fallback.get("temp")
+        if throttled is None and fallback.get("throttled") is not None:
+            throttled = dict(fallback["throttled"])
+
+        # rpi_volt reports under-voltage live even when the rest is cached
+        if self._undervolt is not None:
+            alarm = self._undervolt.read_int()
+            if alarm is not None:
+                if throttled is None:
+                    throttled = parse_throttled(0)
+                if bool(alarm) != throttled["current_undervolt"]:
+                    throttled["raw"] ^= 1
+                    throttled["current_undervolt"] = bool(alarm)
+
+        return {
+            "temp": temp,
+            "temps": temps,
+            "voltage": fallback.get("voltage"),
+            "throttled": throttled,
+        }
+
+    def close(self) -> None:
+        """Close every kept-open sysfs file."""
+        for attr in self._attributes():
+            attr.close()
+
+    def _attributes(self) -> list[ProcFile]:
+        attrs = list(self._temps.values())
+        attrs += [a for a in (self._undervolt, self._throttled) if a is not None]
+        return attrs
+
+    def _discover(self) -> None:
+        """Find thermal zones, hwmon sensors and the firmware throttling attribute."""
+        self.close()
+        temps: dict[str, ProcFile] = {}
+        cpu_label = None
+        cpu_rank = len(CPU_ZONE_TYPES)
+
+        for zone in sorted(glob.glob(os.path.join(self._thermal_root, "thermal_zone*"))):
+            zone_type = _read_text(os.path.join(zone, "type")) or os.path.basename(zone)
+            if zone_type in temps:
+                continue
+            temps[zone_type] = ProcFile(os.path.join(zone, "temp"))
+            rank = (
+                CPU_ZONE_TYPES.index(zone_type)
+                if zone_type in CPU_ZONE_TYPES
+                else len(CPU_ZONE_TYPES)
             )
-            if res.returncode == 0:
-                throttled_str = res.stdout.strip().split("=")[1].strip()
-                result["throttled"] = self._parse_throttled(throttled_str)
-        except Exception:
-            pass
+            if cpu_label is None or rank < cpu_rank:
+                cpu_label, cpu_rank = zone_type, rank
+
+        undervolt = None
+        for hwmon in sorted(glob.glob(os.path.join(self._hwmon_root, "hwmon*"))):
+            name = _read_text(os.path.join(hwmon, "name"))
+            if name == "rpi_volt":
+                undervolt = ProcFile(os.path.join(hwmon, "in0_lcrit_alarm"))
+                continue
+            for path in sorted(glob.glob(os.path.join(hwmon, "temp*_input"))):
+                label = _read_text(path[: -len("_input")] + "_label")
+                key = f"{name} {label}" if label else name
+                # Thermal zones also register as hwmon devices of the same name
+                if key not in temps:
+                    temps[key] = ProcFile(path)
 
-        return result
+        if cpu_label is None:
+            cpu_label = next((k for k in temps if k.split()[0] in CPU_HWMON_NAMES), None)
 
-    def _parse_throttled(self, status: str) -> dict[str, Any]:
-        """Parse the throttled status hex value."""
+        throttled = None
+        for pattern in self._throttled_globs:
+            matches = sorted(glob.glob(pattern))
+            if matches:
+                throttled = ProcFile(matches[0])
+                break
+
+        self._temps = temps
+        self._cpu_label = cpu_label
+        self._undervolt = undervolt
+        self._throttled = throttled
+
+    def _read_fallback(self, now: float, need_temp: bool, need_throttled: bool) -> dict[str, Any]:
+        """Values only vcgencmd provides, refreshed every VCGENCMD_INTERVAL."""
+        if self._vcgencmd is None:
+            return {}
+        if self._fallback_at is not None and now - self._fallback_at < VCGENCMD_INTERVAL:
+            return self._fallback
+        fallback: dict[str, Any] = {}
+        out = self._run_vcgencmd("measure_volts", "core")  # volt=0.8600V
+        if out:
+            try:
+                fallback["voltage"] = float(out.split("=")[1].rstrip("V"))
+            except (IndexError, ValueError):
+                pass
+        if need_temp:
+            out = self._run_vcgencmd("measure_temp")  # temp=48.3'C
+            if out:
+                try:
+                    fallback["temp"] = float(out.split("=")[1].rstrip("'C"))
+                except (IndexError, ValueError):
+                    pass
+        if need_throttled:
+            out = self._run_vcgencmd("get_throttled")  # throttled=0x50000
+            if out:
+                try:
+                    fallback["throttled"] = parse_throttled(int(out.split("=")[1], 16))
+                except (IndexError, ValueError):
+                    pass
+        self._fallback = fallback
+        self._fallback_at = now
+        return fallback
+
+    def _run_vcgencmd(self, *args: str) -> Optional[str]:
+        if self._vcgencmd is None:
+            return None
         try:
-            raw = int(status, 16)
-            return {
-                "raw": raw,
-                "current_undervolt": bool(raw & 0x1),
-                "current_throttled": bool(raw & 0x4),
-                "current_soft_temp": bool(raw & 0x8),
-                "current_arm_freq_capped": bool(raw & 0x2),
-            }
-        except Exception:
-            return {"raw": 0}
+            res = self._host.run([self._vcgencmd, *args], timeout=2)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return res.stdout.strip() if res.returncode == 0 else None
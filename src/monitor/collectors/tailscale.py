@@ -1,21 +1,100 @@
-"""Tailscale status collector."""
+"""Tailscale status collector.
+
+Talks to tailscaled's local API over its unix socket on a kept-open
+connection and asks only for the node's own status. The peer list, which
+grows with the tailnet, is fetched on a slower cadence for online counts
+and optional pings, on a background thread with its own connection so
+pings never hold up a sample. Falls back to the tailscale CLI when the
+socket is not reachable (e.g. the monitor lacks permission to open it).
+"""
 
 import json
+import logging
+import os
 import subprocess
 import threading
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+from urllib.parse import quote
 
 from monitor.collectors.base import BaseCollector
+from monitor.collectors.host import HostSource
+from monitor.collectors.unixhttp import UnixHTTPClient
+
+logger = logging.getLogger(__name__)
+
+TAILSCALED_SOCKET = "/var/run/tailscale/tailscaled.sock"
+
+# tailscaled only accepts local API requests for this host name and
+# rejects mutating requests without the Sec-Tailscale header
+_LOCALAPI_HOST = "local-tailscaled.sock"
+_LOCALAPI_HEADERS = {"Sec-Tailscale": "localapi"}
+
+
+def summarize_peers(status: dict[str, Any]) -> dict[str, int]:
+    """Peer counts from a full status response."""
+    peers = (status.get("Peer") or {}).values()
+    online = [p for p in peers if p.get("Online")]
+    return {
+        "total": len(peers),
+        "online": len(online),
+        # CurAddr is set when traffic flows peer-to-peer rather than via DERP
+        "direct": sum(1 for p in online if p.get("CurAddr")),
+    }
+
+
+def _match_peers(status: dict[str, Any], names: tuple[str, ...]) -> dict[str, str]:
+    """Map each requested peer name or IP to the peer's first Tailscale IP."""
+    matched = {}
+    for peer in (status.get("Peer") or {}).values():
+        ips = peer.get("TailscaleIPs") or []
+        if not ips:
+            continue
+        dns = (peer.get("DNSName") or "").split(".")[0]
+        for name in names:
+            if name in (peer.get("HostName"), dns) or name in ips:
+                matched[name] = ips[0]
+    return matched
 
 
 class TailscaleCollector(BaseCollector):
-    """Collects Tailscale connection status."""
+    """Collects Tailscale connection status.
 
-    def __init__(self, cache_ttl: float = 15.0):
+    One instance is shared by the stats sampler and /api/tailscale-ip, so
+    results are cached for cache_ttl; while one caller refreshes them the
+    others get the previous results instead of waiting.
+    """
+
+    interval = 15.0
+    # One local API round trip; heavy when the CLI fallback forks instead
+    cost = "light"
+
+    def __init__(
+        self,
+        cache_ttl: float = 15.0,
+        socket_path: str = TAILSCALED_SOCKET,
+        cli: str = "tailscale",
+        peer_interval: float = 60.0,
+        ping_peers: tuple[str, ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+        host: Optional[HostSource] = None,
+    ):
+        self._host = host or HostSource()
         self._cache_ttl = cache_ttl
+        self._api = UnixHTTPClient(socket_path, _LOCALAPI_HOST, headers=_LOCALAPI_HEADERS)
+        self._peer_api = UnixHTTPClient(socket_path, _LOCALAPI_HOST, headers=_LOCALAPI_HEADERS)
+        if not os.access(socket_path, os.R_OK | os.W_OK):
+            self.cost = "heavy"
+        self._cli = cli
+        self._peer_interval = peer_interval
+        self._ping_peers = ping_peers
+        self._clock = clock
         self._cache: Optional[dict[str, Any]] = None
-        self._cache_time: float = 0
+        self._cache_time = 0.0
+        self._fetching = False
+        self._peers: Optional[dict[str, Any]] = None
+        self._peers_time: Optional[float] = None
+        self._peer_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
 
     @property
@@ -29,43 +108,129 @@ class TailscaleCollector(BaseCollector):
             {
                 "tailscale_connected": bool,
                 "tailscale_ip": str,
+                "source": str or None,     # "localapi", "cli", or None if unavailable
+                "peers": {"total": int, "online": int, "direct": int} or None,
+                "latency_ms": {peer: float or None},  # Configured ping targets
             }
         """
-        now = time.time()
-
+        now = self._clock()
         with self._lock:
-            if self._cache_time and (now - self._cache_time) < self._cache_ttl:
-                return self._cache.copy() if self._cache else self._default_result()
-
-        result = self._fetch_status()
-
+            if self._cache is not None and (
+                now - self._cache_time < self._cache_ttl or self._fetching
+            ):
+                return dict(self._cache)
+            self._fetching = True
+        try:
+            result = self._fetch(now)
+        finally:
+            with self._lock:
+                self._fetching = False
         with self._lock:
+            if result["tailscale_connected"] and self._peers is not None:
+                result.update(self._peers)
             self._cache = result
             self._cache_time = now
+            return dict(result)
+
+    def close(self) -> None:
+        """Close the local API connections."""
+        self._api.close()
+        self._peer_api.close()
 
+    def _fetch(self, now: float) -> dict[str, Any]:
+        result = self._default_result()
+        source = "localapi"
+        try:
+            status = self._api.get_json("/localapi/v0/status?peers=false")
+        except (OSError, ValueError) as e:
+            logger.debug("tailscaled local API unavailable: %s", e)
+            source = "cli"
+            status = self._run_cli("status", "--json", "--peers=false")
+        if not isinstance(status, dict):
+            return result
+
+        ips = status.get("TailscaleIPs") or []
+        result["source"] = source
+        result["tailscale_connected"] = bool(ips) and status.get("BackendState") == "Running"
+        result["tailscale_ip"] = ips[0] if ips else "-"
+
+        if result["tailscale_connected"]:
+            self._refresh_peers(source, now)
         return result
 
-    def _fetch_status(self) -> dict[str, Any]:
-        """Fetch Tailscale status from CLI."""
+    def _refresh_peers(self, source: str, now: float) -> None:
+        """Refresh the peer summary if due.
+
+        Over the local API, where pings can take seconds, this starts a
+        background refresh whose results later samples pick up; the CLI
+        fallback does not ping and refreshes inline.
+        """
+        with self._lock:
+            if self._peer_thread is not None and self._peer_thread.is_alive():
+                return
+            if self._peers_time is not None and now - self._peers_time < self._peer_interval:
+                return
+            self._peers_time = now
+            if source == "localapi":
+                self._peer_thread = threading.Thread(
+                    target=self._update_peers, args=(source,), name="tailscale-peers", daemon=True
+                )
+                self._peer_thread.start()
+                return
+        self._update_peers(source)
+
+    def _update_peers(self, source: str) -> None:
+        peers = self._fetch_peers(source)
+        with self._lock:
+            self._peers = peers
+            if peers is not None and self._cache is not None and self._cache["tailscale_connected"]:
+                self._cache = {**self._cache, **peers}
+
+    def _fetch_peers(self, source: str) -> Optional[dict[str, Any]]:
+        """Peer counts and ping latencies, from the full peer list."""
+        try:
+            if source == "localapi":
+                status = self._peer_api.get_json("/localapi/v0/status")
+            else:
+                status = self._run_cli("status", "--json")
+        except (OSError, ValueError):
+            return None
+        if not isinstance(status, dict):
+            return None
+        latency: dict[str, Optional[float]] = {}
+        for name, ip in _match_peers(status, self._ping_peers).items():
+            latency[name] = self._ping(ip) if source == "localapi" else None
+        return {"peers": summarize_peers(status), "latency_ms": latency}
+
+    def _ping(self, ip: str) -> Optional[float]:
+        """Round trip to a peer over disco (no WireGuard handshake needed)."""
         try:
-            result = subprocess.run(
-                ["tailscale", "status", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=2,
+            res = self._peer_api.request_json(
+                "POST", f"/localapi/v0/ping?ip={quote(ip)}&type=disco", timeout=3.0
             )
-            if result.returncode == 0:
-                status = json.loads(result.stdout)
-                tailscale_ips = status.get("TailscaleIPs", [])
-                return {
-                    "tailscale_connected": True,
-                    "tailscale_ip": tailscale_ips[0] if tailscale_ips else "-",
-                }
-        except Exception:
-            pass
+        except (OSError, ValueError):
+            return None
+        if not isinstance(res, dict) or res.get("Err"):
+            return None
+        seconds = res.get("LatencySeconds")
+        return round(seconds * 1000, 1) if isinstance(seconds, (int, float)) else None
 
-        return self._default_result()
+    def _run_cli(self, *args: str) -> Optional[dict[str, Any]]:
+        try:
+            res = self._host.run([self._cli, *args], timeout=2)
+            if res.returncode == 0:
+                data = json.loads(res.stdout)
+                return data if isinstance(data, dict) else None
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+        return None
 
     def _default_result(self) -> dict[str, Any]:
         """Return default disconnected status."""
-        return {"tailscale_connected": False, "tailscale_ip": "-"}
+        return {
+            "tailscale_connected": False,
+            "tailscale_ip": "-",
+            "source": None,
+            "peers": None,
+            "latency_ms": {},
+        }
@@ -0,0 +1,119 @@
+"""Minimal HTTP client for daemons listening on unix sockets.
+
+Used for the tailscaled local API and the Docker Engine API. One
+connection is kept open and reused; a request on a connection the server
+has since closed is retried once on a fresh one.
+"""
+
+import http.client
+import json
+import socket
+import threading
+from typing import Any, Optional
+
+
+class UnixHTTPError(OSError):
+    """The daemon answered with an error status."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that connects to a unix socket instead of TCP."""
+
+    def __init__(self, socket_path: str, host: str = "localhost", timeout: float = 2.0):
+        super().__init__(host, timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class UnixHTTPClient:
+    """JSON requests over one kept-alive unix socket connection."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        host: str = "localhost",
+        timeout: float = 2.0,
+        headers: Optional[dict[str, str]] = None,
+    ):
+        self.socket_path = socket_path
+        self._host = host
+        self._timeout = timeout
+        self._headers = headers or {}
+        self._conn: Optional[UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def connection(self, timeout: Optional[float] = None) -> UnixHTTPConnection:
+        """A new, unshared connection (e.g. for a long-lived stream)."""
+        return UnixHTTPConnection(
+            self.socket_path, self._host, timeout=self._timeout if timeout is None else timeout
+        )
+
+    def get_json(self, path: str) -> Any:
+        """GET path and decode the JSON body."""
+        return self.request_json("GET", path)
+
+    def request_json(self, method: str, path: str, timeout: Optional[float] = None) -> Any:
+        """Send a request and decode the JSON body.
+
+        Args:
+            method: HTTP method
+            path: Request path including any query string
+            timeout: Socket timeout for this request (default: the client's)
+
+        Raises:
+            OSError: If the socket is unreachable or the daemon returns an
+                error status (UnixHTTPError)
+            ValueError: If the body is not JSON
+        """
+        with self._lock:
+            for attempt in range(2):
+                reused = self._conn is not None
+                try:
+                    status, reason, body = self._send(method, path, timeout)
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    self._close_locked()
+                    if reused and attempt == 0 and not isinstance(e, socket.timeout):
+                        continue  # The daemon closed the idle connection
+                    if isinstance(e, OSError):
+                        raise
+                    raise OSError(str(e)) from e
+        if status >= 400:
+            raise UnixHTTPError(status, reason)
+        return json.loads(body) if body else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _send(self, method: str, path: str, timeout: Optional[float]) -> tuple[int, str, bytes]:
+        if self._conn is None:
+            self._conn = self.connection()
+        conn = self._conn
+        conn.timeout = self._timeout if timeout is None else timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(conn.timeout)
+        conn.request(method, path, headers=self._headers)
+        response = conn.getresponse()
+        body = response.read()
+        if response.will_close:
+            self._close_locked()
+        return response.status, response.reason, body
+
+    def _close_locked(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -15,6 +15,21 @@ class ServerConfig:
 
     host: str = "0.0.0.0"
     port: int = field(default_factory=lambda: int(os.getenv("MONITOR_PORT", "10000")))
+    # "threaded" (thread per connection) or "asyncio" (single event loop, keep-alive)
+    engine: str = field(default_factory=lambda: os.getenv("MONITOR_SERVER_ENGINE", "threaded"))
+    # Idle time before a keep-alive connection is closed (asyncio engine)
+    keepalive_timeout_sec: float = 15.0
+    # Each /api/stream client holds a server thread open
+    max_stream_clients: int = field(
+        default_factory=lambda: int(os.getenv("MONITOR_MAX_STREAM_CLIENTS", "32"))
+    )
+    stream_heartbeat_sec: float = 15.0
+    # Browser cache lifetime for static assets other than the dashboard page
+    static_max_age: int = field(
+        default_factory=lambda: int(os.getenv("MONITOR_STATIC_MAX_AGE", "86400"))
+    )
+    # Re-read static files on every request while editing the dashboard
+    dev_mode: bool = field(default_factory=lambda: os.getenv("MONITOR_DEV", "0") == "1")
 
 
 @dataclass
@@ -28,6 +43,142 @@ class CacheConfig:
     )
 
 
+def _parse_intervals(spec: str) -> dict[str, float]:
+    """Parse "name=seconds,name=seconds" into a dict."""
+    intervals = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        intervals[name.strip()] = float(value)
+    return intervals
+
+
+@dataclass
+class SamplerConfig:
+    """Background sampler configuration."""
+
+    enabled: bool = field(
+        default_factory=lambda: os.getenv("MONITOR_SAMPLER_ENABLED", "1") != "0"
+    )
+    interval_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_SAMPLE_INTERVAL_SEC", "2"))
+    )
+    # Collectors run concurrently; a late one contributes its last good value
+    collector_workers: int = field(
+        default_factory=lambda: int(os.getenv("MONITOR_COLLECTOR_WORKERS", "4"))
+    )
+    collector_deadline_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_COLLECTOR_DEADLINE_SEC", "1.5"))
+    )
+    # Refresh interval overrides by snapshot section, e.g. "disk=30,overview=60"
+    collector_intervals: dict[str, float] = field(
+        default_factory=lambda: _parse_intervals(os.getenv("MONITOR_COLLECTOR_INTERVALS", ""))
+    )
+
+
+@dataclass
+class HistoryConfig:
+    """Server-side metric history configuration."""
+
+    window_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_HISTORY_WINDOW_SEC", "3600"))
+    )
+    # Rollup tier retention: 1-minute and 1-hour buckets
+    minute_window_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_ROLLUP_1M_WINDOW_SEC", "86400"))
+    )
+    hour_window_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_ROLLUP_1H_WINDOW_SEC", str(30 * 86400)))
+    )
+
+
+@dataclass
+class StorageConfig:
+    """Persistent metric store configuration.
+
+    The store is disabled unless a directory is configured.
+    """
+
+    directory: Optional[Path] = field(
+        default_factory=lambda: Path(os.environ["MONITOR_STORAGE_DIR"])
+        if os.getenv("MONITOR_STORAGE_DIR")
+        else None
+    )
+    flush_interval_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_STORAGE_FLUSH_SEC", "300"))
+    )
+    retention_days: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_STORAGE_RETENTION_DAYS", "30"))
+    )
+    segment_sec: float = 86400.0  # One segment file per day
+
+    @property
+    def enabled(self) -> bool:
+        """Whether persistence is configured."""
+        return self.directory is not None
+
+
+def _parse_patterns(spec: str) -> tuple[str, ...]:
+    """Parse a comma-separated list of glob patterns."""
+    return tuple(p.strip() for p in spec.split(",") if p.strip())
+
+
+@dataclass
+class NetworkConfig:
+    """Network interface selection."""
+
+    # Glob patterns matched against interface names
+    include: tuple[str, ...] = field(
+        default_factory=lambda: _parse_patterns(os.getenv("MONITOR_NET_INCLUDE", "*"))
+    )
+    exclude: tuple[str, ...] = field(
+        default_factory=lambda: _parse_patterns(os.getenv("MONITOR_NET_EXCLUDE", "lo,veth*"))
+    )
+    # Count bridges, tunnels and veths in the rx/tx totals (double counts
+    # traffic that also crosses a physical interface)
+    aggregate_virtual: bool = field(
+        default_factory=lambda: os.getenv("MONITOR_NET_AGGREGATE_VIRTUAL", "0") == "1"
+    )
+
+
+@dataclass
+class TailscaleConfig:
+    """Tailscale status source."""
+
+    # tailscaled local API; the CLI is used when the socket is unavailable
+    socket: str = field(
+        default_factory=lambda: os.getenv(
+            "MONITOR_TAILSCALE_SOCKET", "/var/run/tailscale/tailscaled.sock"
+        )
+    )
+    # Seconds between refreshing peer counts (the full peer list)
+    peer_interval_sec: float = field(
+        default_factory=lambda: float(os.getenv("MONITOR_TAILSCALE_PEER_INTERVAL_SEC", "60"))
+    )
+    # Peers (host names or Tailscale IPs) to ping for latency, with the peer refresh
+    ping_peers: tuple[str, ...] = field(
+        default_factory=lambda: _parse_patterns(os.getenv("MONITOR_TAILSCALE_PING", ""))
+    )
+
+
+@dataclass
+class HostConfig:
+    """Where collectors read host state from."""
+
+    # Directory holding the host's proc/ and sys/, e.g. "/host" in a container
+    root: str = field(default_factory=lambda: os.getenv("MONITOR_HOST_ROOT", "/"))
+
+
+@dataclass
+class DockerConfig:
+    """Docker Engine API access."""
+
+    socket: str = field(
+        default_factory=lambda: os.getenv("MONITOR_DOCKER_SOCKET", "/var/run/docker.sock")
+    )
+
+
 @dataclass
 class SpeedtestConfig:
     """Speedtest configuration."""
@@ -50,6 +201,13 @@ class Config:
 
     server: ServerConfig = field(default_factory=ServerConfig)
     cache: CacheConfig = field(default_factory=CacheConfig)
+    sampler: SamplerConfig = field(default_factory=SamplerConfig)
+    history: HistoryConfig = field(default_factory=HistoryConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    network: NetworkConfig = field(default_factory=NetworkConfig)
+    tailscale: TailscaleConfig = field(default_factory=TailscaleConfig)
+    docker: DockerConfig = field(default_factory=DockerConfig)
+    host: HostConfig = field(default_factory=HostConfig)
     speedtest: SpeedtestConfig = field(default_factory=SpeedtestConfig)
 
     # Static files directory
@@ -67,6 +225,22 @@ class Config:
         if self.server.port < 1 or self.server.port > 65535:
             raise ValueError(f"Invalid port: {self.server.port}")
 
+        if self.server.engine not in ("threaded", "asyncio"):
+            raise ValueError(f"Invalid server engine: {self.server.engine}")
+
+        if self.sampler.interval_sec <= 0:
+            raise ValueError(f"Invalid sampler interval: {self.sampler.interval_sec}")
+
+        if self.sampler.collector_workers < 1:
+            raise ValueError(f"Invalid collector workers: {self.sampler.collector_workers}")
+
+        for name, interval in self.sampler.collector_intervals.items():
+            if interval < 0:
+                raise ValueError(f"Invalid interval for collector {name}: {interval}")
+
+        if self.history.window_sec < self.sampler.interval_sec:
+            raise ValueError("History window must cover at least one sample interval")
+
         if self.speedtest.interval_sec < 10:
             raise ValueError("Speedtest interval must be at least 10 seconds")
 
@@ -0,0 +1,129 @@
+"""Delta encoding of stats snapshots.
+
+Clients that already hold snapshot N can ask for only the leaves that
+changed since N instead of the full payload.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from monitor.sampler import Snapshot
+
+
+def diff(old: dict[str, Any], new: dict[str, Any]) -> tuple[dict[str, Any], list[list[str]]]:
+    """Compute the changes turning `old` into `new`.
+
+    Nested dicts are compared key by key; any other value (including
+    lists) is a leaf and is replaced wholesale when it differs.
+
+    Returns:
+        (changes, removed): `changes` is a partial dict with the same shape
+        as `new` holding only changed leaves; `removed` lists key paths
+        that no longer exist.
+    """
+    changes: dict[str, Any] = {}
+    removed: list[list[str]] = []
+    _diff(old, new, [], changes, removed)
+    return changes, removed
+
+
+def _diff(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    path: list[str],
+    changes: dict[str, Any],
+    removed: list[list[str]],
+) -> None:
+    for key, value in new.items():
+        if key not in old:
+            changes[key] = value
+            continue
+        prev = old[key]
+        if isinstance(value, dict) and isinstance(prev, dict):
+            nested: dict[str, Any] = {}
+            _diff(prev, value, path + [key], nested, removed)
+            if nested:
+                changes[key] = nested
+        elif type(value) is not type(prev) or value != prev:
+            changes[key] = value
+    for key in old:
+        if key not in new:
+            removed.append(path + [key])
+
+
+def apply_delta(
+    base: dict[str, Any], changes: dict[str, Any], removed: list[list[str]]
+) -> dict[str, Any]:
+    """Return a copy of `base` with a delta applied (inverse of `diff`)."""
+    result = _merge(base, changes)
+    for path in removed:
+        parent: Any = result
+        for key in path[:-1]:
+            parent = parent.get(key) if isinstance(parent, dict) else None
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+    return result
+
+
+def _merge(base: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+    merged = dict(base)
+    for key, value in changes.items():
+        prev = merged.get(key)
+        if isinstance(value, dict) and isinstance(prev, dict):
+            merged[key] = _merge(prev, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class SnapshotLog:
+    """Recent snapshots by sequence number, for answering `since` queries."""
+
+    def __init__(self, capacity: int = 30):
+        self._capacity = capacity
+        self._snapshots: OrderedDict[int, Snapshot] = OrderedDict()
+        self._deltas: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, snapshot: Snapshot) -> None:
+        """Remember a published snapshot; intended as a sampler listener."""
+        with self._lock:
+            self._snapshots[snapshot.seq] = snapshot
+            while len(self._snapshots) > self._capacity:
+                self._snapshots.popitem(last=False)
+            self._deltas.clear()
+
+    def delta(self, since: int, current: Snapshot) -> Optional[dict[str, Any]]:
+        """Build the response body for a client holding snapshot `since`.
+
+        Returns:
+            {
+                "seq": int,           # Sequence number of `current`
+                "since": int,         # The client's base sequence number
+                "changes": dict,      # Changed leaves, shaped like the payload
+                "removed": [[str]],   # Key paths that disappeared
+            }
+            or None when `since` is no longer retained.
+        """
+        with self._lock:
+            cached = self._deltas.get(since)
+            if cached is not None and cached["seq"] == current.seq:
+                return cached
+            base = self._snapshots.get(since)
+        if base is None:
+            return None
+
+        changes: dict[str, Any]
+        removed: list[list[str]]
+        if since == current.seq:
+            changes, removed = {}, []
+        else:
+            changes, removed = diff(base.data, current.data)
+        result = {"seq": current.seq, "since": since, "changes": changes, "removed": removed}
+
+        with self._lock:
+            # Clients polling in lockstep share one diff per snapshot
+            if current.seq in self._snapshots:
+                self._deltas[since] = result
+        return result
@@ -1,7 +1,15 @@
 """Request handlers package."""
 
 from monitor.handlers.health import HealthHandler
+from monitor.handlers.history import HistoryHandler
+from monitor.handlers.processes import ProcessesHandler
 from monitor.handlers.system import SystemStatsHandler
 from monitor.handlers.tailscale import TailscaleHandler
 
-__all__ = ["SystemStatsHandler", "HealthHandler", "TailscaleHandler"]
+__all__ = [
+    "SystemStatsHandler",
+    "HealthHandler",
+    "HistoryHandler",
+    "ProcessesHandler",
+    "TailscaleHandler",
+]
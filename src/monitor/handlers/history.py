@@ -0,0 +1,81 @@
+"""Metric history API handler."""
+
+import math
+import time
+from typing import Any, Optional
+
+from monitor.history import MetricHistory
+from monitor.rollup import RollupEngine
+
+
+class HistoryHandler:
+    """Handler for the metric history endpoint."""
+
+    def __init__(self, history: MetricHistory, rollups: Optional[RollupEngine] = None):
+        self._history = history
+        self._rollups = rollups
+
+    def get_history(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        """Query recorded samples.
+
+        Args:
+            params: Parsed query string. Supported keys:
+                metric: Comma-separated metric names (default: all)
+                start: Unix timestamp, inclusive
+                end: Unix timestamp, inclusive
+                seconds: Look-back window ending now (ignored if start is set)
+                points: Maximum points to return; switches to aggregated
+                    min/max/avg/last output from the best rollup tier
+
+        Returns:
+            {
+                "metrics": {name: [float or None, ...]},
+                "timestamps": [float, ...],
+                "available": [str, ...],
+            }
+
+            With `points`, each metric maps to {"min", "max", "avg", "last"}
+            lists and "tier"/"resolution" describe the data source.
+
+        Raises:
+            ValueError: On unknown metrics or malformed numbers
+        """
+        metrics = None
+        if params.get("metric"):
+            metrics = [m for value in params["metric"] for m in value.split(",") if m]
+            unknown = [m for m in metrics if m not in self._history.metrics]
+            if unknown:
+                raise ValueError(f"Unknown metric: {', '.join(unknown)}")
+
+        start = self._float_param(params, "start")
+        end = self._float_param(params, "end")
+        seconds = self._float_param(params, "seconds")
+        if start is None and seconds is not None:
+            start = time.time() - seconds
+
+        points = self._float_param(params, "points")
+        if points is not None and points < 1:
+            raise ValueError(f"Invalid points: {points:g}")
+        if points is not None and self._rollups is not None:
+            end = end if end is not None else time.time()
+            if start is None:
+                start = self._history.oldest() or end
+            result = self._rollups.query(metrics, start, end, int(points))
+        else:
+            result = self._history.query(metrics, start=start, end=end)
+        result["available"] = list(self._history.metrics)
+        return result
+
+    @staticmethod
+    def _float_param(params: dict[str, list[str]], key: str) -> Optional[float]:
+        """Parse an optional finite numeric query parameter."""
+        values = params.get(key)
+        if not values:
+            return None
+        try:
+            value = float(values[0])
+        except ValueError:
+            value = math.nan
+        if not math.isfinite(value):
+            raise ValueError(f"Invalid {key}: {values[0]!r}")
+        return value
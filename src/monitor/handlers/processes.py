@@ -0,0 +1,113 @@
+"""Process list API handler."""
+
+from typing import Any
+
+from monitor.collectors.procscan import GROUP_KEYS, GROUP_SORT_KEYS, SORT_KEYS, ProcessScanner
+
+# Upper bound on one page, so a single request cannot serialize everything
+MAX_LIMIT = 500
+
+
+class ProcessesHandler:
+    """Handler for the sortable, paginated process endpoints."""
+
+    def __init__(self, scanner: ProcessScanner):
+        self._scanner = scanner
+
+    def get_processes(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        """Query the process table from the most recent scan.
+
+        Args:
+            params: Parsed query string. Supported keys:
+                sort: One of cpu, mem, rss, io, pid (default: cpu)
+                limit: Page size, 1-500 (default: 10)
+                offset: Entries to skip (default: 0)
+                filter: Case-insensitive substring of the command line
+
+        Returns:
+            {
+                "total": int,        # Processes matching the filter
+                "offset": int,
+                "limit": int,
+                "sort": str,
+                "processes": [{...}],  # ProcessSample.to_dict() entries
+            }
+
+        Raises:
+            ValueError: On unknown sort keys or malformed numbers
+        """
+        sort = self._param(params, "sort") or "cpu"
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort!r} (expected {', '.join(SORT_KEYS)})")
+        limit = self._limit_param(params)
+        offset = self._int_param(params, "offset", 0)
+        if offset < 0:
+            raise ValueError(f"Invalid offset: {offset}")
+
+        total, page = self._scanner.query(
+            sort, limit=limit, offset=offset, name_filter=self._param(params, "filter")
+        )
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "sort": sort,
+            "processes": [p.to_dict() for p in page],
+        }
+
+    def get_groups(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        """Totals per executable, user, cgroup or systemd unit.
+
+        Args:
+            params: Parsed query string. Supported keys:
+                by: One of exe, user, cgroup, unit (default: exe)
+                sort: One of cpu, mem, rss, io, count (default: cpu)
+                limit: Number of groups, 1-500 (default: 10)
+
+        Returns:
+            {
+                "by": str,
+                "sort": str,
+                "groups": [
+                    {"key": str, "count": int, "cpu": float, "mem": float,
+                     "rss_mb": float, "read_kb_s": float, "write_kb_s": float},
+                    ...
+                ],
+            }
+
+        Raises:
+            ValueError: On unknown keys or malformed numbers
+        """
+        by = self._param(params, "by") or "exe"
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Unknown grouping: {by!r} (expected {', '.join(GROUP_KEYS)})")
+        sort = self._param(params, "sort") or "cpu"
+        if sort not in GROUP_SORT_KEYS:
+            raise ValueError(f"Unknown sort: {sort!r} (expected {', '.join(GROUP_SORT_KEYS)})")
+        limit = self._limit_param(params)
+
+        groups = self._scanner.groups(by, sort=sort, limit=limit)
+        return {"by": by, "sort": sort, "groups": [g.to_dict() for g in groups]}
+
+    @classmethod
+    def _limit_param(cls, params: dict[str, list[str]]) -> int:
+        limit = cls._int_param(params, "limit", 10)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"Invalid limit: {limit} (1-{MAX_LIMIT})")
+        return limit
+
+    @staticmethod
+    def _param(params: dict[str, list[str]], key: str) -> str:
+        values = params.get(key)
+        return values[0].strip() if values else ""
+
+    @classmethod
+    def _int_param(cls, params: dict[str, list[str]], key: str, default: int) -> int:
+        """Parse an optional integer query parameter."""
+        value = cls._param(params, key)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Invalid {key}: {value!r}") from None
@@ -1,11 +1,16 @@
 """System stats API handler."""
 
-from typing import Any
+import secrets
+from typing import Any, Optional, cast
 
 from monitor.cache import TTLCache
+from monitor.collector_pool import CollectorPool
 from monitor.collectors import (
+    BaseCollector,
     CPUCollector,
     DiskCollector,
+    DockerCollector,
+    LoadCollector,
     MemoryCollector,
     NetworkCollector,
     OverviewCollector,
@@ -13,65 +18,309 @@ from monitor.collectors import (
     SensorsCollector,
     TailscaleCollector,
 )
+from monitor.collectors.diskio import DiskIO
+from monitor.collectors.host import HostSource
+from monitor.collectors.mounts import DiskUsage, MountTable
+from monitor.collectors.procscan import ProcessScanner
+from monitor.collectors.sensors import THROTTLED_GLOBS
 from monitor.config import Config, get_config
+from monitor.delta import SnapshotLog
+from monitor.sampler import Sampler, Snapshot
+from monitor.scheduler import CollectorScheduler, ScheduledCollector
+from monitor.speedtest import SpeedtestManager
 
 
 class SystemStatsHandler:
-    """Handler for system statistics API."""
+    """Handler for system statistics API.
 
-    def __init__(self, config: Config = None):
+    Args:
+        config: Monitor configuration
+        speedtest: Speedtest results merged into the network section
+        collectors: Collectors to use instead of the defaults, by snapshot
+            section (e.g. pointed at a synthetic /proc tree by benchmarks);
+            "tailscale" and "processes" must be a TailscaleCollector and a
+            ProcessCollector, which other handlers use directly
+        host: Where the default collectors read from; the live system under
+            config.host.root when not given (replays pass recorded data)
+    """
+
+    def __init__(
+        self,
+        config: Config = None,
+        speedtest: Optional[SpeedtestManager] = None,
+        collectors: Optional[dict[str, BaseCollector]] = None,
+        host: Optional[HostSource] = None,
+    ):
         self._config = config or get_config()
+        self._speedtest = speedtest
+        self._host = host or HostSource(self._config.host.root)
+        collectors = collectors or {}
 
         # Initialize collectors
-        self._cpu = CPUCollector()
-        self._memory = MemoryCollector()
-        self._disk = DiskCollector()
-        self._network = NetworkCollector()
-        self._sensors = SensorsCollector()
-        self._overview = OverviewCollector()
-        self._tailscale = TailscaleCollector(
-            cache_ttl=self._config.cache.tailscale_cache_ttl
+        host = self._host
+        self._cpu = collectors.get("cpu") or CPUCollector(
+            proc_stat=host.path("/proc/stat"),
+            cpufreq=host.path("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"),
+            clock=host.clock,
+        )
+        self._memory = collectors.get("memory") or MemoryCollector(
+            meminfo=host.path("/proc/meminfo")
+        )
+        self._disk = collectors.get("disk") or DiskCollector(
+            usage=DiskUsage(
+                MountTable(host.path("/proc/self/mountinfo")), statvfs=host.statvfs
+            ),
+            io=DiskIO(
+                diskstats=host.path("/proc/diskstats"),
+                sys_block=host.path("/sys/block"),
+                clock=host.clock,
+            ),
+        )
+        self._network = collectors.get("network") or NetworkCollector(
+            include=self._config.network.include,
+            exclude=self._config.network.exclude,
+            aggregate_virtual=self._config.network.aggregate_virtual,
+            net_dev=host.path("/proc/net/dev"),
+            sys_class_net=host.path("/sys/class/net"),
+            sys_virtual_net=host.path("/sys/devices/virtual/net"),
+            clock=host.clock,
+        )
+        self._sensors = collectors.get("sensors") or SensorsCollector(
+            thermal_root=host.path("/sys/class/thermal"),
+            hwmon_root=host.path("/sys/class/hwmon"),
+            throttled_globs=tuple(host.path(g) for g in THROTTLED_GLOBS),
+            clock=host.clock,
+            host=host,
+        )
+        self._overview = collectors.get("overview") or OverviewCollector(host=host)
+        self._load = collectors.get("load") or LoadCollector(
+            uptime=host.path("/proc/uptime"),
+            loadavg=host.path("/proc/loadavg"),
+        )
+        tailscale = cast(Optional[TailscaleCollector], collectors.get("tailscale"))
+        self._tailscale = tailscale or TailscaleCollector(
+            cache_ttl=self._config.cache.tailscale_cache_ttl,
+            socket_path=self._config.tailscale.socket,
+            peer_interval=self._config.tailscale.peer_interval_sec,
+            ping_peers=self._config.tailscale.ping_peers,
+            clock=host.clock,
+            host=host,
+        )
+        process = cast(Optional[ProcessCollector], collectors.get("processes"))
+        self._process = process or ProcessCollector(
+            scanner=ProcessScanner(
+                host.path("/proc"),
+                cpu_count=host.cpu_count,
+                clock_ticks=host.clock_ticks,
+                page_size=host.page_size,
+                clock=host.clock,
+                owner=host.owner,
+            )
+        )
+        self._docker = collectors.get("docker") or DockerCollector(
+            socket_path=self._config.docker.socket,
+            proc_root=host.path("/proc"),
+            cgroup_root=host.path("/sys/fs/cgroup"),
+            cpu_count=host.cpu_count,
+            clock=host.clock,
         )
 
-        # Process collector has its own cache
-        self._process_cache = TTLCache[list[dict[str, Any]]](
-            ttl=self._config.cache.process_list_ttl
+        # Collectors run concurrently, each bounded by a deadline, and
+        # only when their own refresh interval has elapsed
+        self._pool = CollectorPool(
+            max_workers=self._config.sampler.collector_workers,
+            deadline=self._config.sampler.collector_deadline_sec,
+        )
+        self._scheduler = CollectorScheduler(
+            self._pool,
+            [
+                self._schedule("overview", self._overview),
+                self._schedule("load", self._load),
+                self._schedule("cpu", self._cpu),
+                self._schedule("memory", self._memory),
+                self._schedule("disk", self._disk),
+                self._schedule("network", self._network),
+                self._schedule("sensors", self._sensors),
+                self._schedule(
+                    "processes",
+                    self._process,
+                    interval=self._config.cache.process_list_ttl,
+                    default=[],
+                ),
+                self._schedule("docker", self._docker),
+                self._schedule(
+                    "tailscale",
+                    self._tailscale,
+                    interval=self._config.cache.tailscale_cache_ttl,
+                ),
+            ],
+            tick=self._config.sampler.interval_sec,
+            clock=self._host.clock,
         )
 
-        # Main stats cache
-        self._stats_cache = TTLCache[dict[str, Any]](
-            ttl=self._config.cache.system_stats_ttl
+        # Background sampler publishing immutable snapshots
+        self._sampler = Sampler(
+            self._collect_all_stats, interval=self._config.sampler.interval_sec
         )
 
+        # Distinguishes sequence numbers across restarts in ETags, bodies
+        # and stream event ids
+        self._generation = secrets.token_hex(4)
+
+        # Recent snapshots for delta responses
+        self._snapshot_log = SnapshotLog()
+        self._sampler.subscribe(self._snapshot_log.record)
+
+        # Fallback cache used when the sampler thread is not running
+        self._stats_cache = TTLCache[Snapshot](ttl=self._config.cache.system_stats_ttl)
+
+    @property
+    def sampler(self) -> Sampler:
+        """The background sampler feeding this handler."""
+        return self._sampler
+
+    @property
+    def tailscale_collector(self) -> TailscaleCollector:
+        """The Tailscale collector, shared with /api/tailscale-ip."""
+        return self._tailscale
+
+    @property
+    def process_scanner(self) -> ProcessScanner:
+        """The scanner holding the full process table of the latest sample."""
+        return self._process.scanner
+
+    def start(self) -> None:
+        """Start background sampling if enabled in config."""
+        if self._config.sampler.enabled:
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop background sampling."""
+        self._sampler.stop(timeout=5.0)
+        self._pool.close()
+        self._sensors.close()
+        self._tailscale.close()
+        self._docker.close()
+
+    def get_snapshot(self) -> Snapshot:
+        """Get the latest published snapshot.
+
+        Returns immediately when the sampler is running; otherwise collects
+        inline, rate-limited by the stats cache TTL.
+        """
+        snapshot = self._sampler.latest
+        if snapshot is not None and self._sampler.running:
+            return snapshot
+        return self._stats_cache.get_or_compute(self._sampler.sample_now)
+
     def get_stats(self) -> dict[str, Any]:
         """Get complete system statistics.
 
-        Uses caching to reduce system call overhead.
+        The returned dict is shared between requests and must not be mutated.
         """
-        return self._stats_cache.get_or_compute(self._collect_all_stats)
+        return self.get_snapshot().data
 
-    def _collect_all_stats(self) -> dict[str, Any]:
-        """Collect all statistics."""
-        # Get process list with its own TTL
-        processes = self._process_cache.get_or_compute(
-            lambda: self._process_collector.collect(),
-            ttl=self._config.cache.process_list_ttl,
+    @property
+    def generation(self) -> str:
+        """Random tag telling this process's sequence numbers from a previous run's."""
+        return self._generation
+
+    def etag(
+        self, snapshot: Snapshot, since: Optional[int] = None, generation: Optional[str] = None
+    ) -> str:
+        """Strong ETag for the response built from snapshot (and since, generation)."""
+        if since is None:
+            return f'"{self._generation}-{snapshot.seq}"'
+        if generation is not None and generation != self._generation:
+            return f'"{self._generation}-{snapshot.seq}-full"'
+        return f'"{self._generation}-{snapshot.seq}-{since}"'
+
+    def get_payload(self, snapshot: Optional[Snapshot] = None) -> dict[str, Any]:
+        """Get the full stats response body, tagged with its sequence number."""
+        snapshot = snapshot or self.get_snapshot()
+        return {**snapshot.data, "seq": snapshot.seq, "generation": self._generation}
+
+    def get_delta(
+        self,
+        since: int,
+        snapshot: Optional[Snapshot] = None,
+        generation: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Get the changes since snapshot `since`.
+
+        Args:
+            since: Sequence number of the snapshot the client holds
+            snapshot: Snapshot to diff against (default: the latest)
+            generation: Generation `since` was issued by; one from another
+                run gets the full body. None trusts `since` as ours.
+
+        Returns:
+            A delta body from SnapshotLog.delta plus "generation", or
+            {"seq": int, "generation": str, "full": True, "data": dict}
+            when the client is too far behind for a delta.
+        """
+        snapshot = snapshot or self.get_snapshot()
+        delta = None
+        if generation is None or generation == self._generation:
+            delta = self._snapshot_log.delta(since, snapshot)
+        if delta is None:
+            return {
+                "seq": snapshot.seq,
+                "generation": self._generation,
+                "full": True,
+                "data": snapshot.data,
+            }
+        return {**delta, "generation": self._generation}
+
+    def _schedule(
+        self,
+        name: str,
+        collector: BaseCollector,
+        interval: Optional[float] = None,
+        default: Any = None,
+    ) -> ScheduledCollector:
+        """Describe a snapshot section, applying config interval overrides."""
+        if interval is None:
+            interval = collector.interval
+        interval = self._config.sampler.collector_intervals.get(name, interval)
+        return ScheduledCollector(
+            name,
+            collector.collect,
+            interval=interval,
+            cost=collector.cost,
+            default={} if default is None else default,
         )
 
-        return {
-            "overview": self._overview.collect(),
-            "cpu": self._cpu.collect(),
-            "memory": self._memory.collect(),
-            "disk": self._disk.collect(),
-            "network": self._network.collect(),
-            "sensors": self._sensors.collect(),
-            "processes": processes[:10],
-            "tailscale": self._tailscale.collect(),
-        }
+    def _collect_all_stats(self) -> dict[str, Any]:
+        """Collect all statistics.
 
-    @property
-    def _process_collector(self) -> ProcessCollector:
-        """Lazy process collector."""
-        if not hasattr(self, "_process_collector_instance"):
-            self._process_collector_instance = ProcessCollector()
-        return self._process_collector_instance
+        Only collectors whose refresh interval has elapsed run, concurrently;
+        every other section reuses that collector's freshest value. Any that
+        miss their deadline or fail contribute their last good value and
+        are listed under "stale".
+        """
+        values, stale = self._scheduler.run()
+        stats = {**values, "stale": stale}
+
+        # Uptime and load refresh every tick; the rest of the overview rarely
+        stats["overview"] = {**stats["overview"], **stats.pop("load")}
+
+        # Add speedtest data to network stats; collector values may be
+        # reused by later snapshots, so extend a copy
+        if self._speedtest:
+            speedtest_status = self._speedtest.get_status()
+            stats["network"] = {
+                **stats["network"],
+                "speedtest": speedtest_status,
+                "ping_ms": speedtest_status.get("ping_ms"),
+            }
+
+        # The overview card shows container counts when Docker is reachable
+        docker = stats.get("docker") or {}
+        if docker.get("available"):
+            stats["overview"] = {
+                **stats["overview"],
+                "docker": {"running": docker["running"], "stopped": docker["stopped"]},
+            }
+
+        return stats
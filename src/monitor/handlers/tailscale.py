@@ -1,6 +1,6 @@
 """Tailscale info handler."""
 
-from typing import Any
+from typing import Any, Optional
 
 from monitor.collectors import TailscaleCollector
 from monitor.config import get_config
@@ -9,19 +9,28 @@ from monitor.config import get_config
 class TailscaleHandler:
     """Handler for Tailscale info endpoint."""
 
-    def __init__(self):
-        config = get_config()
-        self._collector = TailscaleCollector(
-            cache_ttl=config.cache.tailscale_cache_ttl
-        )
+    def __init__(self, collector: Optional[TailscaleCollector] = None):
+        if collector is None:
+            config = get_config()
+            collector = TailscaleCollector(
+                cache_ttl=config.cache.tailscale_cache_ttl,
+                socket_path=config.tailscale.socket,
+                peer_interval=config.tailscale.peer_interval_sec,
+                ping_peers=config.tailscale.ping_peers,
+            )
+        self._collector = collector
 
     def get_info(self) -> dict[str, Any]:
         """Get Tailscale connection info.
 
         Returns:
+            TailscaleCollector.collect() output:
             {
                 "tailscale_connected": bool,
                 "tailscale_ip": str,
+                "source": str or None,
+                "peers": dict or None,
+                "latency_ms": dict,
             }
         """
         return self._collector.collect()
@@ -0,0 +1,166 @@
+"""Server-side metric history.
+
+Keeps recent numeric samples in a fixed-capacity ring buffer backed by
+typed arrays, so memory use is bounded and independent of payload shape.
+"""
+
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from monitor.sampler import Snapshot
+
+# Dotted paths into the system stats payload that are recorded
+HISTORY_METRICS: tuple[str, ...] = (
+    "cpu.percent",
+    "cpu.freq",
+    "memory.percent",
+    "memory.used_gb",
+    "memory.swap_percent",
+    "disk.percent",
+    "disk.used_gb",
+    "disk.read_mb_s",
+    "disk.write_mb_s",
+    "network.rx_mb_s",
+    "network.tx_mb_s",
+    "sensors.temp",
+    "sensors.voltage",
+)
+
+
+def extract_metric(data: dict[str, Any], path: str) -> float:
+    """Read a numeric leaf from a stats payload by dotted path.
+
+    Returns NaN when the value is missing or not numeric.
+    """
+    value: Any = data
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return math.nan
+        value = value.get(part)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+class MetricHistory:
+    """Thread-safe ring buffer of timestamped metric samples.
+
+    Timestamps are stored as float64 and values as float32 ("f" arrays),
+    one array per metric. Missing values are stored as NaN.
+    """
+
+    def __init__(self, capacity: int, metrics: Iterable[str] = HISTORY_METRICS):
+        if capacity < 1:
+            raise ValueError(f"Invalid history capacity: {capacity}")
+        self._metrics = tuple(metrics)
+        self._index = {name: i for i, name in enumerate(self._metrics)}
+        self._capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = [array("f", bytes(4 * capacity)) for _ in self._metrics]
+        self._head = 0  # Next write position
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_window(
+        cls, window_sec: float, interval_sec: float, metrics: Iterable[str] = HISTORY_METRICS
+    ) -> "MetricHistory":
+        """Create a history sized to hold window_sec of samples."""
+        return cls(max(1, math.ceil(window_sec / interval_sec)), metrics)
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Names of recorded metrics."""
+        return self._metrics
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples kept."""
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def nbytes(self) -> int:
+        """Bytes used by sample storage."""
+        return self._timestamps.itemsize * self._capacity + sum(
+            v.itemsize * self._capacity for v in self._values
+        )
+
+    def oldest(self) -> Optional[float]:
+        """Timestamp of the oldest sample held, or None if empty."""
+        with self._lock:
+            if not self._size:
+                return None
+            return self._timestamps[(self._head - self._size) % self._capacity]
+
+    def append(self, timestamp: float, values: Iterable[float]) -> None:
+        """Append one sample; values are ordered like `metrics`."""
+        with self._lock:
+            pos = self._head
+            if self._size and timestamp < self._timestamps[(pos - 1) % self._capacity]:
+                return  # Keep the buffer sorted; ignore out-of-order samples
+            self._timestamps[pos] = timestamp
+            for column, value in zip(self._values, values):
+                column[pos] = value
+            self._head = (pos + 1) % self._capacity
+            if self._size < self._capacity:
+                self._size += 1
+
+    def record(self, snapshot: Snapshot) -> None:
+        """Append the numeric fields of a sampler snapshot."""
+        self.append(
+            snapshot.timestamp,
+            [extract_metric(snapshot.data, path) for path in self._metrics],
+        )
+
+    def query(
+        self,
+        metrics: Optional[Iterable[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Return samples with start <= timestamp <= end.
+
+        Args:
+            metrics: Metric names to include (default: all)
+            start: Earliest timestamp (inclusive)
+            end: Latest timestamp (inclusive)
+
+        Returns:
+            {
+                "timestamps": [float, ...],
+                "metrics": {name: [float or None, ...]},
+            }
+
+        Raises:
+            KeyError: If an unknown metric is requested
+        """
+        names = tuple(metrics) if metrics is not None else self._metrics
+        columns = [self._index[name] for name in names]
+
+        with self._lock:
+            timestamps = self._ordered(self._timestamps)
+            lo = bisect_left(timestamps, start) if start is not None else 0
+            hi = bisect_right(timestamps, end) if end is not None else len(timestamps)
+            result = {
+                "timestamps": timestamps[lo:hi].tolist(),
+                "metrics": {
+                    name: [
+                        None if math.isnan(v) else round(v, 3)
+                        for v in self._ordered(self._values[col])[lo:hi]
+                    ]
+                    for name, col in zip(names, columns)
+                },
+            }
+        return result
+
+    def _ordered(self, column: array) -> array:
+        """Return a column's live samples oldest-first (caller holds lock)."""
+        if self._size < self._capacity:
+            return column[: self._size]
+        return column[self._head :] + column[: self._head]
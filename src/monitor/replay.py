@@ -0,0 +1,142 @@
+"""Record host inputs and replay them through the sampling pipeline.
+
+Recording samples the live system at a fixed interval, storing the
+procfs/sysfs files, command outputs and statvfs results the collectors
+used (see monitor.collectors.host). Replaying feeds a recording into a
+SystemStatsHandler frame by frame on the recorded clock, so the same
+recording always produces the same snapshots and the pipeline can be
+profiled on a busy host's load from anywhere.
+
+Usage:
+    python -m monitor.replay record busy-pi.jsonl.gz --frames 300 --interval 2
+    python -m monitor.replay replay busy-pi.jsonl.gz --snapshots out.jsonl --profile
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import replace
+from typing import Any, Optional
+
+from monitor.collectors.host import ArchiveWriter, RecordingHost, ReplayHost, capture
+from monitor.config import Config, get_config
+from monitor.handlers.system import SystemStatsHandler
+from monitor.sampler import Snapshot
+
+
+def record(path: str, frames: int, interval: float, root: str = "/") -> None:
+    """Sample the host at root every interval seconds into an archive at path."""
+    host = RecordingHost(root)
+    handler = SystemStatsHandler(_record_config(get_config(), interval), host=host)
+    writer = ArchiveWriter(path, {**host.header(), "interval": interval})
+    start = host.clock()
+    try:
+        for i in range(frames):
+            now = start if i == 0 else host.clock()
+            files, dirs = capture(root)
+            handler.sampler.sample_now()
+            writer.write_frame(now - start, files, dirs, host.take_calls())
+            if i + 1 < frames:
+                time.sleep(max(0.0, start + (i + 1) * interval - host.clock()))
+    finally:
+        writer.close()
+        handler.stop()
+
+
+def replay(path: str, workdir: Optional[str] = None) -> Iterator[tuple[Snapshot, float]]:
+    """Replay a recording, yielding each snapshot and the seconds it took to build."""
+    host = ReplayHost(path, workdir or tempfile.mkdtemp(prefix="monitor-replay-"))
+    handler = SystemStatsHandler(_replay_config(host), host=host)
+    try:
+        while host.advance():
+            t0 = time.perf_counter()
+            snapshot = handler.sampler.sample_now()
+            yield snapshot, time.perf_counter() - t0
+    finally:
+        handler.stop()
+        host.close()
+
+
+def _record_config(config: Config, interval: float) -> Config:
+    return replace(
+        config,
+        sampler=replace(config.sampler, enabled=False, interval_sec=interval),
+        speedtest=replace(config.speedtest, enabled=False),
+    )
+
+
+def _replay_config(host: ReplayHost) -> Config:
+    """Recorded cadence, no deadlines, and no live sockets."""
+    config = get_config()
+    return replace(
+        config,
+        sampler=replace(
+            config.sampler,
+            enabled=False,
+            interval_sec=host.header["interval"],
+            collector_deadline_sec=3600.0,
+        ),
+        tailscale=replace(config.tailscale, socket=host.path("/none/tailscaled.sock")),
+        docker=replace(config.docker, socket=host.path("/none/docker.sock")),
+        speedtest=replace(config.speedtest, enabled=False),
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Record the live host")
+    rec.add_argument("archive")
+    rec.add_argument("--frames", type=int, default=150)
+    rec.add_argument("--interval", type=float, default=2.0)
+    rec.add_argument("--root", default="/", help="Directory holding the host's proc/ and sys/")
+
+    rep = commands.add_parser("replay", help="Replay a recording through the sampler")
+    rep.add_argument("archive")
+    rep.add_argument("--snapshots", help="Write each snapshot as a JSON line to this file")
+    rep.add_argument("--profile", action="store_true", help="Print a cProfile summary")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.archive, args.frames, args.interval, args.root)
+        return 0
+
+    out = open(args.snapshots, "w") if args.snapshots else None
+    profiler = cProfile.Profile() if args.profile else None
+    timings: list[float] = []
+    try:
+        if profiler is not None:
+            profiler.enable()
+        for snapshot, seconds in replay(args.archive):
+            timings.append(seconds * 1000)
+            if out is not None:
+                out.write(json.dumps(snapshot.data, sort_keys=True) + "\n")
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if out is not None:
+            out.close()
+
+    summary: dict[str, Any] = {"frames": len(timings)}
+    if timings:
+        timings.sort()
+        summary.update(
+            mean_ms=round(statistics.fmean(timings), 2),
+            p95_ms=round(timings[int(len(timings) * 0.95)], 2),
+            max_ms=round(timings[-1], 2),
+        )
+    print(json.dumps(summary, indent=2))
+    if profiler is not None:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Cache of encoded response bodies.
+
+Bodies derived from a snapshot are serialized (and gzip-compressed) at
+most once per snapshot, no matter how many clients request them.
+"""
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+
+
+def encode_json(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether an Accept-Encoding header allows gzip.
+
+    An explicit gzip entry takes precedence over the "*" wildcard.
+    """
+    if not accept_encoding:
+        return False
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        params = params.strip().replace(" ", "")
+        try:
+            weights[coding] = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weights[coding] = 0.0
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+
+class _Entry:
+    """Encoded variants of one response body."""
+
+    __slots__ = ("identity", "gzip")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self.gzip: Optional[bytes] = None
+
+
+class ResponseCache:
+    """Encoded bodies keyed by ETag, cleared whenever a snapshot is published."""
+
+    def __init__(self, max_entries: int = 16, compresslevel: int = 6):
+        self._max_entries = max_entries
+        self._compresslevel = compresslevel
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, *args: Any) -> None:
+        """Drop all cached bodies; usable directly as a sampler listener."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(
+        self, key: str, build: Callable[[], Any], gzip_ok: bool = False
+    ) -> tuple[bytes, Optional[str]]:
+        """Return (body, content_encoding) for key, encoding on first use.
+
+        Args:
+            key: Cache key; must change whenever the body would change
+            build: Returns the JSON-serializable object for a miss
+            gzip_ok: Whether the client accepts gzip
+
+        Returns:
+            The body and "gzip" or None for identity encoding
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = _Entry(encode_json(build()))
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+
+        if not gzip_ok or len(entry.identity) < GZIP_MIN_SIZE:
+            return entry.identity, None
+        if entry.gzip is None:
+            # Concurrent misses may both compress; the results are identical
+            entry.gzip = gzip.compress(entry.identity, self._compresslevel, mtime=0)
+        return entry.gzip, "gzip"
@@ -0,0 +1,363 @@
+"""Multi-resolution metric rollups.
+
+Aggregates the sample stream into fixed-width buckets (min/max/avg/last)
+at coarser resolutions than the raw history, so long-range queries read
+a few hundred buckets instead of scanning raw samples.
+"""
+
+import logging
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from monitor.history import MetricHistory, extract_metric
+from monitor.sampler import Snapshot
+
+logger = logging.getLogger(__name__)
+
+_AGGREGATES = ("min", "max", "avg", "last")
+
+
+@dataclass(frozen=True)
+class TierSpec:
+    """Resolution and retention of one rollup tier."""
+
+    name: str
+    resolution_sec: float
+    window_sec: float
+
+
+DEFAULT_TIERS: tuple[TierSpec, ...] = (
+    TierSpec("1m", 60.0, 86400.0),
+    TierSpec("1h", 3600.0, 30 * 86400.0),
+)
+
+
+class RollupTier:
+    """Ring buffer of closed buckets plus one open accumulating bucket."""
+
+    def __init__(self, spec: TierSpec, n_metrics: int):
+        self.spec = spec
+        self._capacity = max(1, math.ceil(spec.window_sec / spec.resolution_sec))
+        self._n = n_metrics
+        self._starts = array("d", bytes(8 * self._capacity))
+        self._columns = {
+            agg: [array("f", bytes(4 * self._capacity)) for _ in range(n_metrics)]
+            for agg in _AGGREGATES
+        }
+        self._head = 0
+        self._size = 0
+
+        self._open_start: Optional[float] = None
+        self._acc_min = [math.inf] * n_metrics
+        self._acc_max = [-math.inf] * n_metrics
+        self._acc_sum = [0.0] * n_metrics
+        self._acc_count = [0] * n_metrics
+        self._acc_last = [math.nan] * n_metrics
+
+    @property
+    def resolution(self) -> float:
+        """Bucket width in seconds."""
+        return self.spec.resolution_sec
+
+    def nbytes(self) -> int:
+        """Bytes used by closed-bucket storage."""
+        return self._capacity * (8 + 4 * self._n * len(_AGGREGATES))
+
+    def oldest(self) -> Optional[float]:
+        """Start of the oldest bucket held, or None if empty."""
+        if self._size:
+            return self._starts[(self._head - self._size) % self._capacity]
+        return self._open_start
+
+    def add(self, timestamp: float, values: Iterable[float]) -> None:
+        """Fold one sample into the open bucket, closing it when time moves on."""
+        bucket = timestamp - timestamp % self.spec.resolution_sec
+        if self._open_start is None:
+            self._open_start = bucket
+        elif bucket > self._open_start:
+            self._close(self._open_start)
+            self._open_start = bucket
+        elif bucket < self._open_start:
+            return  # Late sample for an already closed bucket
+
+        for i, value in enumerate(values):
+            if value != value:  # NaN
+                continue
+            if value < self._acc_min[i]:
+                self._acc_min[i] = value
+            if value > self._acc_max[i]:
+                self._acc_max[i] = value
+            self._acc_sum[i] += value
+            self._acc_count[i] += 1
+            self._acc_last[i] = value
+
+    def _close(self, start: float) -> None:
+        """Move the open bucket into the ring buffer and reset accumulators."""
+        pos = self._head
+        self._starts[pos] = start
+        for i in range(self._n):
+            count = self._acc_count[i]
+            if count:
+                self._columns["min"][i][pos] = self._acc_min[i]
+                self._columns["max"][i][pos] = self._acc_max[i]
+                self._columns["avg"][i][pos] = self._acc_sum[i] / count
+                self._columns["last"][i][pos] = self._acc_last[i]
+            else:
+                for agg in _AGGREGATES:
+                    self._columns[agg][i][pos] = math.nan
+        self._head = (pos + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+        n = self._n
+        self._acc_min = [math.inf] * n
+        self._acc_max = [-math.inf] * n
+        self._acc_sum = [0.0] * n
+        self._acc_count = [0] * n
+        self._acc_last = [math.nan] * n
+
+    def _ordered(self, column: array) -> array:
+        """Return a column's closed buckets oldest-first."""
+        if self._size < self._capacity:
+            return column[: self._size]
+        return column[self._head :] + column[: self._head]
+
+    def query(
+        self, columns: list[int], start: float, end: float
+    ) -> tuple[list[float], dict[int, dict[str, list[float]]]]:
+        """Return buckets overlapping [start, end], including the open bucket."""
+        starts = self._ordered(self._starts)
+        lo = bisect_left(starts, start - self.spec.resolution_sec + 1e-9)
+        hi = bisect_right(starts, end)
+        timestamps = starts[lo:hi].tolist()
+        data = {
+            col: {
+                agg: self._ordered(self._columns[agg][col])[lo:hi].tolist() for agg in _AGGREGATES
+            }
+            for col in columns
+        }
+
+        if (
+            self._open_start is not None
+            and start - self.spec.resolution_sec < self._open_start <= end
+        ):
+            timestamps.append(self._open_start)
+            for col in columns:
+                count = self._acc_count[col]
+                agg_values = data[col]
+                if count:
+                    agg_values["min"].append(self._acc_min[col])
+                    agg_values["max"].append(self._acc_max[col])
+                    agg_values["avg"].append(self._acc_sum[col] / count)
+                    agg_values["last"].append(self._acc_last[col])
+                else:
+                    for agg in _AGGREGATES:
+                        agg_values[agg].append(math.nan)
+        return timestamps, data
+
+
+class RollupEngine:
+    """Feeds rollup tiers from the sample stream and answers range queries.
+
+    The raw MetricHistory acts as the finest tier; queries pick the
+    coarsest tier that still resolves the requested point count and
+    covers the requested range.
+    """
+
+    def __init__(
+        self,
+        raw: MetricHistory,
+        raw_resolution_sec: float,
+        tiers: Iterable[TierSpec] = DEFAULT_TIERS,
+    ):
+        self._raw = raw
+        self._raw_resolution = raw_resolution_sec
+        self._metrics = raw.metrics
+        self._index = {name: i for i, name in enumerate(self._metrics)}
+        self._tiers = [RollupTier(spec, len(self._metrics)) for spec in tiers]
+        self._lock = threading.Lock()
+        self._loading = False
+        self._pending: list[tuple[float, list[float]]] = []
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Names of aggregated metrics."""
+        return self._metrics
+
+    def nbytes(self) -> int:
+        """Bytes used by closed-bucket storage across tiers."""
+        return sum(tier.nbytes() for tier in self._tiers)
+
+    def append(self, timestamp: float, values: Iterable[float]) -> None:
+        """Fold one sample into every tier."""
+        values = list(values)
+        with self._lock:
+            if self._loading:
+                self._pending.append((timestamp, values))
+                return
+            for tier in self._tiers:
+                tier.add(timestamp, values)
+
+    def record(self, snapshot: Snapshot) -> None:
+        """Fold the numeric fields of a sampler snapshot into every tier."""
+        self.append(snapshot.timestamp, [extract_metric(snapshot.data, m) for m in self._metrics])
+
+    def start_backfill(self, records: Iterable[tuple[float, ...]]) -> threading.Thread:
+        """Replay stored (timestamp, *values) records in a background thread.
+
+        Live samples arriving meanwhile are queued and applied afterwards,
+        so tiers always see samples in time order.
+        """
+        with self._lock:
+            self._loading = True
+
+        def run() -> None:
+            started = time.monotonic()
+            count = 0
+            try:
+                for record in records:
+                    with self._lock:
+                        for tier in self._tiers:
+                            tier.add(record[0], record[1:])
+                    count += 1
+            except Exception:
+                logger.exception("Rollup backfill failed")
+            finally:
+                with self._lock:
+                    for timestamp, values in self._pending:
+                        for tier in self._tiers:
+                            tier.add(timestamp, values)
+                    self._pending = []
+                    self._loading = False
+            logger.info("Rollup backfill: %d samples in %.1fs", count, time.monotonic() - started)
+
+        thread = threading.Thread(target=run, name="monitor-rollup-backfill", daemon=True)
+        thread.start()
+        return thread
+
+    def select_tier(self, start: float, end: float, points: int) -> tuple[str, float]:
+        """Pick (tier name, resolution) for a query.
+
+        Chooses the coarsest tier whose resolution still yields `points`
+        over the range and which holds data back to `start`. If no such
+        tier covers the range, the finest tier that does is used.
+        """
+        target = (end - start) / max(1, points)
+        candidates: list[tuple[str, float, Optional[float]]] = [
+            ("raw", self._raw_resolution, self._raw.oldest())
+        ]
+        with self._lock:
+            candidates += [(t.spec.name, t.resolution, t.oldest()) for t in self._tiers]
+
+        def covers(resolution: float, oldest: Optional[float]) -> bool:
+            return oldest is not None and oldest <= start + resolution
+
+        fine_enough = [c for c in candidates if c[1] <= target and covers(c[1], c[2])]
+        if fine_enough:
+            name, resolution, _ = max(fine_enough, key=lambda c: c[1])
+            return name, resolution
+        covering = [c for c in candidates if covers(c[1], c[2])]
+        if covering:
+            name, resolution, _ = min(covering, key=lambda c: c[1])
+            return name, resolution
+        # Nothing reaches back to start: use the tier with the longest reach
+        name, resolution, _ = max(candidates, key=lambda c: c[1] if c[2] is not None else -1)
+        return name, resolution
+
+    def query(
+        self,
+        metrics: Optional[Iterable[str]],
+        start: float,
+        end: float,
+        points: int,
+    ) -> dict[str, Any]:
+        """Return at most `points` aggregated buckets per metric.
+
+        Returns:
+            {
+                "tier": str,           # "raw", "1m", "1h", ...
+                "resolution": float,   # Seconds per returned point
+                "timestamps": [float, ...],
+                "metrics": {name: {"min": [...], "max": [...], "avg": [...], "last": [...]}},
+            }
+
+        Raises:
+            KeyError: If an unknown metric is requested
+        """
+        names = tuple(metrics) if metrics is not None else self._metrics
+        columns = [self._index[name] for name in names]
+        tier_name, resolution = self.select_tier(start, end, points)
+
+        if tier_name == "raw":
+            raw = self._raw.query(names, start=start, end=end)
+            timestamps = raw["timestamps"]
+            data = {}
+            for name, col in zip(names, columns):
+                values = [math.nan if v is None else v for v in raw["metrics"][name]]
+                data[col] = dict.fromkeys(_AGGREGATES, values)
+        else:
+            tier = next(t for t in self._tiers if t.spec.name == tier_name)
+            with self._lock:
+                timestamps, data = tier.query(columns, start, end)
+
+        step = (end - start) / max(1, points)
+        if len(timestamps) > points and step > resolution:
+            timestamps, data = _merge(timestamps, data, start, step)
+            resolution = step
+
+        return {
+            "tier": tier_name,
+            "resolution": resolution,
+            "timestamps": timestamps,
+            "metrics": {
+                name: {
+                    agg: [None if v != v else round(v, 3) for v in data[col][agg]]
+                    for agg in _AGGREGATES
+                }
+                for name, col in zip(names, columns)
+            },
+        }
+
+
+def _merge(
+    timestamps: list[float],
+    data: dict[int, dict[str, list[float]]],
+    start: float,
+    step: float,
+) -> tuple[list[float], dict[int, dict[str, list[float]]]]:
+    """Combine consecutive buckets into `step`-wide groups."""
+    groups: list[tuple[int, int]] = []
+    group_start = 0
+    current = math.floor((timestamps[0] - start) / step)
+    for i in range(1, len(timestamps)):
+        key = math.floor((timestamps[i] - start) / step)
+        if key != current:
+            groups.append((group_start, i))
+            group_start = i
+            current = key
+    groups.append((group_start, len(timestamps)))
+
+    merged_ts = [start + math.floor((timestamps[lo] - start) / step) * step for lo, _ in groups]
+    merged: dict[int, dict[str, list[float]]] = {}
+    for col, aggs in data.items():
+        out: dict[str, list[float]] = {agg: [] for agg in _AGGREGATES}
+        for lo, hi in groups:
+            mins = [v for v in aggs["min"][lo:hi] if v == v]
+            if not mins:
+                for agg in _AGGREGATES:
+                    out[agg].append(math.nan)
+                continue
+            avgs = [v for v in aggs["avg"][lo:hi] if v == v]
+            lasts = [v for v in aggs["last"][lo:hi] if v == v]
+            out["min"].append(min(mins))
+            out["max"].append(max(v for v in aggs["max"][lo:hi] if v == v))
+            out["avg"].append(sum(avgs) / len(avgs))
+            out["last"].append(lasts[-1])
+        merged[col] = out
+    return merged_ts, merged
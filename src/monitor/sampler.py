@@ -0,0 +1,123 @@
+"""Background metric sampler.
+
+Runs the collectors on a fixed cadence in a daemon thread and publishes
+each result as an immutable snapshot, so HTTP requests never wait on
+collector cost.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A published set of metrics.
+
+    The data dict is built fresh for every sample and is never mutated
+    after publication; consumers must treat it as read-only.
+    """
+
+    seq: int
+    timestamp: float
+    data: dict[str, Any]
+
+
+class Sampler:
+    """Periodically runs a collect function and publishes snapshots."""
+
+    def __init__(
+        self,
+        collect: Callable[[], dict[str, Any]],
+        interval: float = 2.0,
+        name: str = "monitor-sampler",
+    ):
+        self._collect = collect
+        self._interval = interval
+        self._name = name
+        self._latest: Optional[Snapshot] = None
+        self._seq = 0
+        self._sample_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: list[Callable[[Snapshot], None]] = []
+
+    @property
+    def interval(self) -> float:
+        """Sampling interval in seconds."""
+        return self._interval
+
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        """Most recently published snapshot, or None before the first sample."""
+        return self._latest
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, listener: Callable[[Snapshot], None]) -> None:
+        """Register a callback invoked with every newly published snapshot.
+
+        Listeners run on the sampling thread and should return quickly.
+        """
+        with self._sample_lock:
+            self._listeners.append(listener)
+
+    def sample_now(self) -> Snapshot:
+        """Run one collection cycle synchronously and publish the result.
+
+        If the collect function raises, the previous snapshot is kept.
+        """
+        with self._sample_lock:
+            try:
+                data = self._collect()
+            except Exception:
+                logger.exception("Sampler %s: collection failed", self._name)
+                if self._latest is not None:
+                    return self._latest
+                data = {}
+
+            self._seq += 1
+            snapshot = Snapshot(seq=self._seq, timestamp=time.time(), data=data)
+            # Single reference assignment: readers never see a partial snapshot
+            self._latest = snapshot
+
+            for listener in self._listeners:
+                try:
+                    listener(snapshot)
+                except Exception:
+                    logger.exception("Sampler %s: listener failed", self._name)
+            return snapshot
+
+    def start(self) -> None:
+        """Take an initial sample and start the background thread."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.sample_now()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Sampling loop with a fixed cadence based on the monotonic clock."""
+        next_run = time.monotonic() + self._interval
+        while not self._stop_event.wait(max(0.0, next_run - time.monotonic())):
+            self.sample_now()
+            next_run += self._interval
+            now = time.monotonic()
+            if next_run < now:
+                # Collection overran; skip missed ticks instead of bursting
+                next_run = now + self._interval
@@ -0,0 +1,116 @@
+"""Per-collector refresh scheduling.
+
+Each sampler tick, only the collectors whose interval has elapsed are
+run; every other section of the snapshot reuses that collector's
+freshest value. Heavy collectors that fall due together are staggered
+across ticks so their subprocesses don't all land at once.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from monitor.collector_pool import CollectorPool
+
+logger = logging.getLogger(__name__)
+
+COST_CLASSES = ("light", "heavy")
+
+
+@dataclass
+class ScheduledCollector:
+    """A snapshot section and how often to refresh it."""
+
+    name: str
+    collect: Callable[[], Any]
+    interval: float = 0.0
+    cost: str = "light"
+    # Value used until the first successful refresh
+    default: Any = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.interval < 0:
+            raise ValueError(f"Invalid interval for {self.name}: {self.interval}")
+        if self.cost not in COST_CLASSES:
+            raise ValueError(f"Invalid cost class for {self.name}: {self.cost!r}")
+
+
+class CollectorScheduler:
+    """Runs due collectors and assembles the freshest value of each."""
+
+    def __init__(
+        self,
+        pool: CollectorPool,
+        collectors: list[ScheduledCollector],
+        tick: float = 2.0,
+        max_heavy_per_tick: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._pool = pool
+        self._collectors = {c.name: c for c in collectors}
+        self._tick = tick
+        self._max_heavy = max_heavy_per_tick
+        self._clock = clock
+        self._values: dict[str, Any] = {}
+        self._last_run: dict[str, float] = {}
+
+    @property
+    def collectors(self) -> dict[str, ScheduledCollector]:
+        """Scheduled collectors by name."""
+        return self._collectors
+
+    def due(self, now: Optional[float] = None) -> list[str]:
+        """Names of the collectors to run at `now`, most overdue first.
+
+        Anything without a successful run yet always runs. Otherwise a
+        collector is due once its interval has elapsed, give or take half a
+        tick, and at most `max_heavy_per_tick` heavy collectors start per
+        tick.
+        """
+        now = self._clock() if now is None else now
+        overdue: list[tuple[float, str]] = []
+        for name, collector in self._collectors.items():
+            last = self._last_run.get(name)
+            if last is None:
+                overdue.append((float("inf"), name))
+                continue
+            lateness = now - last + self._tick / 2 - collector.interval
+            if lateness >= 0:
+                overdue.append((lateness, name))
+        overdue.sort(reverse=True)
+
+        due: list[str] = []
+        heavy = 0
+        for lateness, name in overdue:
+            if self._collectors[name].cost == "heavy" and lateness != float("inf"):
+                if heavy >= self._max_heavy:
+                    continue
+                heavy += 1
+            due.append(name)
+        return due
+
+    def run(self) -> tuple[dict[str, Any], list[str]]:
+        """Refresh due collectors.
+
+        Returns:
+            (values, stale): the freshest value of every collector in
+            registration order, and the names that were due but missed
+            their deadline or failed
+        """
+        now = self._clock()
+        due = self.due(now)
+        results, stale = self._pool.run(
+            {name: self._collectors[name].collect for name in due},
+            defaults={name: self._collectors[name].default for name in due},
+        )
+        for name in due:
+            # Stale results hold the last good value; retry on the next tick
+            self._values[name] = results[name]
+            if name not in stale:
+                self._last_run[name] = now
+        values = {
+            name: self._values.get(name, collector.default)
+            for name, collector in self._collectors.items()
+        }
+        return values, stale
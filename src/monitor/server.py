@@ -1,19 +1,20 @@
 """HTTP server for Raspberry Monitor.
 
-A lightweight HTTP server using Python's built-in http.server.
+A lightweight HTTP server using Python's built-in http.server. Routing
+lives in monitor.app; MONITOR_SERVER_ENGINE=asyncio selects the
+event-loop engine in monitor.async_server instead.
 """
 
 import http.server
-import json
 import logging
 import os
+import signal
 import socketserver
-from pathlib import Path
 from typing import Any, Optional
 
+from monitor.app import MonitorApp, Request, Response, StreamResponse
 from monitor.config import Config, get_config
-from monitor.handlers import HealthHandler, SystemStatsHandler, TailscaleHandler
-from monitor.speedtest import SpeedtestManager
+from monitor.stream import HEARTBEAT_FRAME
 
 # Configure logging
 logging.basicConfig(
@@ -23,101 +24,59 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def _normalize_path(path: str) -> str:
-    """Strip /monitor prefix for Tailscale Funnel compatibility."""
-    if path.startswith("/monitor/"):
-        return path[9:] or "/"
-    if path == "/monitor":
-        return "/"
-    return path
-
-
 class MonitorHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP request handler for monitor endpoints."""
 
-    # Class-level handlers (initialized in serve_forever)
-    _system_handler: Optional[SystemStatsHandler] = None
-    _tailscale_handler: Optional[TailscaleHandler] = None
-    _speedtest_manager: Optional[SpeedtestManager] = None
-    _static_dir: Optional[Path] = None
+    # Class-level application (initialized in create_server)
+    _app: Optional[MonitorApp] = None
 
     def do_GET(self) -> None:
         """Handle GET requests."""
-        raw_path = self.path.split("?")[0]
-        path = _normalize_path(raw_path)
-
-        if path == "/" or path == "":
-            self._serve_html()
-        elif path == "/api/system-stats":
-            self._serve_system_stats()
-        elif path == "/api/tailscale-ip":
-            self._serve_tailscale()
-        elif path == "/api/health":
-            self._serve_json(200, HealthHandler.check())
-        else:
-            self._serve_json(404, {"error": "Not found"})
-
-    def _serve_json(self, code: int, obj: Any) -> None:
-        """Send JSON response."""
-        body = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        if self._app is None:
+            self.send_error(500, "Server not initialized")
+            return
+        response = self._app.handle(Request(self.path, dict(self.headers.items())))
         try:
-            self.send_response(code)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Cache-Control", "no-store, no-cache, must-revalidate")
-            self.send_header("Pragma", "no-cache")
-            self.send_header("Expires", "0")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+            if isinstance(response, StreamResponse):
+                self._send_stream(response)
+            else:
+                self._send_response(response)
         except (BrokenPipeError, ConnectionResetError):
             pass  # Client disconnected
 
-    def _serve_html(self) -> None:
-        """Serve the main HTML page."""
-        if self._static_dir is None:
-            self._serve_json(500, {"error": "Static directory not configured"})
-            return
-
-        html_path = self._static_dir / "index.html"
-        if html_path.exists():
-            with open(html_path, "rb") as f:
-                data = f.read()
-            try:
-                self.send_response(200)
-                self.send_header("Content-Type", "text/html")
-                self.send_header("Cache-Control", "no-store, no-cache, must-revalidate")
-                self.send_header("Pragma", "no-cache")
-                self.send_header("Expires", "0")
-                self.send_header("Content-Length", str(len(data)))
-                self.end_headers()
-                self.wfile.write(data)
-            except (BrokenPipeError, ConnectionResetError):
-                pass
-        else:
-            self._serve_json(404, {"error": "index.html not found"})
-
-    def _serve_system_stats(self) -> None:
-        """Serve system statistics."""
-        if self._system_handler is None:
-            self._serve_json(500, {"error": "Handler not initialized"})
-            return
-        stats = self._system_handler.get_stats()
-
-        # Add speedtest data to network stats
-        if self._speedtest_manager:
-            speedtest_status = self._speedtest_manager.get_status()
-            if "network" in stats:
-                stats["network"]["speedtest"] = speedtest_status
-                stats["network"]["ping_ms"] = speedtest_status.get("ping_ms")
-
-        self._serve_json(200, stats)
-
-    def _serve_tailscale(self) -> None:
-        """Serve Tailscale info."""
-        if self._tailscale_handler is None:
-            self._serve_json(500, {"error": "Handler not initialized"})
-            return
-        self._serve_json(200, self._tailscale_handler.get_info())
+    def _send_response(self, response: Response) -> None:
+        """Write a complete response."""
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if response.body:
+            self.wfile.write(response.body)
+
+    def _send_stream(self, response: StreamResponse) -> None:
+        """Push each new snapshot to the client as Server-Sent Events."""
+        broadcaster = response.broadcaster
+        try:
+            self.send_response(response.status)
+            for name, value in response.headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(response.preamble)
+            self.wfile.flush()
+
+            last_seq = response.last_seq
+            while not broadcaster.closed:
+                seq, frame = broadcaster.wait_next(last_seq, response.heartbeat)
+                if frame is None:
+                    if broadcaster.closed:
+                        break
+                    self.wfile.write(HEARTBEAT_FRAME)
+                else:
+                    self.wfile.write(frame)
+                    last_seq = seq
+                self.wfile.flush()
+        finally:
+            broadcaster.release()
 
     def log_message(self, format: str, *args) -> None:
         """Suppress default logging."""
@@ -131,15 +90,10 @@ class ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     daemon_threads = True
 
 
-def create_server(config: Config = None) -> ThreadingTCPServer:
+def create_server(config: Config = None, app: Optional[MonitorApp] = None) -> ThreadingTCPServer:
     """Create and configure the HTTP server."""
     config = config or get_config()
-
-    # Initialize handlers
-    MonitorHandler._system_handler = SystemStatsHandler(config)
-    MonitorHandler._tailscale_handler = TailscaleHandler()
-    MonitorHandler._speedtest_manager = SpeedtestManager(config.speedtest)
-    MonitorHandler._static_dir = config.static_dir
+    MonitorHandler._app = app or MonitorApp(config)
 
     # Change to static directory for SimpleHTTPRequestHandler
     os.chdir(config.static_dir)
@@ -152,20 +106,41 @@ def create_server(config: Config = None) -> ThreadingTCPServer:
     return server
 
 
+def _raise_keyboard_interrupt(signum: int, frame: Any) -> None:
+    """Turn SIGTERM (systemd stop) into a clean shutdown."""
+    raise KeyboardInterrupt
+
+
 def main() -> int:
     """Main entry point."""
     config = get_config()
-    server = create_server(config)
+    app = MonitorApp(config)
 
     logger.info(f"Raspberry Monitor v{__import__('monitor').__version__}")
-    logger.info(f"Server started on port {config.server.port}")
+    logger.info(f"Server started on port {config.server.port} ({config.server.engine} engine)")
     logger.info(f"Local: http://127.0.0.1:{config.server.port}")
 
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    if config.server.engine == "asyncio":
+        from monitor.async_server import run
+
+        app.start()
+        try:
+            run(app, config)
+        except KeyboardInterrupt:
+            logger.info("Server stopped")
+        finally:
+            app.stop()
+        return 0
+
+    server = create_server(config, app)
+    app.start()
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         logger.info("Server stopped")
     finally:
+        app.stop()
         server.shutdown()
 
     return 0
@@ -0,0 +1,118 @@
+"""In-memory static asset serving.
+
+Files from the static directory are read once and kept in memory along
+with a gzip-precompressed variant. A file is re-read only when its mtime
+changes (checked at most every few seconds), or on every request in dev
+mode.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """A loaded static file and its encoded variants."""
+
+    name: str
+    body: bytes
+    gzip_body: Optional[bytes]
+    content_type: str
+    etag: str
+    last_modified: str
+    mtime_ns: int
+
+
+def _load(path: Path) -> StaticAsset:
+    """Read a file and build its cached representation."""
+    stat = path.stat()
+    body = path.read_bytes()
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in (
+        "application/javascript",
+        "application/json",
+    ):
+        content_type += "; charset=utf-8"
+    return StaticAsset(
+        name=path.name,
+        body=body,
+        # Keep the variant only when it actually saves bytes
+        gzip_body=compressed if len(compressed) < len(body) else None,
+        content_type=content_type,
+        etag=f'"{hashlib.sha1(body).hexdigest()[:16]}"',
+        last_modified=formatdate(stat.st_mtime, usegmt=True),
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+class StaticAssets:
+    """Cache of the files in a static directory."""
+
+    def __init__(self, directory: Path, dev: bool = False, check_interval: float = 5.0):
+        self._dir = Path(directory)
+        self._dev = dev
+        self._check_interval = check_interval
+        self._assets: dict[str, StaticAsset] = {}
+        self._checked: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def preload(self) -> None:
+        """Load every file in the static directory."""
+        try:
+            paths = list(self._dir.iterdir())
+        except OSError as e:
+            logger.warning("Cannot read static directory %s: %s", self._dir, e)
+            return
+        for path in paths:
+            if path.is_file():
+                self.get(path.name)
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        """Return the asset for a file name in the static directory.
+
+        Returns None for unknown names, including anything that is not a
+        plain file name (no path separators or dot-files).
+        """
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is not None and not self._dev:
+                if now - self._checked.get(name, 0.0) < self._check_interval:
+                    return asset
+            self._checked[name] = now
+
+        path = self._dir / name
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._assets.pop(name, None)
+            return None
+        if asset is not None and asset.mtime_ns == mtime_ns and not self._dev:
+            return asset
+        if not path.is_file():
+            return None
+
+        try:
+            asset = _load(path)
+        except OSError as e:
+            logger.warning("Failed to load static file %s: %s", name, e)
+            return asset
+        with self._lock:
+            self._assets[name] = asset
+        return asset
@@ -0,0 +1,327 @@
+"""Persistent on-disk metric store.
+
+Samples are stored as fixed-size binary records in memory-mapped segment
+files. Records are buffered in memory and copied into the mapping in
+batches, so the SD card sees one write burst per flush interval rather
+than one per sample.
+
+Segment layout::
+
+    header  (16 bytes): magic, version, metric count, record size, metrics crc32
+    records (record_size bytes each): float64 timestamp, float32 value per metric
+
+Segments are preallocated (sparse) to a fixed capacity; unused records
+have a zero timestamp.
+"""
+
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Optional
+
+from monitor.history import extract_metric
+from monitor.sampler import Snapshot
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"RMTS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHHxxI")
+_SEGMENT_SUFFIX = ".seg"
+
+
+def _metrics_crc(metrics: Iterable[str]) -> int:
+    """Checksum of the metric layout, stored in each segment header."""
+    return zlib.crc32("\0".join(metrics).encode("utf-8"))
+
+
+class _Segment:
+    """One memory-mapped segment file."""
+
+    def __init__(self, path: Path, record: struct.Struct, capacity: int, crc: int, create: bool):
+        self.path = path
+        self.record = record
+        self.start = int(path.stem.split("-", 1)[1])
+        header_size = _HEADER.size
+        size = header_size + capacity * record.size
+
+        if create:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                os.ftruncate(fd, size)  # Sparse: blocks are allocated on write
+                os.pwrite(
+                    fd,
+                    _HEADER.pack(_MAGIC, _VERSION, (record.size - 8) // 4, record.size, crc),
+                    0,
+                )
+                self._mm = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        else:
+            fd = os.open(path, os.O_RDWR)
+            try:
+                self._mm = mmap.mmap(fd, 0)
+            finally:
+                os.close(fd)
+            magic, version, _, record_size, file_crc = _HEADER.unpack_from(self._mm, 0)
+            if (
+                magic != _MAGIC
+                or version != _VERSION
+                or record_size != record.size
+                or file_crc != crc
+            ):
+                self._mm.close()
+                raise ValueError(f"Incompatible segment: {path.name}")
+
+        self.capacity = (len(self._mm) - header_size) // record.size
+        self.count = self._find_count()
+
+    def _find_count(self) -> int:
+        """Binary search for the first unused (zero timestamp) record."""
+        lo, hi = 0, self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (ts,) = struct.unpack_from("<d", self._mm, _HEADER.size + mid * self.record.size)
+            if ts > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @property
+    def last_timestamp(self) -> float:
+        """Timestamp of the newest record, or 0 if empty."""
+        if not self.count:
+            return 0.0
+        offset = _HEADER.size + (self.count - 1) * self.record.size
+        (ts,) = struct.unpack_from("<d", self._mm, offset)
+        return float(ts)
+
+    def write(self, data: bytes) -> int:
+        """Copy packed records into the mapping and sync the touched pages.
+
+        Returns the number of bytes handed to msync (page granular).
+        """
+        offset = _HEADER.size + self.count * self.record.size
+        self._mm[offset : offset + len(data)] = data
+        self.count += len(data) // self.record.size
+
+        page_start = offset - offset % mmap.PAGESIZE
+        length = offset + len(data) - page_start
+        self._mm.flush(page_start, length)
+        return length + (-length % mmap.PAGESIZE)
+
+    def records(self) -> Iterator[tuple[float, ...]]:
+        """Iterate unpacked records in write order."""
+        end = _HEADER.size + self.count * self.record.size
+        return self.record.iter_unpack(self._mm[_HEADER.size : end])
+
+    def close(self) -> None:
+        """Unmap the segment."""
+        self._mm.close()
+
+
+class MetricStore:
+    """Batched, rotating, retention-bounded metric store.
+
+    Flush and retention decisions are driven by sample timestamps, so the
+    store behaves the same in live use and when replaying old data.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        metrics: Iterable[str],
+        interval_sec: float = 2.0,
+        flush_interval_sec: float = 300.0,
+        segment_sec: float = 86400.0,
+        retention_sec: float = 30 * 86400.0,
+    ):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._metrics = tuple(metrics)
+        self._record = struct.Struct(f"<d{len(self._metrics)}f")
+        self._crc = _metrics_crc(self._metrics)
+        self._flush_interval = flush_interval_sec
+        self._segment_sec = segment_sec
+        self._retention = retention_sec
+        # Leave headroom for faster-than-configured sampling
+        self._capacity = max(1, math.ceil(2 * segment_sec / interval_sec))
+
+        self._pending: list[bytes] = []
+        self._last_flush_ts = 0.0
+        self._last_ts = 0.0
+        self._current: Optional[_Segment] = None
+        self._lock = threading.Lock()
+
+        self.bytes_written = 0
+        self.samples_written = 0
+
+        self._open_latest()
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Names of stored metrics, in record order."""
+        return self._metrics
+
+    @property
+    def record_size(self) -> int:
+        """Size of one record in bytes."""
+        return self._record.size
+
+    def _segment_paths(self) -> list[Path]:
+        """Segment files sorted oldest first."""
+        return sorted(
+            self._dir.glob(f"seg-*{_SEGMENT_SUFFIX}"),
+            key=lambda p: int(p.stem.split("-", 1)[1]),
+        )
+
+    def _open_latest(self) -> None:
+        """Reopen the newest segment for appending, if compatible."""
+        paths = self._segment_paths()
+        if not paths:
+            return
+        try:
+            segment = _Segment(paths[-1], self._record, self._capacity, self._crc, create=False)
+        except (OSError, ValueError) as e:
+            logger.warning("Not appending to %s: %s", paths[-1].name, e)
+            return
+        self._current = segment
+        self._last_ts = self._last_flush_ts = segment.last_timestamp
+
+    def append(self, timestamp: float, values: Iterable[float]) -> None:
+        """Buffer one sample; values are ordered like `metrics`."""
+        with self._lock:
+            if timestamp <= self._last_ts:
+                return
+            self._last_ts = timestamp
+            self._pending.append(self._record.pack(timestamp, *values))
+            if not self._last_flush_ts:
+                self._last_flush_ts = timestamp
+            elif timestamp - self._last_flush_ts >= self._flush_interval:
+                self._flush_locked()
+
+    def record(self, snapshot: Snapshot) -> None:
+        """Buffer the numeric fields of a sampler snapshot."""
+        self.append(snapshot.timestamp, [extract_metric(snapshot.data, m) for m in self._metrics])
+
+    def flush(self) -> None:
+        """Write buffered samples to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write pending records, rotating segments as needed (lock held)."""
+        pending = self._pending
+        self._pending = []
+        if pending:
+            self._last_flush_ts = self._last_ts
+
+        i = 0
+        while i < len(pending):
+            first_ts = self._record.unpack_from(pending[i])[0]
+            segment = self._writable_segment(first_ts)
+            # Records in this batch that fit the segment's time span and capacity
+            limit = segment.start + self._segment_sec
+            j = i
+            room = segment.capacity - segment.count
+            while j < len(pending) and j - i < room:
+                if self._record.unpack_from(pending[j])[0] >= limit:
+                    break
+                j += 1
+            if j == i:
+                # Segment is full; force rotation
+                self._rotate(first_ts)
+                continue
+            try:
+                self.bytes_written += segment.write(b"".join(pending[i:j]))
+                self.samples_written += j - i
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to write metric segment: %s", e)
+                return
+            i = j
+
+        if pending:
+            self._apply_retention(self._last_ts)
+
+    def _writable_segment(self, timestamp: float) -> _Segment:
+        """Return the segment that should receive a record at timestamp."""
+        current = self._current
+        if current is None or timestamp >= current.start + self._segment_sec:
+            return self._rotate(timestamp)
+        return current
+
+    def _rotate(self, timestamp: float) -> _Segment:
+        """Close the current segment and start a new one."""
+        if self._current is not None:
+            self._current.close()
+        start = int(timestamp - timestamp % self._segment_sec)
+        if self._current is not None and start <= self._current.start:
+            start = self._current.start + 1  # Early rotation of a full segment
+        path = self._dir / f"seg-{start}{_SEGMENT_SUFFIX}"
+        while path.exists():
+            # An incompatible segment already owns this name
+            start += 1
+            path = self._dir / f"seg-{start}{_SEGMENT_SUFFIX}"
+        self._current = _Segment(path, self._record, self._capacity, self._crc, create=True)
+        return self._current
+
+    def _apply_retention(self, now: float) -> None:
+        """Delete segments whose whole span is older than the retention window."""
+        cutoff = now - self._retention
+        for path in self._segment_paths():
+            if self._current is not None and path == self._current.path:
+                continue
+            start = int(path.stem.split("-", 1)[1])
+            if start + self._segment_sec >= cutoff:
+                break
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning("Failed to remove expired segment %s: %s", path.name, e)
+
+    def read(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[tuple[float, ...]]:
+        """Iterate (timestamp, *values) records on disk, oldest first.
+
+        Buffered samples that have not been flushed are not included.
+        Incompatible segments are skipped.
+        """
+        paths = self._segment_paths()
+        for index, path in enumerate(paths):
+            seg_start = int(path.stem.split("-", 1)[1])
+            if end is not None and seg_start > end:
+                break
+            if start is not None and index + 1 < len(paths):
+                next_start = int(paths[index + 1].stem.split("-", 1)[1])
+                if next_start <= start:
+                    continue
+            try:
+                segment = _Segment(path, self._record, self._capacity, self._crc, create=False)
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping segment %s: %s", path.name, e)
+                continue
+            try:
+                for rec in segment.records():
+                    if start is not None and rec[0] < start:
+                        continue
+                    if end is not None and rec[0] > end:
+                        break
+                    yield rec
+            finally:
+                segment.close()
+
+    def close(self) -> None:
+        """Flush pending samples and unmap the current segment."""
+        with self._lock:
+            self._flush_locked()
+            if self._current is not None:
+                self._current.close()
+                self._current = None
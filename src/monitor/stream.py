@@ -0,0 +1,111 @@
+"""Server-Sent Events fan-out for live snapshots.
+
+Each sampler snapshot is serialized once into an SSE frame; every
+connected client is handed the same bytes.
+"""
+
+import json
+import logging
+import threading
+from typing import Callable, Optional
+
+from monitor.sampler import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Comment line sent when no snapshot arrives within the heartbeat interval
+HEARTBEAT_FRAME = b": keepalive\n\n"
+
+
+def encode_event(snapshot: Snapshot, event: str = "stats", generation: str = "") -> bytes:
+    """Encode a snapshot as one SSE frame.
+
+    The event id is "<generation>-<seq>" when a generation is given, so a
+    client reconnecting after a server restart is not mistaken for one
+    that is up to date.
+    """
+    payload = json.dumps(snapshot.data, ensure_ascii=False, separators=(",", ":"))
+    event_id = f"{generation}-{snapshot.seq}" if generation else str(snapshot.seq)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+
+class SnapshotBroadcaster:
+    """Holds the latest encoded frame and wakes waiting stream clients."""
+
+    def __init__(self, max_clients: int = 32, generation: str = ""):
+        self._max_clients = max_clients
+        self._generation = generation
+        self._clients = 0
+        self._seq = 0
+        self._frame: Optional[bytes] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._listeners: list[Callable[[int, bytes], None]] = []
+
+    @property
+    def clients(self) -> int:
+        """Number of connected stream clients."""
+        return self._clients
+
+    @property
+    def closed(self) -> bool:
+        """Whether the broadcaster has been shut down."""
+        return self._closed
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Encode a snapshot and wake all waiting clients.
+
+        Intended as a sampler listener.
+        """
+        frame = encode_event(snapshot, generation=self._generation)
+        with self._cond:
+            self._seq = snapshot.seq
+            self._frame = frame
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        for listener in listeners:
+            try:
+                listener(snapshot.seq, frame)
+            except Exception:
+                logger.exception("Stream listener failed")
+
+    def add_listener(self, listener: Callable[[int, bytes], None]) -> None:
+        """Register a callback invoked with (seq, frame) for every new frame."""
+        with self._cond:
+            self._listeners.append(listener)
+
+    def latest(self) -> tuple[int, Optional[bytes]]:
+        """Return the current (seq, frame)."""
+        with self._cond:
+            return self._seq, self._frame
+
+    def acquire(self) -> bool:
+        """Reserve a client slot; False if the server is at capacity."""
+        with self._cond:
+            if self._closed or self._clients >= self._max_clients:
+                return False
+            self._clients += 1
+            return True
+
+    def release(self) -> None:
+        """Free a client slot."""
+        with self._cond:
+            self._clients = max(0, self._clients - 1)
+
+    def wait_next(self, last_seq: int, timeout: float) -> tuple[int, Optional[bytes]]:
+        """Block until a frame newer than last_seq is published.
+
+        Returns:
+            (seq, frame), with frame None on timeout or shutdown
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._seq > last_seq, timeout)
+            if self._closed or self._seq <= last_seq:
+                return last_seq, None
+            return self._seq, self._frame
+
+    def close(self) -> None:
+        """Wake all clients so their streams end."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
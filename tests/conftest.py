@@ -1,8 +1,19 @@
 """Pytest configuration and fixtures."""
 
+import http.server
+import json
+import socketserver
+import threading
+
 import pytest
 
-from monitor.config import CacheConfig, Config, ServerConfig, SpeedtestConfig
+from monitor.config import (
+    CacheConfig,
+    Config,
+    SamplerConfig,
+    ServerConfig,
+    SpeedtestConfig,
+)
 
 
 @pytest.fixture
@@ -15,10 +26,91 @@ def test_config():
             process_list_ttl=0.1,
             tailscale_cache_ttl=0.1,
         ),
+        sampler=SamplerConfig(
+            enabled=False,  # Tests drive sampling explicitly
+            interval_sec=0.05,
+        ),
         speedtest=SpeedtestConfig(
             enabled=False,  # Disable speedtest in tests
-            interval_sec=1,
+            interval_sec=10,
             timeout_sec=1,
             cli_path="/nonexistent/speedtest",
         ),
     )
+
+
+class FakeUnixHTTPServer:
+    """HTTP/1.1 server on a unix socket answering from a route table.
+
+    Routes map "METHOD /path?query" to (status, JSON-able body) or to a
+    callable taking the request handler, which writes its own response.
+    """
+
+    def __init__(self, path, routes):
+        self.path = str(path)
+        self.routes = routes
+        self.requests = []
+        self.connections = 0
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                server.connections += 1
+                super().setup()
+
+            def handle_one_request(self):
+                try:
+                    super().handle_one_request()
+                except OSError:
+                    self.close_connection = True
+
+            def _route(self):
+                key = f"{self.command} {self.path}"
+                server.requests.append((key, dict(self.headers)))
+                route = server.routes.get(key)
+                if callable(route):
+                    route(self)
+                    return
+                status, obj = route if route is not None else (404, {"message": "not found"})
+                body = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _route
+
+            def log_message(self, *args):
+                pass
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def paths(self):
+        return [key for key, _ in self.requests]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def unix_http_server(tmp_path):
+    """Start fake unix socket HTTP servers; stopped after the test."""
+    servers = []
+
+    def start(routes, name="api.sock"):
+        server = FakeUnixHTTPServer(tmp_path / name, routes)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,154 @@
+"""Tests for request routing."""
+
+import gzip
+import json
+
+import pytest
+
+from monitor.app import (
+    MonitorApp,
+    Request,
+    Response,
+    StreamResponse,
+    _etag_matches,
+    _normalize_path,
+)
+
+
+class TestNormalizePath:
+    """Tests for _normalize_path."""
+
+    def test_strips_monitor_prefix(self):
+        """Test Tailscale Funnel prefix handling."""
+        assert _normalize_path("/monitor/api/health") == "/api/health"
+        assert _normalize_path("/monitor") == "/"
+        assert _normalize_path("/api/health") == "/api/health"
+
+
+class TestEtagMatches:
+    """Tests for _etag_matches."""
+
+    def test_exact_match(self):
+        """Test a single matching ETag."""
+        assert _etag_matches('"abc-1"', '"abc-1"')
+        assert not _etag_matches('"abc-2"', '"abc-1"')
+
+    def test_list_and_weak(self):
+        """Test comma-separated lists and weak validators."""
+        assert _etag_matches('"x", W/"abc-1"', '"abc-1"')
+
+    def test_wildcard_and_missing(self):
+        """Test * and an absent header."""
+        assert _etag_matches("*", '"abc-1"')
+        assert not _etag_matches(None, '"abc-1"')
+
+
+@pytest.fixture
+def app(test_config):
+    """Provide an app whose inline snapshot stays current for the test."""
+    test_config.cache.system_stats_ttl = 60
+    app = MonitorApp(test_config)
+    yield app
+    app.stop()
+
+
+def _header(response, name):
+    return dict(response.headers).get(name)
+
+
+class TestMonitorApp:
+    """Tests for MonitorApp.handle."""
+
+    def test_system_stats_and_revalidation(self, app):
+        """Test a full payload followed by a 304 for the same snapshot."""
+        response = app.handle(Request("/api/system-stats"))
+        assert isinstance(response, Response)
+        assert response.status == 200
+        assert json.loads(response.body)["seq"] == 1
+
+        etag = _header(response, "ETag")
+        again = app.handle(Request("/api/system-stats", {"If-None-Match": etag}))
+        assert again.status == 304
+        assert again.body == b""
+
+    def test_gzip_negotiation(self, app):
+        """Test that gzip is used only when accepted."""
+        response = app.handle(Request("/monitor/api/system-stats", {"accept-encoding": "gzip"}))
+        assert _header(response, "Content-Encoding") == "gzip"
+        assert json.loads(gzip.decompress(response.body))["seq"] == 1
+
+    def test_invalid_since(self, app):
+        """Test that a non-numeric since is rejected."""
+        assert app.handle(Request("/api/system-stats?since=abc")).status == 400
+
+    def test_history_rejects_non_finite(self, app):
+        """Test that inf/nan parameters get a 400 instead of an overflow."""
+        for query in ("points=inf", "points=nan", "points=0", "start=nan", "seconds=-inf"):
+            response = app.handle(Request(f"/api/history?{query}"))
+            assert response.status == 400, query
+            assert json.loads(response.body)["error"].startswith("Invalid ")
+        assert app.handle(Request("/api/history?points=10")).status == 200
+
+    def test_static_and_not_found(self, app):
+        """Test the dashboard page and an unknown route."""
+        page = app.handle(Request("/"))
+        assert page.status == 200
+        assert _header(page, "Cache-Control") == "no-cache"
+        assert app.handle(Request("/nope")).status == 404
+
+    def test_stream_reserves_slot(self, app):
+        """Test that a stream response carries the latest frame."""
+        app.system_handler.sampler.sample_now()
+        response = app.handle(Request("/api/stream"))
+        assert isinstance(response, StreamResponse)
+        assert response.last_seq == 1
+        assert f"id: {app.system_handler.generation}-1\n".encode() in response.preamble
+        assert app.broadcaster.clients == 1
+        response.broadcaster.release()
+
+    def test_stream_resumes_after_restart(self, app):
+        """Test that a Last-Event-ID from a previous process still gets the latest frame."""
+        app.system_handler.sampler.sample_now()
+        app.system_handler.sampler.sample_now()
+        generation = app.system_handler.generation
+        for last_id in ("500", "0000-1", f"{generation}x-1"):
+            response = app.handle(Request("/api/stream", {"Last-Event-ID": last_id}))
+            assert response.last_seq == 2, last_id
+            assert f"id: {generation}-2\n".encode() in response.preamble
+            response.broadcaster.release()
+        # The current generation resumes without repeating the frame
+        response = app.handle(Request("/api/stream", {"Last-Event-ID": f"{generation}-2"}))
+        assert response.preamble == b"retry: 5000\n\n"
+        response.broadcaster.release()
+
+    def test_since_from_another_generation(self, app):
+        """Test that a since issued before a restart gets the full body."""
+        seq = json.loads(app.handle(Request("/api/system-stats")).body)["seq"]
+        generation = app.system_handler.generation
+        delta = json.loads(
+            app.handle(Request(f"/api/system-stats?since={seq}&generation={generation}")).body
+        )
+        assert delta["changes"] == {} and delta["generation"] == generation
+        stale = app.handle(Request(f"/api/system-stats?since={seq}&generation=0000"))
+        body = json.loads(stale.body)
+        assert body["full"] is True and body["generation"] == generation
+        assert "cpu" in body["data"]
+        assert _header(stale, "ETag") != _header(
+            app.handle(Request(f"/api/system-stats?since={seq}&generation={generation}")), "ETag"
+        )
+
+    def test_processes_page(self, app):
+        """Test the paged process list and parameter validation."""
+        app.system_handler.process_scanner.scan()
+        response = app.handle(Request("/api/processes?sort=rss&limit=3"))
+        assert response.status == 200
+        page = json.loads(response.body)
+        assert page["sort"] == "rss"
+        assert len(page["processes"]) == min(3, page["total"])
+        rss = [p["rss_mb"] for p in page["processes"]]
+        assert rss == sorted(rss, reverse=True)
+        assert app.handle(Request("/api/processes?sort=name")).status == 400
+        assert app.handle(Request("/api/processes?limit=0")).status == 400
+        groups = app.handle(Request("/api/processes/groups?by=unit"))
+        assert groups.status == 200
+        assert json.loads(groups.body)["by"] == "unit"
@@ -0,0 +1,133 @@
+"""Tests for the asyncio server engine."""
+
+import asyncio
+import json
+
+import pytest
+
+from monitor.app import MonitorApp
+from monitor.async_server import AsyncMonitorServer, _parse_head, _wants_keep_alive
+
+
+class TestParsing:
+    """Tests for request parsing helpers."""
+
+    def test_parse_head(self):
+        """Test request line and case-folded, merged headers."""
+        method, target, version, headers = _parse_head(
+            b"GET /api/health?x=1 HTTP/1.1\r\nHost: pi\r\nAccept: a\r\naccept: b"
+        )
+        assert (method, target, version) == ("GET", "/api/health?x=1", "HTTP/1.1")
+        assert headers == {"host": "pi", "accept": "a, b"}
+
+    def test_keep_alive_defaults(self):
+        """Test persistent connection defaults per HTTP version."""
+        assert _wants_keep_alive("HTTP/1.1", {})
+        assert not _wants_keep_alive("HTTP/1.1", {"connection": "close"})
+        assert not _wants_keep_alive("HTTP/1.0", {})
+        assert _wants_keep_alive("HTTP/1.0", {"connection": "Keep-Alive"})
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return status, headers, body
+
+
+@pytest.fixture
+def app(test_config):
+    """Provide an app whose inline snapshot stays current for the test."""
+    test_config.cache.system_stats_ttl = 60
+    app = MonitorApp(test_config)
+    yield app
+    app.stop()
+
+
+class TestAsyncMonitorServer:
+    """Tests for AsyncMonitorServer."""
+
+    def test_keep_alive_reuses_connection(self, app):
+        """Test several requests over one connection, then a 304."""
+
+        async def scenario():
+            server = AsyncMonitorServer(app, host="127.0.0.1", port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"GET /api/health HTTP/1.1\r\nHost: x\r\n\r\n")
+                status, headers, body = await _read_response(reader)
+                assert status == 200
+                assert "keep-alive" in headers
+                assert json.loads(body) == {"ok": True}
+
+                writer.write(b"GET /api/system-stats HTTP/1.1\r\nHost: x\r\n\r\n")
+                status, headers, _ = await _read_response(reader)
+                assert status == 200
+
+                etag = headers["etag"]
+                writer.write(
+                    f"GET /api/system-stats HTTP/1.1\r\nIf-None-Match: {etag}\r\n\r\n".encode()
+                )
+                status, _, body = await _read_response(reader)
+                assert status == 304
+                assert body == b""
+                writer.close()
+            finally:
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_connection_close_and_bad_method(self, app):
+        """Test Connection: close and a rejected method."""
+
+        async def scenario():
+            server = AsyncMonitorServer(app, host="127.0.0.1", port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"GET /nope HTTP/1.1\r\nConnection: close\r\n\r\n")
+                status, headers, _ = await _read_response(reader)
+                assert status == 404
+                assert headers["connection"] == "close"
+                assert await reader.read() == b""
+
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"POST /api/health HTTP/1.1\r\nContent-Length: 0\r\n\r\n")
+                status, headers, _ = await _read_response(reader)
+                assert status == 405
+                assert headers["allow"] == "GET, HEAD"
+            finally:
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_stream_pushes_new_frames(self, app):
+        """Test that a published snapshot reaches an open stream."""
+
+        async def scenario():
+            server = AsyncMonitorServer(app, host="127.0.0.1", port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"GET /api/stream HTTP/1.1\r\n\r\n")
+                head = await reader.readuntil(b"\r\n\r\n")
+                assert b"text/event-stream" in head
+                assert await reader.readuntil(b"\n\n") == b"retry: 5000\n\n"
+
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, app.system_handler.sampler.sample_now)
+                frame = await asyncio.wait_for(reader.readuntil(b"\n\n"), 5)
+                generation = app.system_handler.generation
+                assert frame.startswith(f"id: {generation}-1\nevent: stats\n".encode())
+                writer.close()
+            finally:
+                await server.close()
+
+        asyncio.run(scenario())
@@ -0,0 +1,70 @@
+"""Tests for concurrent collector execution."""
+
+import threading
+import time
+
+from monitor.collector_pool import CollectorPool
+
+
+class TestCollectorPool:
+    """Tests for CollectorPool."""
+
+    def test_runs_concurrently(self):
+        """Test that latency is bounded by the slowest collector."""
+        pool = CollectorPool(max_workers=4, deadline=2.0)
+
+        def slow():
+            time.sleep(0.2)
+            return {"ok": True}
+
+        start = time.monotonic()
+        results, stale = pool.run({"a": slow, "b": slow, "c": slow})
+        elapsed = time.monotonic() - start
+        pool.close()
+
+        assert results == {"a": {"ok": True}, "b": {"ok": True}, "c": {"ok": True}}
+        assert stale == []
+        assert elapsed < 0.5
+
+    def test_late_collector_uses_last_good_value(self):
+        """Test that a missed deadline returns the previous value as stale."""
+        pool = CollectorPool(max_workers=2, deadline=0.05)
+        release = threading.Event()
+        calls = []
+
+        def collect():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(2.0)
+            return {"n": len(calls)}
+
+        results, stale = pool.run({"slow": collect, "fast": dict})
+        assert results["slow"] == {"n": 1}
+        assert stale == []
+
+        results, stale = pool.run({"slow": collect, "fast": dict})
+        assert results["slow"] == {"n": 1}
+        assert stale == ["slow"]
+
+        # Still running: not started a second time
+        results, stale = pool.run({"slow": collect})
+        assert stale == ["slow"]
+        assert len(calls) == 2
+
+        release.set()
+        time.sleep(0.05)
+        results, stale = pool.run({"slow": collect})
+        assert results["slow"] == {"n": 3}
+        pool.close()
+
+    def test_failure_and_defaults(self):
+        """Test that a failing collector with no history gets its default."""
+        pool = CollectorPool(deadline=1.0)
+
+        def broken():
+            raise RuntimeError("boom")
+
+        results, stale = pool.run({"procs": broken, "x": broken}, defaults={"procs": []})
+        pool.close()
+        assert results == {"procs": [], "x": {}}
+        assert sorted(stale) == ["procs", "x"]
@@ -37,3 +37,69 @@ class TestCPUCollector:
         result = collector.collect()
         assert isinstance(result["freq"], int)
         assert result["freq"] >= 0
+
+
+PROC_STAT_1 = """\
+cpu  400 0 200 3000 100 0 0 0 0 0
+cpu0 100 0 50 750 25 0 0 0 0 0
+cpu1 300 0 150 2250 75 0 0 0 0 0
+intr 5000 10 20 30
+ctxt 10000
+btime 1700000000
+processes 500
+procs_running 1
+procs_blocked 0
+softirq 800 1 2 3
+"""
+
+PROC_STAT_2 = """\
+cpu  600 0 300 3050 150 0 100 0 0 0
+cpu0 120 0 60 800 75 0 0 0 0 0
+cpu1 480 0 240 2250 75 0 100 0 0 0
+intr 7000 10 20 30
+ctxt 14000
+btime 1700000000
+processes 520
+procs_running 3
+procs_blocked 1
+softirq 900 1 2 3
+"""
+
+
+class TestCPUBreakdown:
+    """Tests for per-core usage, time breakdown and counter rates."""
+
+    def test_single_read_metrics(self, tmp_path):
+        """Test all figures derived from two /proc/stat readings."""
+        stat = tmp_path / "stat"
+        stat.write_text(PROC_STAT_1)
+        now = [0.0]
+        collector = CPUCollector(
+            proc_stat=str(stat), cpufreq=str(tmp_path / "none"), clock=lambda: now[0]
+        )
+        first = collector.collect()
+        assert first["cores"] == [0.0, 0.0]
+        assert first["ctxt_s"] == 0.0
+
+        stat.write_text(PROC_STAT_2)
+        now[0] = 2.0
+        result = collector.collect()
+
+        # 500 jiffies elapsed overall, 50 idle + 50 iowait
+        assert result["percent"] == 80.0
+        assert result["breakdown"] == {
+            "user": 40.0,
+            "nice": 0.0,
+            "system": 20.0,
+            "iowait": 10.0,
+            "irq": 0.0,
+            "softirq": 20.0,
+            "steal": 0.0,
+        }
+        # cpu0 mostly idle, cpu1 pegged
+        assert result["cores"] == [23.1, 100.0]
+        assert result["ctxt_s"] == 2000.0
+        assert result["intr_s"] == 1000.0
+        assert result["forks_s"] == 10.0
+        assert result["procs_running"] == 3
+        assert result["procs_blocked"] == 1
@@ -0,0 +1,219 @@
+"""Tests for disk collector and mount usage."""
+
+import os
+import threading
+import time
+
+from monitor.collectors import mounts as mounts_module
+from monitor.collectors.disk import DiskCollector
+from monitor.collectors.diskio import DiskIO, device_rates, discover_devices
+from monitor.collectors.mounts import (
+    DiskUsage,
+    Mount,
+    MountTable,
+    StatvfsProbe,
+    parse_mountinfo,
+    select_real_mounts,
+    usage_from_statvfs,
+)
+
+MOUNTINFO = """\
+23 28 0:22 / /proc rw,relatime - proc proc rw
+26 25 0:24 / /dev/shm rw,relatime - tmpfs tmpfs rw
+28 1 179:2 / / rw,noatime shared:1 - ext4 /dev/mmcblk0p2 rw
+30 28 179:1 / /boot/firmware rw,relatime shared:2 - vfat /dev/mmcblk0p1 rw
+31 28 8:1 / /mnt/usb\\040ssd rw,relatime shared:3 master:1 - ext4 /dev/sda1 rw
+32 28 8:1 /data /srv/data rw,relatime - ext4 /dev/sda1 rw
+33 28 0:50 / /mnt/nas rw - nfs4 nas:/export rw
+34 28 0:51 / /var/lib/docker/overlay2/abc/merged rw - overlay overlay rw
+"""
+
+
+class TestMountParsing:
+    """Tests for mountinfo parsing and filtering."""
+
+    def test_parse_escapes_and_optional_fields(self):
+        """Test octal escapes and a variable number of optional fields."""
+        mounts = parse_mountinfo(MOUNTINFO)
+        usb = next(m for m in mounts if m.device_id == "8:1")
+        assert usb == Mount("8:1", "/mnt/usb ssd", "ext4", "/dev/sda1")
+
+    def test_select_real_mounts(self):
+        """Test that pseudo, container overlay and bind mounts are dropped."""
+        selected = select_real_mounts(parse_mountinfo(MOUNTINFO))
+        assert [m.mount_point for m in selected] == [
+            "/",
+            "/boot/firmware",
+            "/mnt/nas",
+            "/mnt/usb ssd",
+        ]
+        assert [m.network for m in selected] == [False, False, True, False]
+
+    def test_usage_from_statvfs(self):
+        """Test df-style usage arithmetic."""
+        gib_blocks = 1024**3 // 4096
+        st = os.statvfs_result(
+            (4096, 4096, 10 * gib_blocks, 4 * gib_blocks, 3 * gib_blocks, 100, 25, 25, 0, 255)
+        )
+        usage = usage_from_statvfs(st)
+        assert usage["total_gb"] == 10.0
+        assert usage["used_gb"] == 6.0
+        assert usage["free_gb"] == 3.0
+        assert usage["percent"] == round(6 / 9 * 100, 1)
+        assert usage["inodes_used"] == 75
+        assert usage["inodes_percent"] == 75.0
+
+
+class TestMountTable:
+    """Tests for MountTable."""
+
+    def test_reads_file(self, tmp_path):
+        """Test loading the table from a mountinfo file."""
+        path = tmp_path / "mountinfo"
+        path.write_text(MOUNTINFO)
+        table = MountTable(str(path))
+        assert [m.mount_point for m in table.mounts()][0] == "/"
+        table.close()
+
+    def test_live_table_has_root(self):
+        """Test the running system's table."""
+        table = MountTable()
+        assert any(m.mount_point == "/" for m in table.mounts())
+        # Unchanged table is served without re-reading
+        assert table.mounts() is table.mounts()
+        table.close()
+
+
+class TestDiskUsage:
+    """Tests for DiskUsage."""
+
+    def test_hung_network_mount_times_out(self, monkeypatch):
+        """Test that a blocking statvfs is reported, not waited on."""
+        release = threading.Event()
+        real_statvfs = os.statvfs
+
+        def fake_statvfs(path):
+            if path == "/mnt/nas":
+                release.wait(5)
+            return real_statvfs("/")
+
+        monkeypatch.setattr(mounts_module.os, "statvfs", fake_statvfs)
+
+        class Table:
+            def mounts(self):
+                return [
+                    Mount("179:2", "/", "ext4", "/dev/root"),
+                    Mount("0:50", "/mnt/nas", "nfs4", "nas:/export"),
+                ]
+
+        usage = DiskUsage(Table(), StatvfsProbe(timeout=0.05))
+        try:
+            results = usage.collect()
+        finally:
+            release.set()
+        assert results[0]["mount"] == "/"
+        assert "total_gb" in results[0]
+        assert results[1] == {
+            "mount": "/mnt/nas",
+            "device": "nas:/export",
+            "fstype": "nfs4",
+            "error": "unresponsive",
+        }
+
+    def test_stuck_call_is_not_waited_on_again(self):
+        """Test that a still-pending statvfs reports the mount at once."""
+        release = threading.Event()
+        calls = []
+
+        def fake_statvfs(path):
+            calls.append(path)
+            release.wait(5)
+            return os.statvfs("/")
+
+        probe = StatvfsProbe(timeout=0.05, statvfs=fake_statvfs)
+        try:
+            assert probe.statvfs("/mnt/nas") is None
+            t0 = time.monotonic()
+            assert probe.statvfs("/mnt/nas") is None
+            assert time.monotonic() - t0 < 0.04
+            assert calls == ["/mnt/nas"]
+        finally:
+            release.set()
+
+
+class TestDiskCollector:
+    """Tests for DiskCollector."""
+
+    def test_name(self):
+        """Test collector name."""
+        assert DiskCollector().name == "disk"
+
+    def test_collect_reports_root_and_mounts(self):
+        """Test top-level root figures alongside the mount list."""
+        result = DiskCollector().collect()
+        assert result["total_gb"] > 0
+        assert result["mounts"]
+        assert result["mounts"][0]["total_gb"] == result["total_gb"]
+
+
+DISKSTATS_1 = """\
+   7       0 loop0 50 0 400 10 0 0 0 0 0 10 10 0 0 0 0
+ 179       0 mmcblk0 1000 10 8000 500 2000 20 16000 1500 0 1000 2000 0 0 0 0
+ 179       1 mmcblk0p1 10 0 80 5 0 0 0 0 0 5 5 0 0 0 0
+ 259       0 nvme0n1 100 0 800 10 100 0 800 10 0 20 20 0 0 0 0
+ 253       0 dm-0 100 0 800 10 100 0 800 10 0 20 20 0 0 0 0
+"""
+
+DISKSTATS_2 = """\
+   7       0 loop0 90 0 800 20 0 0 0 0 0 20 20 0 0 0 0
+ 179       0 mmcblk0 1100 10 10048 700 2100 20 18048 1800 0 1500 2600 0 0 0 0
+ 179       1 mmcblk0p1 10 0 80 5 0 0 0 0 0 5 5 0 0 0 0
+ 259       0 nvme0n1 300 0 2848 30 100 0 800 10 0 40 40 0 0 0 0
+ 253       0 dm-0 300 0 2848 30 100 0 800 10 0 40 40 0 0 0 0
+"""
+
+
+class TestDiskIO:
+    """Tests for per-device I/O rates."""
+
+    def _sys_block(self, tmp_path):
+        root = tmp_path / "block"
+        for name in ("loop0", "mmcblk0", "nvme0n1", "dm-0", "ram0"):
+            (root / name).mkdir(parents=True)
+        for name in ("mmcblk0", "nvme0n1"):
+            (root / name / "device").mkdir()
+        return root
+
+    def test_discover_devices(self, tmp_path):
+        """Test that loop/ram devices are skipped and stacked ones flagged."""
+        devices = discover_devices(str(self._sys_block(tmp_path)))
+        assert devices == {"mmcblk0": True, "nvme0n1": True, "dm-0": False}
+
+    def test_rates(self, tmp_path):
+        """Test IOPS, throughput, await and utilization over a 2 s gap."""
+        stats = tmp_path / "diskstats"
+        stats.write_text(DISKSTATS_1)
+        now = [10.0]
+        io = DiskIO(str(stats), str(self._sys_block(tmp_path)), clock=lambda: now[0])
+        assert io.collect()["devices"] == {}
+
+        stats.write_text(DISKSTATS_2)
+        now[0] = 12.0
+        result = io.collect()
+        assert set(result["devices"]) == {"mmcblk0", "nvme0n1", "dm-0"}
+
+        sd = result["devices"]["mmcblk0"]
+        assert sd["read_iops"] == 50.0
+        assert sd["write_iops"] == 50.0
+        assert sd["read_mb_s"] == 0.5
+        assert sd["await_ms"] == 2.5  # (200 + 300) ms over 200 requests
+        assert sd["util_percent"] == 25.0
+
+        # dm-0 sits on top of a physical disk and is not counted twice
+        assert result["read_mb_s"] == sd["read_mb_s"] + result["devices"]["nvme0n1"]["read_mb_s"]
+
+    def test_counter_reset(self):
+        """Test that counters going backwards yield zero, not negative rates."""
+        rates = device_rates((100, 800, 10, 0, 0, 0, 50), (5, 40, 1, 0, 0, 0, 2), 2.0)
+        assert rates["read_iops"] == 0.0
+        assert rates["util_percent"] == 0.0
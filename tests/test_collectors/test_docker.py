@@ -0,0 +1,186 @@
+"""Tests for Docker collector."""
+
+import json
+import queue
+import time
+
+from monitor.collectors.docker import EVENTS_PATH, DockerCollector, container_cgroup
+
+CONTAINERS = [
+    {
+        "Id": "aaaaaaaaaaaa1111",
+        "Names": ["/web"],
+        "Image": "nginx",
+        "State": "running",
+        "Status": "Up 2 hours",
+    },
+    {
+        "Id": "bbbbbbbbbbbb2222",
+        "Names": ["/job"],
+        "Image": "busybox",
+        "State": "exited",
+        "Status": "Exited (0) 1 hour ago",
+    },
+]
+
+STARTED = CONTAINERS + [
+    {
+        "Id": "cccccccccccc3333",
+        "Names": ["/db"],
+        "Image": "postgres",
+        "State": "running",
+        "Status": "Up 1 second",
+    },
+]
+
+
+def _cgroup_v2(tmp_path, pid, name, usage_usec, memory):
+    proc = tmp_path / "proc" / str(pid)
+    proc.mkdir(parents=True, exist_ok=True)
+    (proc / "cgroup").write_text(f"0::/system.slice/docker-{name}.scope\n")
+    root = tmp_path / "cgroup"
+    (root / "cgroup.controllers").parent.mkdir(exist_ok=True)
+    (root / "cgroup.controllers").write_text("cpu memory\n")
+    cg = root / "system.slice" / f"docker-{name}.scope"
+    cg.mkdir(parents=True, exist_ok=True)
+    (cg / "cpu.stat").write_text(f"usage_usec {usage_usec}\nuser_usec 0\n")
+    (cg / "memory.current").write_text(f"{memory}\n")
+    (cg / "memory.stat").write_text("anon 1000\ninactive_file 1048576\n")
+
+
+def _event_stream(events):
+    """Route writing queued events as a chunked stream until None."""
+
+    def route(handler):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        handler.wfile.flush()
+        for event in iter(events.get, None):
+            data = json.dumps(event).encode() + b"\n"
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+        handler.close_connection = True
+
+    return route
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestContainerCgroup:
+    """Tests for locating container accounting files."""
+
+    def test_v1_controllers(self, tmp_path):
+        """Test cpuacct and memory paths on a v1 host."""
+        text = "4:memory:/docker/abc\n2:cpu,cpuacct:/docker/abc\n1:name=systemd:/docker/abc\n"
+        files = container_cgroup(text, str(tmp_path))
+        assert files.cpu.path == str(tmp_path / "cpuacct" / "docker" / "abc" / "cpuacct.usage")
+        assert files.memory.path.endswith("memory/docker/abc/memory.usage_in_bytes")
+        assert files.cpu_ns == 1
+
+
+class TestDockerCollector:
+    """Tests for DockerCollector."""
+
+    def test_name(self):
+        """Test collector name."""
+        assert DockerCollector().name == "docker"
+
+    def test_unavailable(self, tmp_path):
+        """Test the result when the daemon socket is missing."""
+        collector = DockerCollector(socket_path=str(tmp_path / "docker.sock"))
+        assert collector.collect() == {
+            "available": False,
+            "running": 0,
+            "stopped": 0,
+            "containers": [],
+        }
+        collector.close()
+
+    def test_counts_usage_and_events(self, tmp_path, unix_http_server):
+        """Test counts, cgroup CPU/memory, and list refresh driven by events."""
+        events = queue.Queue()
+        routes = {
+            "GET /containers/json?all=1": (200, CONTAINERS),
+            "GET /containers/aaaaaaaaaaaa/json": (200, {"State": {"Pid": 100}}),
+            "GET /containers/cccccccccccc/json": (200, {"State": {"Pid": 200}}),
+            "GET " + EVENTS_PATH: _event_stream(events),
+        }
+        server = unix_http_server(routes, name="docker.sock")
+        _cgroup_v2(tmp_path, 100, "aaaa", usage_usec=0, memory=3 * 1048576)
+        now = [0.0]
+        collector = DockerCollector(
+            socket_path=server.path,
+            proc_root=str(tmp_path / "proc"),
+            cgroup_root=str(tmp_path / "cgroup"),
+            cpu_count=4,
+            clock=lambda: now[0],
+        )
+        try:
+            first = collector.collect()
+            assert first["available"] is True
+            assert (first["running"], first["stopped"]) == (1, 1)
+            web, job = first["containers"]
+            assert web["name"] == "web"
+            assert web["mem_mb"] == 2.0  # Page cache excluded
+            assert job["cpu"] is None
+
+            # 2 s of CPU time over 1 s on 4 cores -> 50%
+            _cgroup_v2(tmp_path, 100, "aaaa", usage_usec=2_000_000, memory=3 * 1048576)
+            now[0] = 1.0
+            assert _wait_for(lambda: collector._watching)
+            assert collector.collect()["containers"][0]["cpu"] == 50.0
+
+            # Without events the list is not re-read
+            listings = server.paths().count("GET /containers/json?all=1")
+            now[0] = 2.0
+            collector.collect()
+            assert server.paths().count("GET /containers/json?all=1") == listings
+
+            # A start event triggers one refresh
+            routes["GET /containers/json?all=1"] = (200, STARTED)
+            _cgroup_v2(tmp_path, 200, "cccc", usage_usec=0, memory=1048576)
+            events.put({"Type": "container", "Action": "exec_start: sh"})
+            events.put({"Type": "container", "Action": "start", "id": "cccc"})
+            assert _wait_for(lambda: collector._dirty.is_set())
+            now[0] = 3.0
+            result = collector.collect()
+            assert (result["running"], result["stopped"]) == (2, 1)
+            assert result["containers"][2]["mem_mb"] == 0.0
+        finally:
+            events.put(None)
+            collector.close()
+
+    def test_retries_unresolved_cgroup(self, tmp_path, unix_http_server):
+        """Test that a cgroup missing on the first sample is picked up later."""
+        routes = {
+            "GET /containers/json?all=1": (200, CONTAINERS),
+            "GET /containers/aaaaaaaaaaaa/json": (200, {"State": {"Pid": 100}}),
+        }
+        server = unix_http_server(routes, name="docker.sock")
+        now = [0.0]
+        collector = DockerCollector(
+            socket_path=server.path,
+            proc_root=str(tmp_path / "proc"),
+            cgroup_root=str(tmp_path / "cgroup"),
+            clock=lambda: now[0],
+        )
+        try:
+            assert collector.collect()["containers"][0]["mem_mb"] is None
+            _cgroup_v2(tmp_path, 100, "aaaa", usage_usec=0, memory=3 * 1048576)
+            now[0] = 5.0
+            assert collector.collect()["containers"][0]["mem_mb"] is None  # Backing off
+            now[0] = 11.0
+            assert collector.collect()["containers"][0]["mem_mb"] == 2.0
+            assert server.paths().count("GET /containers/aaaaaaaaaaaa/json") == 2
+        finally:
+            collector.close()
@@ -0,0 +1,124 @@
+"""Tests for host sources and recording archives."""
+
+import gzip
+import os
+
+import pytest
+
+from monitor.collectors.host import (
+    ArchiveWriter,
+    HostSource,
+    ReplayHost,
+    capture,
+    read_archive,
+)
+from monitor.collectors.procfs import ProcFile
+
+
+def _host_tree(root, pids):
+    (root / "proc").mkdir(parents=True, exist_ok=True)
+    (root / "proc" / "meminfo").write_text("MemTotal:        1048576 kB\n")
+    for pid in pids:
+        d = root / "proc" / str(pid)
+        d.mkdir(exist_ok=True)
+        (d / "cmdline").write_bytes(b"/bin/sh\0-c\0true\0")
+    (root / "sys" / "block" / "sda" / "device").mkdir(parents=True, exist_ok=True)
+
+
+class TestHostSource:
+    """Tests for HostSource."""
+
+    def test_paths_under_root(self):
+        """Test that host paths map under an alternate root only."""
+        assert HostSource().path("/proc/stat") == "/proc/stat"
+        assert HostSource("/host").path("/proc/stat") == "/host/proc/stat"
+
+    def test_run(self):
+        """Test that commands run locally with text output."""
+        result = HostSource("/host").run(["echo", "hi"], timeout=5)
+        assert (result.returncode, result.stdout) == (0, "hi\n")
+
+
+class TestArchive:
+    """Tests for recording and replaying archives."""
+
+    def test_frames_hold_changes_only(self, tmp_path):
+        """Test delta encoding of files, removals and directories."""
+        live = tmp_path / "live"
+        _host_tree(live, [1, 2])
+        path = str(tmp_path / "rec.jsonl.gz")
+        writer = ArchiveWriter(path, {"cpu_count": 2, "clock_ticks": 100, "page_size": 4096})
+        files, dirs = capture(str(live))
+        assert "proc/1/cmdline" in files
+        assert dirs == {"sys/block/sda", "sys/block/sda/device"}
+        writer.write_frame(0.0, files, dirs, {"commands": {"hostname\0-I": [0, "10.0.0.2\n"]}})
+
+        (live / "proc" / "meminfo").write_text("MemTotal:        2097152 kB\n")
+        for name in os.listdir(live / "proc" / "2"):
+            os.unlink(live / "proc" / "2" / name)
+        os.rmdir(live / "proc" / "2")
+        files, dirs = capture(str(live))
+        writer.write_frame(2.0, files, dirs, {"commands": {}, "statvfs": {}})
+        writer.close()
+
+        header, frames = read_archive(path)
+        assert header["cpu_count"] == 2
+        first, second = list(frames)
+        assert first["commands"] == {"hostname\0-I": [0, "10.0.0.2\n"]}
+        assert second == {
+            "t": 2.0,
+            "files": {"proc/meminfo": "MemTotal:        2097152 kB\n"},
+            "removed": ["proc/2/cmdline"],
+        }
+
+    def test_replay_host(self, tmp_path):
+        """Test that frames are written in place and calls answered from the recording."""
+        path = str(tmp_path / "rec.jsonl.gz")
+        writer = ArchiveWriter(
+            path,
+            {
+                "cpu_count": 4,
+                "clock_ticks": 100,
+                "page_size": 4096,
+                "executables": {"/usr/bin/vcgencmd": True},
+            },
+        )
+        writer.write_frame(
+            0.0,
+            {"proc/meminfo": "MemTotal: 1 kB\n", "proc/7/cmdline": "sh\0"},
+            set(),
+            {
+                "commands": {"hostname\0-I": [0, "10.0.0.2\n"]},
+                "statvfs": {"/": [4096, 4096, 100, 50, 40, 10, 5, 5, 0, 255]},
+            },
+        )
+        writer.write_frame(2.0, {"proc/meminfo": "MemTotal: 2 kB\n"}, set(), {})
+        writer.close()
+
+        host = ReplayHost(path, str(tmp_path / "replay"))
+        assert host.cpu_count == 4
+        assert host.executable("/usr/bin/vcgencmd") is True
+        assert host.advance()
+        meminfo = ProcFile(host.path("/proc/meminfo"))
+        assert meminfo.read() == "MemTotal: 1 kB"
+        assert host.run(["hostname", "-I"], timeout=2).stdout == "10.0.0.2\n"
+        assert host.statvfs("/").f_blocks == 100
+        with pytest.raises(OSError):
+            host.run(["vcgencmd", "measure_temp"], timeout=2)
+
+        assert host.advance()
+        assert host.clock() == 2.0
+        assert meminfo.read() == "MemTotal: 2 kB"
+        assert not os.path.exists(host.path("/proc/7"))
+        assert not host.advance()
+        meminfo.close()
+        host.close()
+        assert not os.path.exists(tmp_path / "replay")
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a non-archive is refused."""
+        path = tmp_path / "x.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"not": "a recording"}\n')
+        with pytest.raises(ValueError):
+            read_archive(str(path))
@@ -33,3 +33,20 @@ class TestMemoryCollector:
         assert result["percent"] >= 0
         assert result["used_gb"] >= 0
         assert result["total_gb"] > 0  # Total should always be > 0
+
+    def test_reads_meminfo_file(self, tmp_path):
+        """Test figures from a given meminfo, re-read on each call."""
+        path = tmp_path / "meminfo"
+        path.write_text(
+            "MemTotal:        4194304 kB\nMemFree:          524288 kB\n"
+            "MemAvailable:    3145728 kB\nSwapTotal:       1048576 kB\n"
+            "SwapFree:         786432 kB\nHugePages_Total:       0\n"
+        )
+        collector = MemoryCollector(meminfo=str(path))
+        result = collector.collect()
+        assert result["total_gb"] == 4.0
+        assert result["percent"] == 25.0
+        assert result["swap_percent"] == 25.0
+
+        path.write_text("MemTotal:        4194304 kB\nMemAvailable:    2097152 kB\n")
+        assert collector.collect()["percent"] == 50.0
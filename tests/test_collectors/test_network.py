@@ -0,0 +1,113 @@
+"""Tests for network collector."""
+
+from monitor.collectors.network import NetworkCollector, interface_rates, parse_net_dev
+
+HEADER = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+"""
+
+
+def _net_dev(rows):
+    lines = [HEADER]
+    for iface, rx, rx_p, tx, tx_p in rows:
+        lines.append(f"{iface:>6}: {rx} {rx_p} 1 2 0 0 0 0 {tx} {tx_p} 0 0 0 0 0 0\n")
+    return "".join(lines)
+
+
+class TestParsing:
+    """Tests for /proc/net/dev parsing."""
+
+    def test_parse_net_dev(self):
+        """Test counters for each interface."""
+        counters = parse_net_dev(_net_dev([("eth0", 1000, 10, 2000, 20)]))
+        assert counters == {"eth0": (1000, 10, 1, 2, 2000, 20, 0, 0)}
+
+    def test_interface_rates(self):
+        """Test per-second rates and wrap handling."""
+        rates = interface_rates((0, 0, 0, 0, 0, 0, 0, 0), (2097152, 200, 2, 0, 0, 0, 0, 10), 2.0)
+        assert rates["rx_mb_s"] == 1.0
+        assert rates["rx_pps"] == 100.0
+        assert rates["rx_errors_s"] == 1.0
+        assert rates["tx_drops_s"] == 5.0
+        assert interface_rates((5,) * 8, (1,) * 8, 1.0)["rx_pps"] == 0.0
+
+
+class TestNetworkCollector:
+    """Tests for NetworkCollector."""
+
+    def _fixture(self, tmp_path):
+        sys_class = tmp_path / "class"
+        sys_virtual = tmp_path / "virtual"
+        for iface in ("eth0", "tailscale0", "docker0", "veth1a2b"):
+            (sys_class / iface).mkdir(parents=True)
+        for iface in ("tailscale0", "docker0", "veth1a2b"):
+            (sys_virtual / iface).mkdir(parents=True)
+        (sys_class / "eth0" / "operstate").write_text("up\n")
+        (sys_class / "eth0" / "speed").write_text("1000\n")
+        (sys_class / "tailscale0" / "speed").write_text("-1\n")
+        return sys_class, sys_virtual
+
+    def test_name(self):
+        """Test collector name."""
+        assert NetworkCollector().name == "network"
+
+    def test_per_interface_rates_and_physical_aggregate(self, tmp_path):
+        """Test that virtual interfaces are listed but not aggregated."""
+        sys_class, sys_virtual = self._fixture(tmp_path)
+        net_dev = tmp_path / "dev"
+        now = [0.0]
+        collector = NetworkCollector(
+            net_dev=str(net_dev),
+            sys_class_net=str(sys_class),
+            sys_virtual_net=str(sys_virtual),
+            clock=lambda: now[0],
+        )
+
+        rows = [
+            ("lo", 0, 0, 0, 0),
+            ("eth0", 0, 0, 0, 0),
+            ("tailscale0", 0, 0, 0, 0),
+            ("docker0", 0, 0, 0, 0),
+            ("veth1a2b", 0, 0, 0, 0),
+        ]
+        net_dev.write_text(_net_dev(rows))
+        first = collector.collect()
+        assert set(first["interfaces"]) == {"eth0", "tailscale0", "docker0"}
+        assert first["rx_mb_s"] == 0.0
+
+        mib = 1024 * 1024
+        rows = [
+            ("lo", 0, 0, 0, 0),
+            ("eth0", 4 * mib, 100, 2 * mib, 50),
+            ("tailscale0", 4 * mib, 80, 0, 0),  # Same traffic, tunnelled
+            ("docker0", 2 * mib, 10, 0, 0),
+            ("veth1a2b", 2 * mib, 10, 0, 0),
+        ]
+        net_dev.write_text(_net_dev(rows))
+        now[0] = 2.0
+        result = collector.collect()
+
+        eth0 = result["interfaces"]["eth0"]
+        assert eth0["rx_mb_s"] == 2.0
+        assert eth0["rx_pps"] == 50.0
+        assert eth0["virtual"] is False
+        assert eth0["operstate"] == "up"
+        assert eth0["speed_mbps"] == 1000
+        assert result["interfaces"]["tailscale0"]["virtual"] is True
+        assert result["interfaces"]["tailscale0"]["speed_mbps"] is None
+        assert result["rx_mb_s"] == 2.0
+        assert result["tx_mb_s"] == 1.0
+
+    def test_include_pattern(self, tmp_path):
+        """Test restricting interfaces with include patterns."""
+        sys_class, sys_virtual = self._fixture(tmp_path)
+        net_dev = tmp_path / "dev"
+        net_dev.write_text(_net_dev([("eth0", 0, 0, 0, 0), ("wlan0", 0, 0, 0, 0)]))
+        collector = NetworkCollector(
+            include=("wlan*",),
+            net_dev=str(net_dev),
+            sys_class_net=str(sys_class),
+            sys_virtual_net=str(sys_virtual),
+        )
+        assert list(collector.collect()["interfaces"]) == ["wlan0"]
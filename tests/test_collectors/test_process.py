@@ -0,0 +1,209 @@
+"""Tests for the /proc process scanner and process collector."""
+
+import os
+
+from monitor.collectors.process import ProcessCollector
+from monitor.collectors.procscan import (
+    ProcessScanner,
+    parse_cgroup,
+    parse_stat,
+    unit_from_cgroup,
+)
+
+
+def _write_proc(
+    root, pid, comm, utime, stime, starttime=1000, rss_pages=256, cmdline=None, cgroup=None
+):
+    """Write a minimal /proc/[pid] directory."""
+    d = root / str(pid)
+    d.mkdir(exist_ok=True)
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194560", "0", "0", "0", "0"]
+    fields += [str(utime), str(stime), "0", "0", "20", "0", "3", "0", str(starttime)]
+    fields += ["1000000", str(rss_pages), "18446744073709551615"]
+    (d / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)}\n")
+    if cmdline is not None:
+        (d / "cmdline").write_bytes(cmdline)
+    elif not (d / "cmdline").exists():
+        (d / "cmdline").write_bytes(b"")
+    if cgroup is not None:
+        (d / "cgroup").write_text(f"0::{cgroup}\n")
+
+
+def _write_io(root, pid, read_bytes, write_bytes):
+    (root / str(pid) / "io").write_text(
+        f"rchar: 0\nwchar: 0\nread_bytes: {read_bytes}\nwrite_bytes: {write_bytes}\n"
+    )
+
+
+def _scanner(root, now):
+    (root / "meminfo").write_text("MemTotal:        1048576 kB\n")
+    return ProcessScanner(
+        str(root), cpu_count=4, clock_ticks=100, page_size=4096, clock=lambda: now[0]
+    )
+
+
+class TestParseStat:
+    """Tests for /proc/[pid]/stat parsing."""
+
+    def test_comm_with_spaces_and_parens(self):
+        """Test that comm is split on the last closing parenthesis."""
+        comm, fields = parse_stat("42 (tmux: server) (x)) R 1 42 42\n")
+        assert comm == "tmux: server) (x)"
+        assert fields == ["R", "1", "42", "42"]
+
+    def test_malformed(self):
+        """Test rejecting text without a comm field."""
+        assert parse_stat("garbage") is None
+
+
+class TestCgroups:
+    """Tests for cgroup parsing."""
+
+    def test_unified_path(self):
+        """Test the v2 entry, with the systemd hierarchy as v1 fallback."""
+        assert parse_cgroup("0::/system.slice/nginx.service\n") == "/system.slice/nginx.service"
+        hybrid = "4:memory:/x\n1:name=systemd:/user.slice/session-2.scope\n0::/\n"
+        assert parse_cgroup(hybrid) == "/user.slice/session-2.scope"
+        assert parse_cgroup("") == "/"
+
+    def test_unit(self):
+        """Test picking the innermost service or scope."""
+        assert unit_from_cgroup("/system.slice/docker-ab12.scope") == "docker-ab12.scope"
+        assert (
+            unit_from_cgroup("/user.slice/user-1000.slice/user@1000.service/app.slice/x.scope")
+            == "x.scope"
+        )
+        assert unit_from_cgroup("/system.slice") == "/system.slice"
+
+
+class TestProcessScanner:
+    """Tests for ProcessScanner."""
+
+    def test_interval_cpu(self, tmp_path):
+        """Test CPU% from tick deltas, normalized to all cores."""
+        now = [0.0]
+        _write_proc(tmp_path, 10, "python3", 100, 50, cmdline=b"python3\0app.py\0")
+        _write_proc(tmp_path, 20, "kworker/0:1", 5, 5)
+        scanner = _scanner(tmp_path, now)
+
+        first = {p.pid: p for p in scanner.scan()}
+        assert first[10].cpu == 0.0
+        assert first[10].identity.cmdline == "python3 app.py"
+        assert first[20].identity.cmdline == "[kworker/0:1]"
+        assert first[10].rss == 256 * 4096
+        assert first[10].mem == 0.1
+
+        # 200 ticks over 2 s on 4 cores (800 available) -> 25%
+        _write_proc(tmp_path, 10, "python3", 250, 100)
+        now[0] = 2.0
+        second = {p.pid: p for p in scanner.scan()}
+        assert second[10].cpu == 25.0
+        assert second[20].cpu == 0.0
+        assert [p.pid for p in scanner.top(1, key=lambda p: p.cpu)] == [10]
+
+    def test_identity_cached_and_pid_reuse(self, tmp_path):
+        """Test that identity is read once and a recycled pid starts fresh."""
+        now = [0.0]
+        _write_proc(tmp_path, 10, "old", 100, 0, starttime=500, cmdline=b"old\0")
+        scanner = _scanner(tmp_path, now)
+        first = scanner.scan()[0]
+
+        # Unchanged identity files are not re-read
+        (tmp_path / "10" / "cmdline").write_bytes(b"changed\0")
+        now[0] = 1.0
+        assert scanner.scan()[0].identity is first.identity
+
+        # Same pid, new process: new identity, no bogus delta
+        _write_proc(tmp_path, 10, "new", 900, 0, starttime=800, cmdline=b"new\0")
+        now[0] = 2.0
+        reused = scanner.scan()[0]
+        assert reused.identity.cmdline == "new"
+        assert reused.cpu == 0.0
+
+    def test_exited_process_dropped(self, tmp_path):
+        """Test that exited processes leave the table."""
+        now = [0.0]
+        _write_proc(tmp_path, 10, "a", 0, 0)
+        _write_proc(tmp_path, 11, "b", 0, 0)
+        scanner = _scanner(tmp_path, now)
+        assert len(scanner.scan()) == 2
+        for name in os.listdir(tmp_path / "11"):
+            os.remove(tmp_path / "11" / name)
+        os.rmdir(tmp_path / "11")
+        assert [p.pid for p in scanner.scan()] == [10]
+
+    def test_io_rates(self, tmp_path):
+        """Test per-process I/O rates and denied io files."""
+        now = [0.0]
+        _write_proc(tmp_path, 10, "writer", 0, 0)
+        _write_proc(tmp_path, 11, "secret", 0, 0)  # No io file: permission denied
+        _write_io(tmp_path, 10, 0, 0)
+        scanner = _scanner(tmp_path, now)
+        scanner.scan()
+
+        _write_io(tmp_path, 10, 1024 * 1024, 2 * 1024 * 1024)
+        now[0] = 2.0
+        samples = {p.pid: p for p in scanner.scan()}
+        assert samples[10].to_dict()["read_kb_s"] == 512.0
+        assert samples[10].to_dict()["write_kb_s"] == 1024.0
+        assert samples[11].io_read == 0.0
+
+    def test_query_sort_page_and_filter(self, tmp_path):
+        """Test server-side ordering, paging and name filtering."""
+        now = [0.0]
+        for pid, rss in ((1, 10), (2, 30), (3, 20), (4, 40)):
+            _write_proc(tmp_path, pid, f"worker{pid}", 0, 0, rss_pages=rss)
+        _write_proc(tmp_path, 5, "chromium", 0, 0, rss_pages=5, cmdline=b"/usr/lib/chromium\0")
+        scanner = _scanner(tmp_path, now)
+        scanner.scan()
+
+        total, page = scanner.query("rss", limit=2, offset=1)
+        assert total == 5
+        assert [p.pid for p in page] == [2, 3]
+        assert scanner.query("rss", limit=2, offset=1)[1] == page  # Reused selection
+        assert [p.pid for p in scanner.query("pid", limit=2)[1]] == [1, 2]
+        total, page = scanner.query("mem", name_filter="CHROM")
+        assert total == 1
+        assert page[0].pid == 5
+
+    def test_groups(self, tmp_path):
+        """Test totals by executable and by systemd unit from one scan."""
+        now = [0.0]
+        service = "/system.slice/gunicorn.service"
+        argv = b"/usr/bin/gunicorn\0app\0"
+        _write_proc(tmp_path, 10, "gunicorn", 0, 0, cmdline=argv, cgroup=service)
+        _write_proc(tmp_path, 11, "gunicorn", 0, 0, cmdline=argv, cgroup=service)
+        _write_proc(tmp_path, 12, "nginx", 0, 0, cmdline=b"nginx: worker process\0")
+        scanner = _scanner(tmp_path, now)
+        scanner.scan()
+
+        _write_proc(tmp_path, 10, "gunicorn", 100, 0, rss_pages=512)
+        _write_proc(tmp_path, 11, "gunicorn", 60, 0)
+        _write_proc(tmp_path, 12, "nginx", 20, 0)
+        now[0] = 1.0
+        scanner.scan()
+
+        by_exe = scanner.groups("exe")
+        assert [g.key for g in by_exe] == ["gunicorn", "nginx"]
+        assert by_exe[0].count == 2
+        assert by_exe[0].to_dict()["cpu"] == 40.0  # 160 of 400 ticks
+        assert by_exe[0].rss == (512 + 256) * 4096
+        assert scanner.groups("unit", sort="count")[0].key == "gunicorn.service"
+        assert [g.key for g in scanner.groups("exe", sort="cpu", limit=1)] == ["gunicorn"]
+
+
+class TestProcessCollector:
+    """Tests for ProcessCollector."""
+
+    def test_name(self):
+        """Test collector name."""
+        assert ProcessCollector().name == "process"
+
+    def test_collect_live_system(self):
+        """Test reading the running system's process table."""
+        collector = ProcessCollector(limit=5)
+        collector.collect()
+        processes = collector.collect()
+        assert 0 < len(processes) <= 5
+        assert {"pid", "name", "cpu", "mem", "user", "rss_mb"} <= set(processes[0])
+        assert any(p.pid == os.getpid() for p in collector.scanner.table)
@@ -0,0 +1,89 @@
+"""Tests for kept-open procfs/sysfs readers."""
+
+import mmap
+import os
+
+import pytest
+
+from monitor.collectors.procfs import ProcFile, read_once
+
+
+class TestProcFile:
+    """Tests for ProcFile."""
+
+    def test_rereads_from_start(self, tmp_path):
+        """Test that each read returns current contents through one descriptor."""
+        path = tmp_path / "temp"
+        path.write_text("1000\n")
+        attr = ProcFile(str(path))
+        assert attr.read_int() == 1000
+        fd = attr._fd
+        with open(path, "r+") as f:
+            f.write("2000\n")
+        assert attr.read_int() == 2000
+        assert attr._fd == fd
+        attr.close()
+
+    def test_hex_value(self, tmp_path):
+        """Test 0x-prefixed values such as get_throttled."""
+        path = tmp_path / "get_throttled"
+        path.write_text("0x50005\n")
+        assert ProcFile(str(path)).read_int() == 0x50005
+
+    def test_buffer_grows(self, tmp_path):
+        """Test that a file larger than the buffer is read whole."""
+        path = tmp_path / "stat"
+        content = "".join(f"cpu{i} 1 2 3 4 5 6 7\n" for i in range(100))
+        path.write_text(content)
+        assert ProcFile(str(path), size=64).read_text() == content
+
+    def test_reads_past_first_page(self):
+        """Test that a seq_file longer than the page it returns per read is read whole."""
+        with open("/proc/self/maps", "rb") as f:
+            first_page = os.read(f.fileno(), 1 << 20)
+        if len(first_page) >= 4096:
+            pytest.skip("/proc returns more than a page per read here")
+        attr = ProcFile("/proc/self/maps", size=64)
+        # Map enough extra regions that maps spans several pages
+        pages = [mmap.mmap(-1, 4096) for _ in range(200)]
+        try:
+            with open("/proc/self/maps", "rb") as f:
+                expected_len = len(f.read())
+            maps = attr.read_bytes()
+        finally:
+            for page in pages:
+                page.close()
+            attr.close()
+        assert len(maps) > 4096
+        assert maps.endswith(b"\n")
+        assert abs(len(maps) - expected_len) < 4096
+
+    def test_short_reads(self, tmp_path, monkeypatch):
+        """Test that short reads continue at the next offset until EOF."""
+        path = tmp_path / "diskstats"
+        content = "".join(f"   8 {i} sd{i} 1 2 3 4\n" for i in range(200)).encode()
+        path.write_bytes(content)
+        preadv = os.preadv
+
+        def short_preadv(fd, buffers, offset):
+            return preadv(fd, [buffers[0][:100]], offset)
+
+        monkeypatch.setattr(os, "preadv", short_preadv)
+        assert ProcFile(str(path), size=256).read_bytes() == content
+
+    def test_missing(self, tmp_path):
+        """Test that read() reports unreadable files as None and read_text() raises."""
+        attr = ProcFile(str(tmp_path / "missing"))
+        assert attr.read() is None
+        assert attr.read_int() is None
+        with pytest.raises(OSError):
+            attr.read_text()
+
+
+def test_read_once(tmp_path):
+    """Test a single bare read."""
+    path = tmp_path / "stat"
+    path.write_bytes(b"1 (sh) S 0\n")
+    assert read_once(str(path)) == b"1 (sh) S 0\n"
+    with pytest.raises(OSError):
+        read_once(str(tmp_path / "missing"))
@@ -0,0 +1,125 @@
+"""Tests for sensors collector."""
+
+from monitor.collectors.sensors import SensorsCollector, parse_throttled
+
+
+def _fake_vcgencmd(tmp_path):
+    """A vcgencmd stand-in that logs each invocation."""
+    log = tmp_path / "calls"
+    script = tmp_path / "vcgencmd"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'echo "$@" >> {log}\n'
+        'case "$1" in\n'
+        "  measure_volts) echo volt=0.8600V ;;\n"
+        '  measure_temp) echo "temp=48.3\'C" ;;\n'
+        "  get_throttled) echo throttled=0x50000 ;;\n"
+        "esac\n"
+    )
+    script.chmod(0o755)
+    return str(script), log
+
+
+def _sysfs(tmp_path):
+    thermal = tmp_path / "thermal"
+    zone = thermal / "thermal_zone0"
+    zone.mkdir(parents=True)
+    (zone / "type").write_text("cpu-thermal\n")
+    (zone / "temp").write_text("51234\n")
+
+    hwmon = tmp_path / "hwmon"
+    volt = hwmon / "hwmon1"
+    volt.mkdir(parents=True)
+    (volt / "name").write_text("rpi_volt\n")
+    (volt / "in0_lcrit_alarm").write_text("0\n")
+    nvme = hwmon / "hwmon2"
+    nvme.mkdir()
+    (nvme / "name").write_text("nvme\n")
+    (nvme / "temp1_input").write_text("40850\n")
+    (nvme / "temp1_label").write_text("Composite\n")
+
+    firmware = tmp_path / "get_throttled"
+    firmware.write_text("0\n")
+    return thermal, hwmon, firmware
+
+
+class TestParseThrottled:
+    """Tests for the throttling bitmask."""
+
+    def test_current_and_past_bits(self):
+        """Test that low bits are current state and bits 16+ history."""
+        flags = parse_throttled(0x50005)
+        assert flags["raw"] == 0x50005
+        assert flags["current_undervolt"] is True
+        assert flags["current_throttled"] is True
+        assert flags["current_arm_freq_capped"] is False
+        assert flags["past_undervolt"] is True
+        assert flags["past_throttled"] is True
+        assert flags["past_soft_temp"] is False
+
+
+class TestSensorsCollector:
+    """Tests for SensorsCollector."""
+
+    def test_name(self):
+        """Test collector name."""
+        assert SensorsCollector().name == "sensors"
+
+    def test_sysfs_first_vcgencmd_for_voltage_only(self, tmp_path):
+        """Test that vcgencmd runs once, only for what sysfs lacks."""
+        thermal, hwmon, firmware = _sysfs(tmp_path)
+        vcgencmd, log = _fake_vcgencmd(tmp_path)
+        now = [0.0]
+        collector = SensorsCollector(
+            thermal_root=str(thermal),
+            hwmon_root=str(hwmon),
+            throttled_globs=(str(firmware),),
+            vcgencmd=vcgencmd,
+            clock=lambda: now[0],
+        )
+
+        result = collector.collect()
+        assert result["temp"] == 51.2
+        assert result["temps"] == {"cpu-thermal": 51.2, "nvme Composite": 40.9}
+        assert result["voltage"] == 0.86
+        assert result["throttled"]["raw"] == 0
+
+        # Live sysfs values change between collects; vcgencmd output is cached
+        (thermal / "thermal_zone0" / "temp").write_text("60000\n")
+        (hwmon / "hwmon1" / "in0_lcrit_alarm").write_text("1\n")
+        now[0] = 5.0
+        result = collector.collect()
+        assert result["temp"] == 60.0
+        assert result["throttled"]["current_undervolt"] is True
+        assert result["throttled"]["raw"] == 1
+        assert log.read_text().splitlines() == ["measure_volts core"]
+        collector.close()
+
+    def test_vcgencmd_fallback_without_sysfs(self, tmp_path):
+        """Test the fallback path on a kernel without the sysfs sensors."""
+        vcgencmd, log = _fake_vcgencmd(tmp_path)
+        collector = SensorsCollector(
+            thermal_root=str(tmp_path / "none"),
+            hwmon_root=str(tmp_path / "none"),
+            throttled_globs=(),
+            vcgencmd=vcgencmd,
+        )
+        result = collector.collect()
+        assert result["temp"] == 48.3
+        assert result["throttled"]["past_throttled"] is True
+        assert len(log.read_text().splitlines()) == 3
+
+    def test_non_pi_without_sensors(self, tmp_path):
+        """Test a host with neither sysfs sensors nor vcgencmd."""
+        collector = SensorsCollector(
+            thermal_root=str(tmp_path),
+            hwmon_root=str(tmp_path),
+            throttled_globs=(),
+            vcgencmd=str(tmp_path / "vcgencmd"),
+        )
+        assert collector.collect() == {
+            "temp": None,
+            "temps": {},
+            "voltage": None,
+            "throttled": None,
+        }
@@ -0,0 +1,156 @@
+"""Tests for Tailscale collector and the unix socket HTTP client."""
+
+import pytest
+
+from monitor.collectors.tailscale import TailscaleCollector, summarize_peers
+from monitor.collectors.unixhttp import UnixHTTPClient, UnixHTTPError
+from monitor.handlers import TailscaleHandler
+
+SELF_STATUS = {
+    "BackendState": "Running",
+    "TailscaleIPs": ["100.64.0.1", "fd7a:115c:a1e0::1"],
+    "Self": {"HostName": "pi"},
+}
+
+FULL_STATUS = {
+    **SELF_STATUS,
+    "Peer": {
+        "key1": {
+            "HostName": "laptop",
+            "DNSName": "laptop.tail1234.ts.net.",
+            "TailscaleIPs": ["100.64.0.2"],
+            "Online": True,
+            "CurAddr": "192.168.1.20:41641",
+        },
+        "key2": {
+            "HostName": "phone",
+            "TailscaleIPs": ["100.64.0.3"],
+            "Online": True,
+            "CurAddr": "",
+        },
+        "key3": {"HostName": "nas", "TailscaleIPs": ["100.64.0.4"], "Online": False},
+    },
+}
+
+ROUTES = {
+    "GET /localapi/v0/status?peers=false": (200, SELF_STATUS),
+    "GET /localapi/v0/status": (200, FULL_STATUS),
+    "POST /localapi/v0/ping?ip=100.64.0.2&type=disco": (200, {"LatencySeconds": 0.0123}),
+}
+
+
+class TestUnixHTTPClient:
+    """Tests for UnixHTTPClient."""
+
+    def test_reuses_connection(self, unix_http_server):
+        """Test that requests share one kept-alive connection."""
+        server = unix_http_server({"GET /a": (200, {"n": 1})})
+        client = UnixHTTPClient(server.path)
+        assert client.get_json("/a") == {"n": 1}
+        assert client.get_json("/a") == {"n": 1}
+        assert server.connections == 1
+        client.close()
+
+    def test_error_status_and_missing_socket(self, unix_http_server, tmp_path):
+        """Test error statuses and an absent daemon surface as OSError."""
+        server = unix_http_server({})
+        with pytest.raises(UnixHTTPError) as exc:
+            UnixHTTPClient(server.path).get_json("/missing")
+        assert exc.value.status == 404
+        with pytest.raises(OSError):
+            UnixHTTPClient(str(tmp_path / "none.sock")).get_json("/")
+
+
+class TestTailscaleCollector:
+    """Tests for TailscaleCollector."""
+
+    def test_name(self):
+        """Test collector name."""
+        assert TailscaleCollector().name == "tailscale"
+
+    def test_summarize_peers(self):
+        """Test online and direct peer counts."""
+        assert summarize_peers(FULL_STATUS) == {"total": 3, "online": 2, "direct": 1}
+
+    def test_local_api(self, unix_http_server):
+        """Test self status, slow-cadence peer counts and ping over the socket."""
+        server = unix_http_server(ROUTES)
+        now = [0.0]
+        collector = TailscaleCollector(
+            cache_ttl=15.0,
+            socket_path=server.path,
+            cli="/nonexistent/tailscale",
+            peer_interval=60.0,
+            ping_peers=("laptop", "nas"),
+            clock=lambda: now[0],
+        )
+        result = collector.collect()
+        assert result["tailscale_connected"] is True
+        assert result["tailscale_ip"] == "100.64.0.1"
+        assert result["source"] == "localapi"
+        # Peers and pings arrive from the background refresh
+        assert result["peers"] is None
+        collector._peer_thread.join(timeout=5)
+        result = collector.collect()
+        assert result["peers"] == {"total": 3, "online": 2, "direct": 1}
+        assert result["latency_ms"] == {"laptop": 12.3, "nas": None}
+
+        # Cached within the TTL; after it only the self status is re-read
+        now[0] = 20.0
+        assert collector.collect()["peers"] == {"total": 3, "online": 2, "direct": 1}
+        assert server.paths().count("GET /localapi/v0/status?peers=false") == 2
+        assert server.paths().count("GET /localapi/v0/status") == 1
+        # One connection for the status, one for the peer refresh
+        assert server.connections == 2
+        assert all(h.get("Sec-Tailscale") == "localapi" for _, h in server.requests)
+        collector.close()
+
+    def test_cli_fallback(self, tmp_path):
+        """Test the CLI path when the socket is unavailable."""
+        cli = tmp_path / "tailscale"
+        cli.write_text(
+            '#!/bin/sh\necho \'{"BackendState": "Running", "TailscaleIPs": ["100.64.0.9"]}\'\n'
+        )
+        cli.chmod(0o755)
+        collector = TailscaleCollector(socket_path=str(tmp_path / "none.sock"), cli=str(cli))
+        assert collector.cost == "heavy"
+        result = collector.collect()
+        assert result["source"] == "cli"
+        assert result["tailscale_ip"] == "100.64.0.9"
+        assert result["peers"] == {"total": 0, "online": 0, "direct": 0}
+
+    def test_refresh_does_not_block_readers(self, unix_http_server):
+        """Test that callers get the previous status while a refresh is in flight."""
+        server = unix_http_server(ROUTES)
+        now = [0.0]
+        collector = TailscaleCollector(
+            cache_ttl=15.0,
+            socket_path=server.path,
+            cli="/nonexistent/tailscale",
+            clock=lambda: now[0],
+        )
+        assert collector.cost == "light"
+        first = collector.collect()
+        now[0] = 20.0
+        collector._fetching = True  # As if another thread were mid-fetch
+        assert collector.collect() == first
+        assert server.paths().count("GET /localapi/v0/status?peers=false") == 1
+        collector.close()
+
+    def test_unavailable(self, tmp_path):
+        """Test the disconnected default when neither source works."""
+        collector = TailscaleCollector(
+            socket_path=str(tmp_path / "none.sock"), cli=str(tmp_path / "none")
+        )
+        result = collector.collect()
+        assert result["tailscale_connected"] is False
+        assert result["source"] is None
+
+    def test_handler_shares_collector(self, unix_http_server):
+        """Test that the handler reads the shared collector's cache."""
+        server = unix_http_server(ROUTES)
+        collector = TailscaleCollector(socket_path=server.path, cli="/nonexistent/tailscale")
+        collector.collect()
+        assert TailscaleHandler(collector).get_info()["tailscale_ip"] == "100.64.0.1"
+        assert server.paths().count("GET /localapi/v0/status?peers=false") == 1
+        collector.close()
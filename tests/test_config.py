@@ -2,7 +2,15 @@
 
 import pytest
 
-from monitor.config import CacheConfig, Config, ServerConfig, SpeedtestConfig
+from monitor.config import (
+    CacheConfig,
+    Config,
+    HostConfig,
+    SamplerConfig,
+    ServerConfig,
+    SpeedtestConfig,
+    TailscaleConfig,
+)
 
 
 class TestServerConfig:
@@ -32,6 +40,44 @@ class TestCacheConfig:
         assert config.tailscale_cache_ttl == 15.0
 
 
+class TestSamplerConfig:
+    """Tests for SamplerConfig."""
+
+    def test_default_values(self):
+        """Test default sampler configuration."""
+        config = SamplerConfig()
+        assert config.enabled is True
+        assert config.interval_sec == 2.0
+        assert config.collector_intervals == {}
+
+    def test_collector_intervals_from_env(self, monkeypatch):
+        """Test per-collector interval overrides."""
+        monkeypatch.setenv("MONITOR_COLLECTOR_INTERVALS", "disk=30, overview=60")
+        config = SamplerConfig()
+        assert config.collector_intervals == {"disk": 30.0, "overview": 60.0}
+
+
+class TestTailscaleConfig:
+    """Tests for TailscaleConfig."""
+
+    def test_default_and_ping_peers(self, monkeypatch):
+        """Test the default socket and parsing of ping targets."""
+        assert TailscaleConfig().socket == "/var/run/tailscale/tailscaled.sock"
+        assert TailscaleConfig().ping_peers == ()
+        monkeypatch.setenv("MONITOR_TAILSCALE_PING", "laptop, 100.64.0.2")
+        assert TailscaleConfig().ping_peers == ("laptop", "100.64.0.2")
+
+
+class TestHostConfig:
+    """Tests for HostConfig."""
+
+    def test_root_from_env(self, monkeypatch):
+        """Test the live root default and an override."""
+        assert HostConfig().root == "/"
+        monkeypatch.setenv("MONITOR_HOST_ROOT", "/host")
+        assert HostConfig().root == "/host"
+
+
 class TestSpeedtestConfig:
     """Tests for SpeedtestConfig."""
 
@@ -62,6 +108,16 @@ class TestConfig:
         with pytest.raises(ValueError):
             Config(server=ServerConfig(port=70000))
 
+    def test_invalid_server_engine(self):
+        """Test that an unknown server engine raises error."""
+        with pytest.raises(ValueError):
+            Config(server=ServerConfig(engine="twisted"))
+
+    def test_invalid_sampler_interval(self):
+        """Test that non-positive sampler interval raises error."""
+        with pytest.raises(ValueError):
+            Config(sampler=SamplerConfig(interval_sec=0))
+
     def test_invalid_speedtest_interval(self):
         """Test that invalid speedtest interval raises error."""
         with pytest.raises(ValueError):
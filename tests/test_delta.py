@@ -0,0 +1,59 @@
+"""Tests for delta module."""
+
+from monitor.delta import SnapshotLog, apply_delta, diff
+from monitor.sampler import Snapshot
+
+
+class TestDiff:
+    """Tests for diff and apply_delta."""
+
+    def test_only_changed_leaves(self):
+        """Test that unchanged leaves are omitted."""
+        old = {"cpu": {"percent": 1.0, "freq": 1500}, "overview": {"os": "Linux"}}
+        new = {"cpu": {"percent": 2.0, "freq": 1500}, "overview": {"os": "Linux"}}
+        changes, removed = diff(old, new)
+        assert changes == {"cpu": {"percent": 2.0}}
+        assert removed == []
+
+    def test_lists_are_leaves(self):
+        """Test that lists are replaced wholesale."""
+        changes, _ = diff({"processes": [1, 2]}, {"processes": [1, 3]})
+        assert changes == {"processes": [1, 3]}
+
+    def test_removed_and_added_keys(self):
+        """Test that key additions and removals are reported."""
+        old = {"a": {"x": 1, "y": 2}}
+        new = {"a": {"x": 1}, "b": None}
+        changes, removed = diff(old, new)
+        assert changes == {"b": None}
+        assert removed == [["a", "y"]]
+
+    def test_apply_round_trip(self):
+        """Test that applying a diff reproduces the new payload."""
+        old = {"a": {"x": 1, "y": 2}, "l": [1], "t": 1}
+        new = {"a": {"x": 5}, "l": [1, 2], "t": True, "n": {"z": 0}}
+        changes, removed = diff(old, new)
+        assert apply_delta(old, changes, removed) == new
+        assert old == {"a": {"x": 1, "y": 2}, "l": [1], "t": 1}
+
+
+class TestSnapshotLog:
+    """Tests for SnapshotLog."""
+
+    def test_delta_since_known_seq(self):
+        """Test delta against a retained snapshot."""
+        log = SnapshotLog(capacity=5)
+        first = Snapshot(seq=1, timestamp=0.0, data={"a": 1, "b": 1})
+        second = Snapshot(seq=2, timestamp=1.0, data={"a": 1, "b": 2})
+        log.record(first)
+        log.record(second)
+
+        assert log.delta(1, second) == {"seq": 2, "since": 1, "changes": {"b": 2}, "removed": []}
+        assert log.delta(2, second)["changes"] == {}
+
+    def test_too_far_behind(self):
+        """Test that evicted sequence numbers return None."""
+        log = SnapshotLog(capacity=2)
+        for seq in range(1, 5):
+            log.record(Snapshot(seq=seq, timestamp=0.0, data={"seq": seq}))
+        assert log.delta(1, Snapshot(seq=4, timestamp=0.0, data={})) is None
@@ -0,0 +1,50 @@
+"""Tests for the process list handler."""
+
+import pytest
+
+from monitor.collectors.procscan import ProcessScanner
+from monitor.handlers import ProcessesHandler
+
+
+@pytest.fixture
+def handler():
+    scanner = ProcessScanner()
+    scanner.scan()
+    return ProcessesHandler(scanner)
+
+
+class TestProcessesHandler:
+    """Tests for ProcessesHandler."""
+
+    def test_defaults(self, handler):
+        """Test the default CPU-ordered first page."""
+        result = handler.get_processes({})
+        assert result["sort"] == "cpu"
+        assert result["offset"] == 0
+        assert result["limit"] == 10
+        assert 0 < len(result["processes"]) <= 10
+        assert result["total"] >= len(result["processes"])
+
+    def test_pid_order_and_offset(self, handler):
+        """Test ascending pid order across pages."""
+        first = handler.get_processes({"sort": ["pid"], "limit": ["2"]})["processes"]
+        second = handler.get_processes({"sort": ["pid"], "limit": ["2"], "offset": ["1"]})
+        assert first[0]["pid"] < first[1]["pid"]
+        assert second["processes"][0] == first[1]
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"sort": ["name"]}, {"limit": ["x"]}, {"limit": ["501"]}, {"offset": ["-1"]}],
+    )
+    def test_invalid_params(self, handler, params):
+        """Test rejection of malformed parameters."""
+        with pytest.raises(ValueError):
+            handler.get_processes(params)
+
+    def test_groups(self, handler):
+        """Test grouping the live table by user."""
+        result = handler.get_groups({"by": ["user"], "sort": ["count"]})
+        assert result["by"] == "user"
+        assert result["groups"][0]["count"] >= 1
+        with pytest.raises(ValueError):
+            handler.get_groups({"by": ["pid"]})
@@ -0,0 +1,80 @@
+"""Tests for system stats handler."""
+
+from monitor.collectors import LoadCollector, MemoryCollector
+from monitor.handlers.system import SystemStatsHandler
+
+
+class TestSystemStatsHandler:
+    """Tests for SystemStatsHandler."""
+
+    def test_get_stats_without_sampler(self, test_config):
+        """Test that stats are collected inline when the sampler is stopped."""
+        handler = SystemStatsHandler(test_config)
+        stats = handler.get_stats()
+        for key in ("overview", "cpu", "memory", "disk", "network", "sensors"):
+            assert key in stats
+        assert isinstance(stats["stale"], list)
+        # Overview carries container counts only when Docker answered
+        if not stats["docker"]["available"]:
+            assert stats["overview"]["docker"] is None
+
+    def test_get_stats_returns_sampler_snapshot(self, test_config):
+        """Test that a running sampler serves its latest snapshot."""
+        handler = SystemStatsHandler(test_config)
+        handler.sampler.start()
+        try:
+            snapshot = handler.get_snapshot()
+            assert snapshot is handler.sampler.latest
+            assert handler.get_stats() is snapshot.data
+        finally:
+            handler.stop()
+
+    def test_delta_responses(self, test_config):
+        """Test full and delta responses keyed by sequence number."""
+        handler = SystemStatsHandler(test_config)
+        payload = handler.get_payload()
+        seq = payload["seq"]
+
+        delta = handler.get_delta(seq)
+        assert delta["seq"] == seq
+        assert delta["changes"] == {}
+
+        full = handler.get_delta(seq + 1000)
+        assert full["full"] is True
+        assert "cpu" in full["data"]
+
+    def test_etag_tracks_snapshot(self, test_config):
+        """Test that ETags change with the snapshot and the delta base."""
+        handler = SystemStatsHandler(test_config)
+        first = handler.sampler.sample_now()
+        second = handler.sampler.sample_now()
+        assert handler.etag(first) != handler.etag(second)
+        assert handler.etag(second) != handler.etag(second, since=first.seq)
+        assert handler.etag(second) == handler.etag(second)
+
+    def test_collector_overrides(self, test_config, tmp_path):
+        """Test that given collectors replace the defaults for their sections."""
+        meminfo = tmp_path / "meminfo"
+        meminfo.write_text("MemTotal:        2097152 kB\nMemAvailable:    1048576 kB\n")
+        handler = SystemStatsHandler(
+            test_config, collectors={"memory": MemoryCollector(meminfo=str(meminfo))}
+        )
+        memory = handler.get_stats()["memory"]
+        assert (memory["total_gb"], memory["percent"]) == (2.0, 50.0)
+
+    def test_load_refreshes_between_overviews(self, test_config, tmp_path):
+        """Test that load averages update on every sample, not with the overview."""
+        loadavg = tmp_path / "loadavg"
+        uptime = tmp_path / "uptime"
+        uptime.write_text("90061.5 100.0\n")
+        loadavg.write_text("0.50 0.40 0.30 1/100 42\n")
+        handler = SystemStatsHandler(
+            test_config,
+            collectors={"load": LoadCollector(uptime=str(uptime), loadavg=str(loadavg))},
+        )
+        first = handler.sampler.sample_now().data["overview"]
+        loadavg.write_text("2.00 0.80 0.40 3/100 43\n")
+        second = handler.sampler.sample_now().data["overview"]
+        assert (first["load_1"], second["load_1"]) == ("0.50", "2.00")
+        assert second["uptime"] == "1d 1h 1m"
+        assert second["ip"] == first["ip"]
@@ -0,0 +1,82 @@
+"""Tests for history module."""
+
+import math
+
+import pytest
+
+from monitor.history import MetricHistory, extract_metric
+from monitor.sampler import Snapshot
+
+
+class TestExtractMetric:
+    """Tests for extract_metric."""
+
+    def test_reads_nested_value(self):
+        """Test dotted path lookup."""
+        assert extract_metric({"cpu": {"percent": 12.5}}, "cpu.percent") == 12.5
+
+    def test_missing_value_is_nan(self):
+        """Test that missing or non-numeric values become NaN."""
+        assert math.isnan(extract_metric({}, "cpu.percent"))
+        assert math.isnan(extract_metric({"sensors": {"temp": None}}, "sensors.temp"))
+
+
+class TestMetricHistory:
+    """Tests for MetricHistory."""
+
+    def test_query_returns_samples_in_order(self):
+        """Test that samples come back oldest-first."""
+        history = MetricHistory(capacity=10, metrics=("a", "b"))
+        for i in range(3):
+            history.append(100.0 + i, [i, i * 2])
+
+        result = history.query()
+        assert result["timestamps"] == [100.0, 101.0, 102.0]
+        assert result["metrics"]["a"] == [0, 1, 2]
+        assert result["metrics"]["b"] == [0, 2, 4]
+
+    def test_ring_buffer_wraps(self):
+        """Test that the oldest samples are overwritten at capacity."""
+        history = MetricHistory(capacity=3, metrics=("a",))
+        for i in range(5):
+            history.append(float(i), [i])
+
+        assert len(history) == 3
+        result = history.query()
+        assert result["timestamps"] == [2.0, 3.0, 4.0]
+        assert result["metrics"]["a"] == [2, 3, 4]
+
+    def test_query_time_range(self):
+        """Test inclusive start/end filtering across the wrap point."""
+        history = MetricHistory(capacity=4, metrics=("a",))
+        for i in range(6):
+            history.append(float(i), [i])
+
+        result = history.query(["a"], start=3.0, end=4.0)
+        assert result["timestamps"] == [3.0, 4.0]
+        assert result["metrics"] == {"a": [3, 4]}
+
+    def test_missing_values_are_none(self):
+        """Test that NaN samples are reported as None."""
+        history = MetricHistory(capacity=2, metrics=("a",))
+        history.append(1.0, [math.nan])
+        assert history.query()["metrics"]["a"] == [None]
+
+    def test_unknown_metric_raises(self):
+        """Test that querying an unknown metric raises KeyError."""
+        history = MetricHistory(capacity=2, metrics=("a",))
+        with pytest.raises(KeyError):
+            history.query(["nope"])
+
+    def test_record_snapshot(self):
+        """Test recording a sampler snapshot."""
+        history = MetricHistory(capacity=2, metrics=("cpu.percent", "sensors.temp"))
+        history.record(Snapshot(seq=1, timestamp=5.0, data={"cpu": {"percent": 50.0}}))
+        result = history.query()
+        assert result["metrics"] == {"cpu.percent": [50.0], "sensors.temp": [None]}
+
+    def test_storage_is_fixed_size(self):
+        """Test that memory use depends only on capacity."""
+        history = MetricHistory.for_window(3600, 2.0)
+        assert history.capacity == 1800
+        assert history.nbytes() == 1800 * (8 + 4 * len(history.metrics))
@@ -0,0 +1,57 @@
+"""Tests for recording and replaying host inputs."""
+
+import os
+import pwd
+
+from monitor.collectors.host import HostSource
+from monitor.replay import record, replay
+
+
+def _user_name(uid):
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+def _write_host(root, busy_ticks):
+    proc = root / "proc"
+    (proc / "1").mkdir(parents=True, exist_ok=True)
+    (proc / "2").mkdir(exist_ok=True)
+    (proc / "stat").write_text(f"cpu  {busy_ticks} 0 0 {1000 - busy_ticks} 0 0 0 0\n")
+    (proc / "meminfo").write_text("MemTotal:        2097152 kB\nMemAvailable:    1048576 kB\n")
+    (proc / "1" / "stat").write_text(
+        "1 (init) S 0 1 1 0 -1 4194560 0 0 0 0 5 5 0 0 20 0 1 0 100 1000000 256 0\n"
+    )
+    (proc / "1" / "cmdline").write_bytes(b"/sbin/init\0")
+    (proc / "2" / "stat").write_text(
+        "2 (httpd) S 1 2 2 0 -1 4194560 0 0 0 0 1 1 0 0 20 0 1 0 200 1000000 128 0\n"
+    )
+    (proc / "2" / "cmdline").write_bytes(b"httpd\0-k\0start\0")
+
+
+class TestReplay:
+    """Tests for record() and replay()."""
+
+    def test_round_trip_is_deterministic(self, tmp_path, monkeypatch):
+        """Test that a recording replays to the same snapshots every time."""
+        root = tmp_path / "host"
+        _write_host(root, busy_ticks=100)
+        # Recorded owners, unlike the replay tree's files, which the test user owns
+        owners = {"1": 0, "2": 65534}
+        monkeypatch.setattr(HostSource, "owner", lambda self, path: owners[os.path.basename(path)])
+        archive = str(tmp_path / "rec.jsonl.gz")
+        record(archive, frames=2, interval=0.01, root=str(root))
+        monkeypatch.undo()
+
+        runs = []
+        for i in range(2):
+            snapshots = [s.data for s, _ in replay(archive, str(tmp_path / f"replay{i}"))]
+            runs.append(snapshots)
+        assert len(runs[0]) == 2
+        assert runs[0] == runs[1]
+        memory = runs[0][-1]["memory"]
+        assert (memory["total_gb"], memory["percent"]) == (2.0, 50.0)
+        processes = runs[0][-1]["processes"]
+        assert [p["name"] for p in processes] == ["/sbin/init", "httpd -k start"]
+        assert [p["user"] for p in processes] == [_user_name(0), _user_name(65534)]
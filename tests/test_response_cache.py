@@ -0,0 +1,62 @@
+"""Tests for response cache module."""
+
+import gzip
+import json
+
+from monitor.response_cache import ResponseCache, accepts_gzip, encode_json
+
+
+class TestAcceptsGzip:
+    """Tests for accepts_gzip."""
+
+    def test_negotiation(self):
+        """Test common Accept-Encoding headers."""
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("br")
+        assert not accepts_gzip(None)
+        assert not accepts_gzip("*;q=0.5, gzip;q=0")
+        assert accepts_gzip("*;q=0, gzip")
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_encodes_once_per_key(self):
+        """Test that the body is built once and reused."""
+        cache = ResponseCache()
+        calls = 0
+
+        def build():
+            nonlocal calls
+            calls += 1
+            return {"value": calls}
+
+        first, _ = cache.get("k", build)
+        second, _ = cache.get("k", build)
+        assert first is second
+        assert calls == 1
+        assert first == encode_json({"value": 1})
+
+    def test_gzip_variant(self):
+        """Test that gzip is served only when accepted and worthwhile."""
+        cache = ResponseCache()
+        payload = {"items": list(range(500))}
+
+        body, encoding = cache.get("big", lambda: payload, gzip_ok=True)
+        assert encoding == "gzip"
+        assert json.loads(gzip.decompress(body)) == payload
+
+        small, encoding = cache.get("small", lambda: {"a": 1}, gzip_ok=True)
+        assert encoding is None
+        assert small == b'{"a":1}'
+
+    def test_invalidate(self):
+        """Test that invalidation forces a rebuild."""
+        cache = ResponseCache()
+        cache.get("k", lambda: 1)
+        cache.invalidate()
+        body, _ = cache.get("k", lambda: 2)
+        assert body == b"2"
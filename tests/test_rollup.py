@@ -0,0 +1,89 @@
+"""Tests for rollup module."""
+
+import math
+
+from monitor.history import MetricHistory
+from monitor.rollup import RollupEngine, RollupTier, TierSpec
+
+
+def _engine(raw_window: float = 120.0) -> tuple[RollupEngine, MetricHistory]:
+    raw = MetricHistory.for_window(raw_window, 1.0, metrics=("a",))
+    return RollupEngine(
+        raw,
+        1.0,
+        tiers=(TierSpec("1m", 60.0, 3600.0), TierSpec("1h", 3600.0, 86400.0)),
+    ), raw
+
+
+class TestRollupTier:
+    """Tests for RollupTier."""
+
+    def test_bucket_aggregates(self):
+        """Test min/max/avg/last over a closed bucket."""
+        tier = RollupTier(TierSpec("1m", 60.0, 600.0), 1)
+        for i, value in enumerate([3.0, 1.0, math.nan, 5.0]):
+            tier.add(60.0 + i, [value])
+        tier.add(120.0, [9.0])  # Closes the first bucket
+
+        timestamps, data = tier.query([0], 0.0, 1000.0)
+        assert timestamps == [60.0, 120.0]
+        assert data[0]["min"] == [1.0, 9.0]
+        assert data[0]["max"] == [5.0, 9.0]
+        assert data[0]["avg"] == [3.0, 9.0]
+        assert data[0]["last"] == [5.0, 9.0]
+
+    def test_capacity_is_bounded(self):
+        """Test that old buckets are dropped at capacity."""
+        tier = RollupTier(TierSpec("1m", 60.0, 180.0), 1)
+        for minute in range(10):
+            tier.add(minute * 60.0, [float(minute)])
+
+        timestamps, _ = tier.query([0], 0.0, 10000.0)
+        # Three closed buckets plus the open one
+        assert timestamps == [360.0, 420.0, 480.0, 540.0]
+
+
+class TestRollupEngine:
+    """Tests for RollupEngine."""
+
+    def _feed(self, engine, raw, seconds):
+        for t in range(seconds):
+            engine.append(float(t), [float(t % 100)])
+            raw.append(float(t), [float(t % 100)])
+
+    def test_short_range_uses_raw(self):
+        """Test that recent, dense queries are answered from raw samples."""
+        engine, raw = _engine()
+        self._feed(engine, raw, 7200)
+        result = engine.query(["a"], 7140.0, 7199.0, points=60)
+        assert result["tier"] == "raw"
+        assert len(result["timestamps"]) == 60
+
+    def test_long_range_uses_coarse_tier(self):
+        """Test that a range beyond raw retention picks a rollup tier."""
+        engine, raw = _engine()
+        self._feed(engine, raw, 7200)
+        assert engine.select_tier(3600.0, 7199.0, points=60) == ("1m", 60.0)
+        assert engine.select_tier(0.0, 7199.0, points=2) == ("1h", 3600.0)
+
+    def test_result_is_bounded_by_points(self):
+        """Test that surplus buckets are merged down to the point count."""
+        engine, raw = _engine()
+        self._feed(engine, raw, 7200)
+        result = engine.query(["a"], 0.0, 7199.0, points=10)
+        assert len(result["timestamps"]) <= 10
+        assert result["metrics"]["a"]["min"][0] == 0.0
+        assert result["metrics"]["a"]["max"][0] == 99.0
+
+    def test_backfill_queues_live_samples(self):
+        """Test that samples arriving during backfill are applied in order."""
+        engine, _ = _engine()
+
+        def records():
+            engine.append(600.0, [7.0])  # Live sample during backfill
+            yield from ((float(t), 1.0) for t in range(0, 600, 10))
+
+        engine.start_backfill(records()).join(timeout=5)
+        result = engine.query(["a"], 0.0, 660.0, points=20)
+        assert result["tier"] == "1m"
+        assert result["metrics"]["a"]["last"][-1] == 7.0
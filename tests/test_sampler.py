@@ -0,0 +1,59 @@
+"""Tests for sampler module."""
+
+import time
+
+from monitor.sampler import Sampler
+
+
+class TestSampler:
+    """Tests for Sampler."""
+
+    def test_sample_now_publishes_snapshot(self):
+        """Test that a synchronous sample is published."""
+        sampler = Sampler(lambda: {"value": 42}, interval=10.0)
+        assert sampler.latest is None
+
+        snapshot = sampler.sample_now()
+
+        assert snapshot.seq == 1
+        assert snapshot.data == {"value": 42}
+        assert sampler.latest is snapshot
+
+    def test_sequence_increases(self):
+        """Test that each sample gets a new sequence number."""
+        sampler = Sampler(lambda: {}, interval=10.0)
+        first = sampler.sample_now()
+        second = sampler.sample_now()
+        assert second.seq == first.seq + 1
+
+    def test_failed_collection_keeps_last_snapshot(self):
+        """Test that an exception does not replace the last good snapshot."""
+        calls = 0
+
+        def collect():
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise RuntimeError("boom")
+            return {"value": calls}
+
+        sampler = Sampler(collect, interval=10.0)
+        first = sampler.sample_now()
+        second = sampler.sample_now()
+
+        assert second is first
+        assert sampler.latest.data == {"value": 1}
+
+    def test_background_thread_samples(self):
+        """Test that the background thread publishes new snapshots."""
+        sampler = Sampler(lambda: {"t": time.time()}, interval=0.02)
+        sampler.start()
+        try:
+            assert sampler.running
+            first_seq = sampler.latest.seq
+            time.sleep(0.15)
+            assert sampler.latest.seq > first_seq
+        finally:
+            sampler.stop(timeout=1.0)
+
+        assert not sampler.running
@@ -0,0 +1,101 @@
+"""Tests for per-collector refresh scheduling."""
+
+import pytest
+
+from monitor.collector_pool import CollectorPool
+from monitor.scheduler import CollectorScheduler, ScheduledCollector
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _counter(calls, name):
+    def collect():
+        calls[name] = calls.get(name, 0) + 1
+        return {"n": calls[name]}
+
+    return collect
+
+
+class TestCollectorScheduler:
+    """Tests for CollectorScheduler."""
+
+    def test_independent_cadences(self):
+        """Test that each collector refreshes on its own interval."""
+        clock = _Clock()
+        calls = {}
+        scheduler = CollectorScheduler(
+            CollectorPool(deadline=1.0),
+            [
+                ScheduledCollector("cpu", _counter(calls, "cpu")),
+                ScheduledCollector("disk", _counter(calls, "disk"), interval=10.0),
+            ],
+            tick=2.0,
+            clock=clock,
+        )
+
+        for _ in range(6):  # 0, 2, ... 10 seconds
+            values, stale = scheduler.run()
+            clock.now += 2.0
+
+        assert calls == {"cpu": 6, "disk": 2}
+        assert values == {"cpu": {"n": 6}, "disk": {"n": 2}}
+        assert stale == []
+
+    def test_heavy_collectors_are_staggered(self):
+        """Test that heavy collectors falling due together spread over ticks."""
+        clock = _Clock()
+        calls = {}
+        scheduler = CollectorScheduler(
+            CollectorPool(deadline=1.0),
+            [
+                ScheduledCollector("a", _counter(calls, "a"), interval=10.0, cost="heavy"),
+                ScheduledCollector("b", _counter(calls, "b"), interval=10.0, cost="heavy"),
+            ],
+            tick=2.0,
+            clock=clock,
+        )
+        scheduler.run()  # First run fills every section
+        assert calls == {"a": 1, "b": 1}
+
+        clock.now += 10.0
+        assert len(scheduler.due()) == 1
+        scheduler.run()
+        clock.now += 2.0
+        scheduler.run()
+        assert calls == {"a": 2, "b": 2}
+
+    def test_failed_collector_retries_next_tick(self):
+        """Test that a stale collector keeps its value and is retried."""
+        clock = _Clock()
+        state = {"fail": False, "calls": 0}
+
+        def flaky():
+            state["calls"] += 1
+            if state["fail"]:
+                raise RuntimeError("boom")
+            return {"ok": state["calls"]}
+
+        scheduler = CollectorScheduler(
+            CollectorPool(deadline=1.0),
+            [ScheduledCollector("s", flaky, interval=30.0)],
+            tick=2.0,
+            clock=clock,
+        )
+        scheduler.run()
+        clock.now += 30.0
+        state["fail"] = True
+        values, stale = scheduler.run()
+        assert values == {"s": {"ok": 1}}
+        assert stale == ["s"]
+        assert scheduler.due(clock.now + 2.0) == ["s"]
+
+    def test_invalid_cost_class(self):
+        """Test that unknown cost classes are rejected."""
+        with pytest.raises(ValueError):
+            ScheduledCollector("x", dict, cost="medium")
@@ -0,0 +1,49 @@
+"""Tests for static asset cache."""
+
+import gzip
+import os
+
+from monitor.static_assets import StaticAssets
+
+
+class TestStaticAssets:
+    """Tests for StaticAssets."""
+
+    def test_loads_with_gzip_variant(self, tmp_path):
+        """Test that files are loaded with metadata and a gzip variant."""
+        (tmp_path / "index.html").write_text("<html>" + "x" * 1000 + "</html>")
+        assets = StaticAssets(tmp_path)
+
+        asset = assets.get("index.html")
+        assert asset is not None
+        assert asset.content_type == "text/html; charset=utf-8"
+        assert asset.etag.startswith('"')
+        assert asset.last_modified.endswith("GMT")
+        assert gzip.decompress(asset.gzip_body) == asset.body
+
+    def test_cached_until_mtime_changes(self, tmp_path):
+        """Test that unchanged files are served from memory."""
+        path = tmp_path / "index.html"
+        path.write_text("one")
+        assets = StaticAssets(tmp_path, check_interval=0)
+        first = assets.get("index.html")
+        assert assets.get("index.html") is first
+
+        path.write_text("two")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert assets.get("index.html").body == b"two"
+
+    def test_dev_mode_always_reloads(self, tmp_path):
+        """Test that dev mode re-reads the file on each request."""
+        (tmp_path / "app.js").write_text("a")
+        assets = StaticAssets(tmp_path, dev=True)
+        assert assets.get("app.js") is not assets.get("app.js")
+
+    def test_rejects_paths(self, tmp_path):
+        """Test that only plain file names in the directory are served."""
+        (tmp_path / ".secret").write_text("s")
+        assets = StaticAssets(tmp_path)
+        assert assets.get("../etc/passwd") is None
+        assert assets.get(".secret") is None
+        assert assets.get("missing.css") is None
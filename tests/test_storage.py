@@ -0,0 +1,86 @@
+"""Tests for persistent metric store."""
+
+import math
+
+from monitor.storage import MetricStore
+
+
+def _store(tmp_path, **kwargs):
+    options = {"interval_sec": 1.0, "flush_interval_sec": 10.0, "segment_sec": 100.0}
+    options.update(kwargs)
+    return MetricStore(tmp_path, ("a", "b"), **options)
+
+
+class TestMetricStore:
+    """Tests for MetricStore."""
+
+    def test_samples_are_buffered_until_flush_interval(self, tmp_path):
+        """Test that nothing is written before the flush interval elapses."""
+        store = _store(tmp_path)
+        for i in range(5):
+            store.append(1000.0 + i, [i, i])
+        assert list(store.read()) == []
+        assert store.bytes_written == 0
+
+        store.append(1010.0, [10, 10])
+        assert len(list(store.read())) == 6
+
+    def test_close_flushes_and_reopen_reloads(self, tmp_path):
+        """Test that records survive a restart."""
+        store = _store(tmp_path)
+        store.append(1000.0, [1.5, math.nan])
+        store.append(1001.0, [2.5, 3.0])
+        store.close()
+
+        reopened = _store(tmp_path)
+        records = list(reopened.read())
+        assert [r[0] for r in records] == [1000.0, 1001.0]
+        assert records[1][1:] == (2.5, 3.0)
+        assert math.isnan(records[0][2])
+
+        # Appends continue in the same segment after reopening
+        reopened.append(1002.0, [4.0, 4.0])
+        reopened.close()
+        assert len(list(_store(tmp_path).read())) == 3
+        assert len(list(tmp_path.glob("*.seg"))) == 1
+
+    def test_read_time_range(self, tmp_path):
+        """Test start/end filtering across segments."""
+        store = _store(tmp_path)
+        for i in range(0, 300, 5):
+            store.append(1000.0 + i, [i, 0])
+        store.close()
+
+        timestamps = [r[0] for r in store.read(start=1150.0, end=1170.0)]
+        assert timestamps == [1150.0, 1155.0, 1160.0, 1165.0, 1170.0]
+
+    def test_segments_rotate(self, tmp_path):
+        """Test that a new segment is started per segment span."""
+        store = _store(tmp_path)
+        for i in range(0, 250, 10):
+            store.append(1000.0 + i, [i, i])
+        store.close()
+        assert len(list(tmp_path.glob("*.seg"))) == 3
+
+    def test_retention_deletes_old_segments(self, tmp_path):
+        """Test that segments older than the retention window are removed."""
+        store = _store(tmp_path, retention_sec=150.0)
+        for i in range(0, 500, 10):
+            store.append(1000.0 + i, [i, i])
+        store.close()
+
+        timestamps = [r[0] for r in store.read()]
+        assert timestamps[0] >= 1490.0 - 150.0 - 100.0
+        assert timestamps[-1] == 1490.0
+
+    def test_incompatible_segment_is_skipped(self, tmp_path):
+        """Test that a metric layout change does not break loading."""
+        store = _store(tmp_path)
+        store.append(1000.0, [1, 1])
+        store.close()
+
+        other = MetricStore(tmp_path, ("x",), interval_sec=1.0, segment_sec=100.0)
+        assert list(other.read()) == []
+        other.append(1001.0, [2])
+        other.close()
+        assert [r[0] for r in other.read()] == [1001.0]
@@ -0,0 +1,67 @@
+"""Tests for stream module."""
+
+import json
+import threading
+
+from monitor.sampler import Snapshot
+from monitor.stream import SnapshotBroadcaster, encode_event
+
+
+class TestEncodeEvent:
+    """Tests for encode_event."""
+
+    def test_frame_format(self):
+        """Test that a snapshot becomes a single SSE frame."""
+        frame = encode_event(Snapshot(seq=7, timestamp=0.0, data={"cpu": {"percent": 1.5}}))
+        text = frame.decode()
+        assert text.startswith("id: 7\nevent: stats\ndata: ")
+        tagged = encode_event(Snapshot(seq=7, timestamp=0.0, data={}), generation="ab12")
+        assert tagged.startswith(b"id: ab12-7\n")
+        assert text.endswith("\n\n")
+        payload = text.split("data: ", 1)[1].strip()
+        assert json.loads(payload) == {"cpu": {"percent": 1.5}}
+
+
+class TestSnapshotBroadcaster:
+    """Tests for SnapshotBroadcaster."""
+
+    def test_clients_share_encoded_frame(self):
+        """Test that every waiter receives the same bytes object."""
+        broadcaster = SnapshotBroadcaster()
+        results = []
+
+        def wait():
+            results.append(broadcaster.wait_next(0, timeout=2.0))
+
+        threads = [threading.Thread(target=wait) for _ in range(3)]
+        for t in threads:
+            t.start()
+        broadcaster.publish(Snapshot(seq=1, timestamp=0.0, data={}))
+        for t in threads:
+            t.join()
+
+        assert len(results) == 3
+        assert all(seq == 1 for seq, _ in results)
+        assert results[0][1] is results[1][1] is results[2][1]
+
+    def test_wait_times_out(self):
+        """Test that waiting returns no frame without new snapshots."""
+        broadcaster = SnapshotBroadcaster()
+        broadcaster.publish(Snapshot(seq=1, timestamp=0.0, data={}))
+        assert broadcaster.wait_next(1, timeout=0.01) == (1, None)
+
+    def test_client_limit(self):
+        """Test that slots are limited and released."""
+        broadcaster = SnapshotBroadcaster(max_clients=1)
+        assert broadcaster.acquire()
+        assert not broadcaster.acquire()
+        broadcaster.release()
+        assert broadcaster.acquire()
+
+    def test_close_wakes_waiters(self):
+        """Test that close ends pending waits."""
+        broadcaster = SnapshotBroadcaster()
+        timer = threading.Timer(0.05, broadcaster.close)
+        timer.start()
+        assert broadcaster.wait_next(0, timeout=5.0) == (0, None)
+        assert not broadcaster.acquire()